@@ -0,0 +1,86 @@
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+
+from blog.models import Article
+from catalog.models import Category, Product, Version
+from catalog.projections import rebuild_product_cards
+from users.models import User
+
+BATCH_SIZE = 1000
+
+
+def seed(products=1000, versions=2, articles=200, users=50, categories=10):
+    """
+    Быстро заполняет базу данных тестовыми данными через ``bulk_create``.
+
+    Пароль хешируется один раз и копируется всем пользователям, поэтому
+    создание пользователей не упирается в PBKDF2. Сигналы моделей при
+    ``bulk_create`` не вызываются, поэтому карточки продуктов строятся
+    в конце одним проходом.
+
+    :param products: Количество продуктов.
+    :param versions: Количество версий на продукт (первая — активная).
+    :param articles: Количество статей (каждая десятая не опубликована).
+    :param users: Количество пользователей — владельцев продуктов.
+    :param categories: Количество категорий.
+    :return: Словарь с количеством созданных записей.
+    """
+    password = make_password("benchmark")
+    created_users = User.objects.bulk_create(
+        (
+            User(email=f"user{number}@example.com", password=password, is_active=True)
+            for number in range(users)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    created_categories = Category.objects.bulk_create(
+        Category(name=f"Категория {number}", description="Описание категории")
+        for number in range(categories)
+    )
+    created_products = Product.objects.bulk_create(
+        (
+            Product(
+                name=f"Товар {number}",
+                description=f"Описание товара {number}. " * 5,
+                price=Decimal(number % 1000) + Decimal("0.99"),
+                category=created_categories[number % categories] if categories else None,
+                user=created_users[number % users] if users else None,
+                publication=True,
+            )
+            for number in range(products)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    Version.objects.bulk_create(
+        (
+            Version(
+                product=product,
+                version_number=f"{version}.0",
+                version_name=f"Версия {version}",
+                is_active=version == 0,
+            )
+            for product in created_products
+            for version in range(versions)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    rebuild_product_cards(batch_size=BATCH_SIZE)
+    Article.objects.bulk_create(
+        (
+            Article(
+                title=f"Статья {number}",
+                content=f"Текст статьи {number}. " * 50,
+                is_published=number % 10 != 9,
+            )
+            for number in range(articles)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    return {
+        "users": users,
+        "categories": categories,
+        "products": products,
+        "versions": products * versions,
+        "articles": articles,
+    }
@@ -0,0 +1,55 @@
+import json
+import os
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.startup import probe_startup
+
+STAGE_NAMES = {
+    "django": "импорт Django",
+    "settings": "модуль настроек",
+    "setup": "django.setup()",
+    "middleware": "загрузка middleware",
+    "urls": "загрузка маршрутов",
+}
+
+
+class Command(BaseCommand):
+    """
+    Замеряет холодный старт процесса: этапы запуска и время импорта по приложениям.
+
+    Каждый запуск выполняется в новом интерпретаторе с тем же модулем
+    настроек (``--settings`` или DJANGO_SETTINGS_MODULE), выводятся медианы.
+    Время импорта модуля, не принадлежащего приложению, относится
+    к приложению, которое его импортировало первым.
+    """
+
+    help = "Замеряет время запуска процесса и импорта приложений"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5, help="Количество запусков")
+        parser.add_argument("--output", help="Файл для сохранения результатов в JSON")
+
+    def handle(self, *args, **options):
+        owners = [app_config.name for app_config in apps.get_app_configs()] + ["config"]
+        try:
+            result = probe_startup(
+                owners, os.environ["DJANGO_SETTINGS_MODULE"], runs=max(1, options["runs"])
+            )
+        except RuntimeError as error:
+            raise CommandError(f"Процесс не запустился: {error}")
+
+        self.stdout.write(f"Настройки {result['settings']}, запусков {result['runs']}")
+        for stage, value in result["stages"].items():
+            self.stdout.write(f"  {STAGE_NAMES.get(stage, stage):<34} {value:>8} мс")
+        self.stdout.write("Импорт по приложениям:")
+        for name, value in sorted(result["imports"].items(), key=lambda item: -item[1]):
+            self.stdout.write(f"  {name:<34} {value:>8} мс")
+        self.stdout.write(
+            self.style.SUCCESS(f"Запуск процесса целиком: {result['process_ms']} мс")
+        )
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                json.dump(result, file, ensure_ascii=False, indent=2)
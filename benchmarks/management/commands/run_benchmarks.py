@@ -0,0 +1,289 @@
+import asyncio
+import json
+import platform
+import subprocess
+import time
+
+import django
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.asgi import get_asgi_application
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client, RequestFactory, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from django.utils import timezone
+
+from benchmarks.factories import seed
+from benchmarks.runner import (
+    compare,
+    run_concurrent,
+    run_endpoint,
+    run_template,
+    template_backend,
+)
+from blog.models import Article
+from catalog.fragments import PRODUCT_CARD_TEMPLATE
+from catalog.models import Product
+
+
+class Command(BaseCommand):
+    """
+    Нагрузочный замер страниц витрины на воспроизводимых данных.
+
+    Команда создает отдельную тестовую базу данных, заполняет ее фабрикой
+    из ``benchmarks.factories``, прогоняет страницы каталога и блога через
+    тестовый клиент Django и выводит p50/p95/p99, запросы в секунду и число
+    SQL-запросов на страницу. Результаты сохраняются в JSON; при передаче
+    базового файла команда завершается с ошибкой при регрессии.
+
+    С ``--asgi-clients`` те же страницы дополнительно замеряются через
+    ASGI-приложение при одновременных медленных клиентах — в синхронной
+    и асинхронной версиях представлений.
+
+    С ``--template-items`` отдельно замеряется рендер шаблонов списков товаров
+    и статей на синтетических данных — с загрузчиками без кеша и с
+    ``cached.Loader``.
+    """
+
+    help = "Замеряет производительность страниц каталога и блога"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=1000)
+        parser.add_argument("--versions", type=int, default=2, help="Версий на продукт")
+        parser.add_argument("--articles", type=int, default=200)
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--requests", type=int, default=200, help="Запросов на страницу")
+        parser.add_argument("--warmup", type=int, default=10)
+        parser.add_argument("--output", help="Файл для сохранения результатов в JSON")
+        parser.add_argument("--baseline", help="JSON с результатами для сравнения")
+        parser.add_argument(
+            "--asgi-clients",
+            type=int,
+            default=0,
+            help="Одновременных клиентов для замера под ASGI (0 — без замера)",
+        )
+        parser.add_argument(
+            "--asgi-requests", type=int, default=10, help="Запросов одного ASGI-клиента"
+        )
+        parser.add_argument(
+            "--client-delay",
+            type=float,
+            default=0.05,
+            help="Задержка медленного клиента на отправку запроса и чтение ответа, с",
+        )
+        parser.add_argument(
+            "--template-items",
+            default="10,100,1000",
+            help="Размеры списков для замера рендера шаблонов через запятую (пусто — без замера)",
+        )
+        parser.add_argument(
+            "--template-renders", type=int, default=50, help="Рендеров шаблона на замер"
+        )
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            default=0.2,
+            help="Допустимый рост p95 относительно базовых результатов (доля)",
+        )
+
+    def get_endpoints(self):
+        """
+        Возвращает замеряемые страницы: {имя: адрес}.
+        """
+        product = Product.objects.order_by("pk").first()
+        article = Article.objects.filter(is_published=True).order_by("pk").first()
+        return {
+            "catalog:home": reverse("catalog:home"),
+            "catalog:product_detail": reverse("catalog:product_detail", args=[product.pk]),
+            "blog:article_list": reverse("blog:article_list"),
+            "blog:article_detail": reverse("blog:article_detail", args=[article.pk]),
+        }
+
+    def get_asgi_endpoints(self):
+        """
+        Возвращает пары адресов синхронной и асинхронной версий страниц:
+        {имя: (синхронный адрес, асинхронный адрес)}.
+        """
+        product = Product.objects.order_by("pk").first()
+        article = Article.objects.filter(is_published=True).order_by("pk").first()
+        return {
+            "catalog:home": (reverse("catalog:home"), reverse("async_home")),
+            "catalog:product_detail": (
+                reverse("catalog:product_detail", args=[product.pk]),
+                reverse("async_product_detail", args=[product.pk]),
+            ),
+            "blog:article_list": (reverse("blog:article_list"), reverse("async_article_list")),
+            "blog:article_detail": (
+                reverse("blog:article_detail", args=[article.pk]),
+                reverse("async_article_detail", args=[article.pk]),
+            ),
+        }
+
+    def get_template_contexts(self, backend, items):
+        """
+        Возвращает контексты шаблонов списков из ``items`` синтетических элементов.
+
+        Карточки товаров рендерятся заранее: на странице они берутся из кеша
+        фрагментов, поэтому в замер входит только сам шаблон списка.
+
+        :param backend: Движок шаблонов.
+        :param items: Количество элементов списка.
+        :return: Словарь {имя шаблона: контекст}.
+        """
+        now = timezone.now()
+        card_template = backend.get_template(PRODUCT_CARD_TEMPLATE)
+        products = [
+            {
+                "product_id": pk,
+                "name": f"Товар {pk}",
+                "short_description": "Описание товара " * 6,
+                "photo": "",
+                "price": "999.00",
+                "version_number": "1.0",
+            }
+            for pk in range(1, items + 1)
+        ]
+        articles = [
+            {
+                "pk": pk,
+                "title": f"Статья {pk}",
+                "photo": "",
+                "content": "Текст статьи " * 30,
+                "created_at": now,
+                "views_count": pk,
+            }
+            for pk in range(1, items + 1)
+        ]
+        return {
+            "catalog/product_list.html": {
+                "product_cards": [
+                    (product, card_template.render({"object": product}), None)
+                    for product in products
+                ],
+            },
+            "blog/article_list.html": {"object_list": articles},
+        }
+
+    def run_templates(self, options):
+        """
+        Замеряет рендер шаблонов списков без кеша загрузчика и с ним.
+
+        :return: Словарь {"шаблон:элементов": {"uncached": результат, "cached": результат}}.
+        """
+        request = RequestFactory().get("/")
+        request.user = AnonymousUser()
+        sizes = [int(size) for size in options["template_items"].split(",") if size.strip()]
+        results = {}
+        for mode in ("uncached", "cached"):
+            backend = template_backend(cached=mode == "cached")
+            for items in sizes:
+                contexts = self.get_template_contexts(backend, items)
+                for template_name, context in contexts.items():
+                    result = run_template(
+                        backend, template_name, context, request, options["template_renders"]
+                    )
+                    results.setdefault(f"{template_name}:{items}", {})[mode] = result
+                    self.stdout.write(
+                        f"{template_name:<26} {items:>5} эл. {mode:<8}  "
+                        f"p50 {result['p50_ms']:>8} мс  p95 {result['p95_ms']:>8} мс  "
+                        f"{result['rps']:>8} рендеров/с"
+                    )
+        return results
+
+    async def run_asgi(self, endpoints, options):
+        """
+        Замеряет синхронные и асинхронные версии страниц под ASGI.
+
+        :param endpoints: Результат ``get_asgi_endpoints``.
+        :return: Словарь {имя: {"sync": результат, "async": результат}}.
+        """
+        application = get_asgi_application()
+        results = {}
+        for name, urls in endpoints.items():
+            results[name] = {}
+            for mode, url in zip(("sync", "async"), urls):
+                # Прогрев: кеш карточек и соединение с базой в пуле потоков.
+                await run_concurrent(application, url, clients=1, requests=2, client_delay=0)
+                result = await run_concurrent(
+                    application,
+                    url,
+                    clients=options["asgi_clients"],
+                    requests=options["asgi_requests"],
+                    client_delay=options["client_delay"],
+                )
+                results[name][mode] = result
+                self.stdout.write(
+                    f"{name:<24} ASGI {mode:<5}  p50 {result['p50_ms']:>8} мс  "
+                    f"p95 {result['p95_ms']:>8} мс  {result['rps']:>8} запр/с  "
+                    f"потоков {result['threads']}"
+                )
+        await sync_to_async(connections.close_all)()
+        return results
+
+    def get_meta(self, options, seeded):
+        try:
+            commit = subprocess.run(
+                ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "requests": options["requests"],
+            "warmup": options["warmup"],
+            "data": seeded,
+        }
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            for cache in caches.all():
+                cache.clear()
+            seeded = seed(
+                products=options["products"],
+                versions=options["versions"],
+                articles=options["articles"],
+                users=options["users"],
+            )
+            client = Client()
+            endpoints = {}
+            for name, url in self.get_endpoints().items():
+                endpoints[name] = run_endpoint(
+                    client, url, requests=options["requests"], warmup=options["warmup"]
+                )
+                result = endpoints[name]
+                self.stdout.write(
+                    f"{name:<24} p50 {result['p50_ms']:>8} мс  p95 {result['p95_ms']:>8} мс  "
+                    f"p99 {result['p99_ms']:>8} мс  {result['rps']:>8} запр/с  "
+                    f"SQL {result['queries']}"
+                )
+            results = {"meta": self.get_meta(options, seeded), "endpoints": endpoints}
+            if options["template_items"]:
+                results["templates"] = self.run_templates(options)
+            if options["asgi_clients"]:
+                with override_settings(ROOT_URLCONF="benchmarks.urls"):
+                    asgi_endpoints = self.get_asgi_endpoints()
+                    results["asgi"] = asyncio.run(self.run_asgi(asgi_endpoints, options))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                json.dump(results, file, ensure_ascii=False, indent=2)
+
+        if options["baseline"]:
+            with open(options["baseline"], encoding="utf-8") as file:
+                baseline = json.load(file)
+            regressions = compare(results, baseline, options["max_regression"])
+            if regressions:
+                raise CommandError("Регрессия производительности:\n" + "\n".join(regressions))
+            self.stdout.write(self.style.SUCCESS("Регрессий относительно базовых результатов нет"))
@@ -0,0 +1,241 @@
+import asyncio
+import statistics
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.template.backends.django import DjangoTemplates
+
+
+def summarize(latencies, elapsed):
+    """
+    Считает перцентили задержки и пропускную способность.
+
+    :param latencies: Задержки запросов в секундах.
+    :param elapsed: Общее время серии запросов в секундах.
+    :return: Словарь с p50/p95/p99 в миллисекундах и запросами в секунду.
+    """
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = latencies[0]
+    return {
+        "requests": len(latencies),
+        "p50_ms": round(p50 * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "p99_ms": round(p99 * 1000, 3),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+    }
+
+
+def run_endpoint(client, url, requests=100, warmup=10):
+    """
+    Измеряет одну страницу через тестовый клиент Django.
+
+    Число SQL-запросов считается отдельным запросом после прогрева, чтобы
+    перехват запросов не искажал замер задержки. Запросы считаются через
+    ``execute_wrapper``: журнал ``connection.queries`` ограничен по длине
+    и после заполнения базы фабрикой уже переполнен.
+
+    :param client: ``django.test.Client``.
+    :param url: Адрес страницы.
+    :param requests: Количество замеряемых запросов.
+    :param warmup: Количество запросов прогрева (кеши, соединение).
+    :return: Словарь с результатами замера.
+    """
+    for _ in range(warmup):
+        client.get(url)
+
+    queries = []
+
+    def count_query(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count_query):
+        response = client.get(url)
+    if response.status_code != 200:
+        raise RuntimeError(f"{url}: статус {response.status_code}")
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        request_started = time.perf_counter()
+        client.get(url)
+        latencies.append(time.perf_counter() - request_started)
+    elapsed = time.perf_counter() - started
+
+    return {"url": url, "queries": len(queries), **summarize(latencies, elapsed)}
+
+
+def template_backend(cached):
+    """
+    Создает движок шаблонов с настройками проекта и заданным загрузчиком.
+
+    :param cached: True — загрузчики обернуты в ``cached.Loader``,
+        False — шаблоны ищутся и компилируются при каждом рендере.
+    :return: ``DjangoTemplates``.
+    """
+    loaders = settings.TEMPLATE_LOADERS
+    if cached:
+        loaders = [("django.template.loaders.cached.Loader", loaders)]
+    return DjangoTemplates(
+        {
+            "NAME": "cached" if cached else "uncached",
+            "DIRS": settings.TEMPLATES[0]["DIRS"],
+            "APP_DIRS": False,
+            "OPTIONS": {**settings.TEMPLATES[0]["OPTIONS"], "loaders": loaders},
+        }
+    )
+
+
+def run_template(backend, template_name, context, request=None, renders=50, warmup=2):
+    """
+    Измеряет рендер шаблона без обработки запроса и обращений к базе.
+
+    Шаблон загружается при каждом рендере, как в ``render_to_string``,
+    поэтому в замер входит работа загрузчика.
+
+    :param backend: Движок шаблонов, например из ``template_backend``.
+    :param template_name: Имя шаблона.
+    :param context: Контекст шаблона.
+    :param request: Запрос для контекстных процессоров.
+    :param renders: Количество замеряемых рендеров.
+    :param warmup: Количество рендеров прогрева.
+    :return: Словарь с результатами замера и размером страницы в байтах.
+    """
+    for _ in range(warmup):
+        backend.get_template(template_name).render(context, request)
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(renders):
+        render_started = time.perf_counter()
+        html = backend.get_template(template_name).render(context, request)
+        latencies.append(time.perf_counter() - render_started)
+    elapsed = time.perf_counter() - started
+
+    result = summarize(latencies, elapsed)
+    result["renders"] = result.pop("requests")
+    result["bytes"] = len(html.encode())
+    return {"template": template_name, **result}
+
+
+async def asgi_get(application, path, client_delay=0.0):
+    """
+    Выполняет GET-запрос к ASGI-приложению от имени медленного клиента.
+
+    Клиент тратит ``client_delay`` секунд на отправку запроса и столько же
+    на чтение каждого куска ответа, удерживая соединение открытым.
+
+    :param application: ASGI-приложение.
+    :param path: Путь страницы.
+    :param client_delay: Задержка клиента в секундах.
+    :return: HTTP-статус ответа.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver"), (b"connection", b"keep-alive")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    sent = False
+    status = None
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            await asyncio.sleep(client_delay)
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Клиент не отключается, пока приложение не ответит.
+        await asyncio.Future()
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            await asyncio.sleep(client_delay)
+
+    await application(scope, receive, send)
+    return status
+
+
+async def run_concurrent(application, path, clients=50, requests=10, client_delay=0.05):
+    """
+    Измеряет страницу под ASGI при одновременных медленных клиентах.
+
+    Каждый клиент последовательно выполняет ``requests`` запросов по одному
+    keep-alive соединению.
+
+    :param application: ASGI-приложение.
+    :param path: Путь страницы.
+    :param clients: Количество одновременных клиентов.
+    :param requests: Количество запросов одного клиента.
+    :param client_delay: Задержка клиента в секундах (см. ``asgi_get``).
+    :return: Словарь с результатами замера и пиковым числом потоков.
+    """
+    latencies = []
+    peak_threads = threading.active_count()
+
+    async def client():
+        nonlocal peak_threads
+        for _ in range(requests):
+            started = time.perf_counter()
+            status = await asgi_get(application, path, client_delay)
+            latencies.append(time.perf_counter() - started)
+            peak_threads = max(peak_threads, threading.active_count())
+            if status != 200:
+                raise RuntimeError(f"{path}: статус {status}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    return {
+        "url": path,
+        "clients": clients,
+        "client_delay_ms": round(client_delay * 1000, 1),
+        "threads": peak_threads,
+        **summarize(latencies, elapsed),
+    }
+
+
+def compare(results, baseline, max_regression):
+    """
+    Сравнивает результаты с базовыми и возвращает список регрессий.
+
+    Регрессией считается рост p95 больше чем на долю ``max_regression``
+    или рост числа SQL-запросов на страницу.
+
+    :param results: Текущие результаты ``{"endpoints": {...}}``.
+    :param baseline: Базовые результаты в том же формате.
+    :param max_regression: Допустимый относительный рост p95, например 0.2.
+    :return: Список строк с описанием регрессий.
+    """
+    regressions = []
+    for name, current in results["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if previous is None:
+            continue
+        limit = previous["p95_ms"] * (1 + max_regression)
+        if current["p95_ms"] > limit:
+            regressions.append(
+                f"{name}: p95 {current['p95_ms']} мс > {previous['p95_ms']} мс "
+                f"+{max_regression:.0%}"
+            )
+        if current["queries"] > previous["queries"]:
+            regressions.append(
+                f"{name}: SQL-запросов {current['queries']} > {previous['queries']}"
+            )
+    return regressions
@@ -0,0 +1,160 @@
+"""
+Замер холодного старта процесса Django.
+
+Замер выполняется в отдельном интерпретаторе с ``python -X importtime``:
+в уже запущенном процессе все модули загружены, и повторный импорт
+ничего не стоит. Дочерний процесс по этапам засекает импорт Django, модуля
+настроек, ``django.setup()``, создание WSGI-обработчика (загрузка middleware)
+и загрузку маршрутов, а время импорта каждого модуля из отчета
+``importtime`` относится к приложению, которое его импортировало.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROBE_SCRIPT = """
+import json
+import time
+
+started = time.perf_counter()
+import django
+from django.conf import settings
+stages = {"django": time.perf_counter() - started}
+
+started = time.perf_counter()
+settings.INSTALLED_APPS
+stages["settings"] = time.perf_counter() - started
+
+started = time.perf_counter()
+django.setup()
+stages["setup"] = time.perf_counter() - started
+
+from django.core.handlers.wsgi import WSGIHandler
+started = time.perf_counter()
+WSGIHandler()
+stages["middleware"] = time.perf_counter() - started
+
+from django.urls import get_resolver
+started = time.perf_counter()
+get_resolver().url_patterns
+stages["urls"] = time.perf_counter() - started
+
+print(json.dumps(stages))
+"""
+
+OTHER = "(Python, Django и библиотеки)"
+
+
+def parse_importtime(output):
+    """
+    Разбирает отчет ``python -X importtime`` в дерево импортов.
+
+    Модуль печатается после всех модулей, которые он импортировал, с отступом
+    на уровень меньше, поэтому дерево восстанавливается за один проход.
+
+    :param output: Текст stderr процесса.
+    :return: Список корневых узлов (имя модуля, собственное время в мкс, дочерние узлы).
+    """
+    pending = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # заголовок отчета
+        self_time, name = int(fields[0]), fields[2]
+        # Вложенность показана отступом: два пробела на уровень.
+        depth = len(name) - len(name.lstrip())
+        children = pending.pop(depth + 2, [])
+        pending.setdefault(depth, []).append((name.strip(), self_time, children))
+    return [node for depth in sorted(pending) for node in pending[depth]]
+
+
+def owner_of(module, owners):
+    """
+    Возвращает владельца модуля: самое длинное совпадающее имя пакета или None.
+    """
+    matches = [owner for owner in owners if module == owner or module.startswith(owner + ".")]
+    return max(matches, key=len) if matches else None
+
+
+def attribute_import_time(tree, owners):
+    """
+    Суммирует время импорта по владельцам.
+
+    Модуль без владельца относится к владельцу модуля, который его импортировал:
+    так библиотека, которую первым загрузило приложение, входит во время этого
+    приложения.
+
+    :param tree: Результат ``parse_importtime``.
+    :param owners: Имена пакетов приложений.
+    :return: Словарь {владелец: время в мс}.
+    """
+    totals = {}
+    stack = [(node, None) for node in tree]
+    while stack:
+        (name, self_time, children), parent_owner = stack.pop()
+        owner = owner_of(name, owners) or parent_owner
+        key = owner or OTHER
+        totals[key] = totals.get(key, 0) + self_time / 1000
+        stack.extend((child, owner) for child in children)
+    return totals
+
+
+def probe_once(owners, settings_module):
+    """
+    Запускает замер в новом интерпретаторе.
+
+    :param owners: Имена пакетов приложений.
+    :param settings_module: Модуль настроек дочернего процесса.
+    :return: Словарь с временем процесса, этапов и импорта по приложениям в мс.
+    """
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings_module}
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE_SCRIPT],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    stages = json.loads(result.stdout.strip().splitlines()[-1])
+    return {
+        "process_ms": elapsed * 1000,
+        "stages": {stage: value * 1000 for stage, value in stages.items()},
+        "imports": attribute_import_time(parse_importtime(result.stderr), owners),
+    }
+
+
+def probe_startup(owners, settings_module, runs=5):
+    """
+    Замеряет холодный старт несколько раз и возвращает медианы.
+
+    :param owners: Имена пакетов приложений.
+    :param settings_module: Модуль настроек.
+    :param runs: Количество запусков.
+    :return: Словарь вида ``probe_once`` с медианами, округленными до 0.1 мс.
+    """
+    samples = [probe_once(owners, settings_module) for _ in range(runs)]
+
+    def median(values):
+        return round(statistics.median(values), 1)
+
+    names = {name for sample in samples for name in sample["imports"]}
+    return {
+        "runs": runs,
+        "settings": settings_module,
+        "process_ms": median(sample["process_ms"] for sample in samples),
+        "stages": {
+            stage: median(sample["stages"][stage] for sample in samples)
+            for stage in samples[0]["stages"]
+        },
+        "imports": {
+            name: median(sample["imports"].get(name, 0) for sample in samples) for name in names
+        },
+    }
@@ -0,0 +1,81 @@
+from django.core.asgi import get_asgi_application
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from benchmarks.factories import seed
+from benchmarks.startup import OTHER, attribute_import_time, parse_importtime
+from benchmarks.runner import (
+    compare,
+    run_concurrent,
+    run_endpoint,
+    run_template,
+    template_backend,
+)
+from catalog.models import Product, Version
+
+
+class BenchmarkRunnerTest(TestCase):
+    """
+    Проверяет фабрику данных и расчет результатов замера.
+    """
+
+    def test_seed_and_run_endpoint(self):
+        seeded = seed(products=30, versions=3, articles=5, users=3, categories=2)
+        self.assertEqual(Product.objects.count(), 30)
+        self.assertEqual(Version.objects.filter(is_active=True).count(), 30)
+        self.assertEqual(seeded["versions"], 90)
+
+        result = run_endpoint(Client(), reverse("catalog:home"), requests=5, warmup=1)
+        self.assertEqual(result["requests"], 5)
+        self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+        self.assertGreater(result["queries"], 0)
+
+    def test_compare_reports_regressions(self):
+        baseline = {"endpoints": {"home": {"p95_ms": 10.0, "queries": 3}}}
+        self.assertEqual(compare({"endpoints": {"home": {"p95_ms": 11.0, "queries": 3}}}, baseline, 0.2), [])
+        regressions = compare({"endpoints": {"home": {"p95_ms": 13.0, "queries": 4}}}, baseline, 0.2)
+        self.assertEqual(len(regressions), 2)
+
+    def test_run_template_with_and_without_cache(self):
+        context = {"object_list": [{"pk": 1, "title": "Статья", "content": "Текст", "photo": ""}]}
+        for cached in (False, True):
+            backend = template_backend(cached)
+            result = run_template(backend, "blog/article_list.html", context, renders=3)
+            self.assertEqual(result["renders"], 3)
+            self.assertGreater(result["bytes"], 0)
+        loader = backend.engine.template_loaders[0]
+        self.assertIn("blog/article_list.html", loader.get_template_cache)
+
+    def test_attribute_import_time(self):
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 |       PIL.Image\n"
+            "import time:        50 |        150 |     catalog.thumbnails\n"
+            "import time:        20 |        170 |   catalog.signals\n"
+            "import time:        30 |         30 |   json\n"
+            "import time:        10 |        210 | django.apps\n"
+        )
+        tree = parse_importtime(output)
+        self.assertEqual([node[0] for node in tree], ["django.apps"])
+        self.assertEqual(
+            attribute_import_time(tree, ["catalog", "users"]),
+            {"catalog": 0.17, OTHER: 0.04},
+        )
+
+    @override_settings(ROOT_URLCONF="benchmarks.urls")
+    async def test_run_concurrent_async_view(self):
+        # Как и тестовый клиент, не закрываем соединение с базой после запроса:
+        # иначе оборвется транзакция теста.
+        request_started.disconnect(close_old_connections)
+        request_finished.disconnect(close_old_connections)
+        try:
+            result = await run_concurrent(
+                get_asgi_application(), reverse("async_home"), clients=3, requests=2, client_delay=0.01
+            )
+        finally:
+            request_started.connect(close_old_connections)
+            request_finished.connect(close_old_connections)
+        self.assertEqual(result["requests"], 6)
+        self.assertGreaterEqual(result["p50_ms"], 20)
@@ -0,0 +1,14 @@
+from django.urls import include, path
+
+from blog.views import AsyncArticleDetailView, AsyncArticleListView
+from catalog.views import AsyncProductDetailView, AsyncProductListView
+
+# Асинхронные версии страниц рядом с обычными маршрутами проекта,
+# чтобы сравнивать их в одном прогоне независимо от ASYNC_READ_VIEWS.
+urlpatterns = [
+    path("_async/", AsyncProductListView.as_view(), name="async_home"),
+    path("_async/products/<int:pk>/", AsyncProductDetailView.as_view(), name="async_product_detail"),
+    path("_async/blog/", AsyncArticleListView.as_view(), name="async_article_list"),
+    path("_async/blog/view/<int:pk>", AsyncArticleDetailView.as_view(), name="async_article_detail"),
+    path("", include("config.urls")),
+]
@@ -0,0 +1,173 @@
+import threading
+import time
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+
+
+class ViewCounter:
+    """
+    Буферизованный счетчик просмотров статей.
+
+    Приросты копятся в кеше (атомарный ``incr``) и периодически переносятся
+    в базу запросами ``UPDATE ... SET views_count = views_count + n``,
+    сгруппированными по величине прироста. Пока прирост не сброшен в базу,
+    его нужно прибавлять к сохраненному значению при отображении.
+    """
+
+    key_prefix = "blog:article_views"
+
+    def __init__(self, cache_alias=None, flush_interval=None):
+        self._cache_alias = cache_alias
+        self._flush_interval = flush_interval
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    @property
+    def cache(self):
+        return caches[self._cache_alias or settings.VIEW_COUNTER_CACHE]
+
+    @property
+    def flush_interval(self):
+        if self._flush_interval is not None:
+            return self._flush_interval
+        return settings.VIEW_COUNTER_FLUSH_INTERVAL
+
+    def key(self, pk):
+        return f"{self.key_prefix}:{pk}"
+
+    def increment(self, pk, delta=1, flush=True):
+        """
+        Увеличивает отложенный счетчик просмотров статьи.
+
+        :param pk: Первичный ключ статьи.
+        :param delta: Величина прироста.
+        :param flush: Сбросить приросты в базу, если подошел срок.
+        :return: Накопленный и еще не сохраненный прирост.
+        """
+        key = self.key(pk)
+        self.cache.add(key, 0, timeout=None)
+        try:
+            pending = self.cache.incr(key, delta)
+        except ValueError:
+            # Ключ вытеснен из кеша между add и incr.
+            self.cache.set(key, delta, timeout=None)
+            pending = delta
+        with self._lock:
+            self._dirty.add(pk)
+        if flush:
+            self.maybe_flush()
+        return pending
+
+    async def aincrement(self, pk, delta=1):
+        """
+        Асинхронная версия ``increment``.
+
+        Обращения к кешу и сброс в базу, если подошел срок, выполняются
+        за один переход в пул потоков: синхронный кеш не блокирует цикл событий.
+        """
+        return await sync_to_async(self.increment)(pk, delta)
+
+    def pending(self, pk):
+        """
+        Возвращает еще не сохраненный прирост просмотров статьи.
+        """
+        return self.cache.get(self.key(pk), 0)
+
+    def pending_many(self, pks):
+        """
+        Возвращает несохраненные приросты для нескольких статей одним запросом.
+
+        :param pks: Первичные ключи статей.
+        :return: Словарь {pk: прирост} только для статей с ненулевым приростом.
+        """
+        keys = {self.key(pk): pk for pk in pks}
+        values = self.cache.get_many(keys)
+        return {keys[key]: value for key, value in values.items() if value}
+
+    def maybe_flush(self):
+        """
+        Сбрасывает приросты в базу, если с прошлого сброса прошел интервал.
+        """
+        if self.flush_due():
+            self.flush()
+
+    def flush_due(self):
+        """
+        Проверяет, прошел ли с прошлого сброса интервал ``flush_interval``.
+        """
+        return time.monotonic() - self._last_flush >= self.flush_interval
+
+    def flush(self, pks=None):
+        """
+        Переносит накопленные приросты в базу данных.
+
+        Одновременно сбрасывать может только один процесс: остальные
+        пропускают сброс, пока держится блокировка в кеше.
+
+        :param pks: Статьи для сброса. По умолчанию — статьи, просмотренные
+                    в текущем процессе с прошлого сброса.
+        :return: Количество перенесенных просмотров.
+        """
+        from blog.models import Article
+
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if pks is None:
+                pks, self._dirty = self._dirty, set()
+        if not pks:
+            return 0
+
+        lock_key = f"{self.key_prefix}:flush_lock"
+        if not self.cache.add(lock_key, 1, timeout=60):
+            with self._lock:
+                self._dirty.update(pks)
+            return 0
+        try:
+            pending = self.pending_many(pks)
+            by_delta = defaultdict(list)
+            for pk, delta in pending.items():
+                by_delta[delta].append(pk)
+            with transaction.atomic():
+                for delta, article_pks in by_delta.items():
+                    Article.objects.filter(pk__in=article_pks).update(
+                        views_count=F("views_count") + delta
+                    )
+            # Вычитаем ровно то, что сохранили: приросты, пришедшие во время
+            # сброса, останутся в кеше до следующего раза.
+            for pk, delta in pending.items():
+                try:
+                    self.cache.decr(self.key(pk), delta)
+                except ValueError:
+                    pass
+            return sum(pending.values())
+        finally:
+            self.cache.delete(lock_key)
+
+    def flush_all(self, batch_size=1000):
+        """
+        Сбрасывает приросты всех статей, а не только просмотренных в этом процессе.
+
+        :param batch_size: Количество статей, проверяемых за один запрос к кешу.
+        :return: Количество перенесенных просмотров.
+        """
+        from blog.models import Article
+
+        flushed = 0
+        batch = []
+        for pk in Article.objects.values_list("pk", flat=True).iterator(chunk_size=batch_size):
+            batch.append(pk)
+            if len(batch) >= batch_size:
+                flushed += self.flush(batch)
+                batch = []
+        if batch:
+            flushed += self.flush(batch)
+        return flushed
+
+
+article_views = ViewCounter()
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from blog.counters import article_views
+
+
+class Command(BaseCommand):
+    """
+    Принудительно переносит накопленные в кеше просмотры статей в базу данных.
+
+    Имеет смысл только при общем для всех процессов кеше счетчиков:
+    локальный кеш (locmem) виден только процессу, в котором он создан.
+    """
+
+    help = "Переносит отложенные просмотры статей в базу данных"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Количество статей, проверяемых за один запрос к кешу",
+        )
+
+    def handle(self, *args, **options):
+        flushed = article_views.flush_all(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Сохранено просмотров: {flushed}"))
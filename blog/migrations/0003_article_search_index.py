@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from catalog.search import article_index
+
+
+def install_search_index(apps, schema_editor):
+    article_index.install(schema_editor.connection)
+
+
+def uninstall_search_index(apps, schema_editor):
+    article_index.uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0002_rename_preview_article_photo"),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.2 on 2026-10-18 18:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_article_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-created_at', '-id'], name='blog_article_published_idx'),
+        ),
+    ]
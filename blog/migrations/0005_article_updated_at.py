@@ -0,0 +1,28 @@
+# Generated by Django 4.2.2 on 2026-10-18 18:23
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def copy_created_at(apps, schema_editor):
+    """
+    Существующие статьи считаются измененными в момент создания.
+    """
+    Article = apps.get_model("blog", "Article")
+    Article.objects.update(updated_at=F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_article_published_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='дата изменения'),
+        ),
+        migrations.RunPython(copy_created_at, migrations.RunPython.noop),
+    ]
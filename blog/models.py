@@ -16,6 +16,7 @@ class Article(models.Model):
     content = models.TextField(verbose_name="cодержимое статьи")
     photo = models.ImageField(upload_to="blog/photo", verbose_name="превью", **NULLABLE)
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="дата создания")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="дата изменения")
     is_published = models.BooleanField(default=True, verbose_name="опубликовано")
     views_count = models.IntegerField(default=0, verbose_name="просмотры")
 
@@ -26,3 +27,11 @@ class Article(models.Model):
         verbose_name = "статья"
         verbose_name_plural = "статьи"
         ordering = ("-created_at",)
+        indexes = [
+            # Список блога: только опубликованные статьи, новые сначала.
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(is_published=True),
+                name="blog_article_published_idx",
+            ),
+        ]
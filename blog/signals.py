@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from blog.models import Article
+from catalog.thumbnails import make_thumbnails
+
+
+@receiver(post_save, sender=Article)
+def article_photo_thumbnails(sender, instance, **kwargs):
+    """
+    Создает уменьшенные копии превью статьи после загрузки.
+    """
+    if instance.photo:
+        make_thumbnails(instance.photo.name)
@@ -1,3 +1,116 @@
-from django.test import TestCase
+from io import StringIO
 
-# Create your tests here.
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from blog.counters import ViewCounter, article_views
+from blog.models import Article
+
+
+class ArticleListViewTest(TestCase):
+    """
+    Проверяет курсорную пагинацию списка статей.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        for number in range(15):
+            Article.objects.create(title=f"Статья {number}", content="Текст")
+        Article.objects.create(title="Черновик", content="Текст", is_published=False)
+
+    def test_pages_cover_published_articles(self):
+        url = reverse("blog:article_list")
+        response = self.client.get(url)
+        titles = [article.title for article in response.context["object_list"]]
+        next_cursor = response.context["page_obj"].next_cursor
+
+        response = self.client.get(url, {"cursor": next_cursor})
+        titles += [article.title for article in response.context["object_list"]]
+
+        self.assertFalse(response.context["page_obj"].has_next())
+        self.assertEqual(titles, [f"Статья {number}" for number in reversed(range(15))])
+
+
+class ViewCounterTest(TestCase):
+    """
+    Проверяет отложенный счетчик просмотров статей.
+    """
+
+    def setUp(self):
+        caches["counters"].clear()
+        self.article = Article.objects.create(title="Статья", content="Текст", views_count=5)
+
+    def test_detail_view_does_not_write_article(self):
+        url = reverse("blog:article_detail", args=[self.article.pk])
+        for _ in range(3):
+            response = self.client.get(url)
+        self.assertEqual(response.context["object"].views_count, 8)
+
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.views_count, 5)
+
+        call_command("flush_view_counts", stdout=StringIO())
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.views_count, 8)
+        self.assertEqual(article_views.pending(self.article.pk), 0)
+
+    def test_not_modified_response_counts_view(self):
+        url = reverse("blog:article_detail", args=[self.article.pk])
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(article_views.pending(self.article.pk), 2)
+
+        self.article.content = "Новый текст"
+        self.article.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_flush_groups_increments(self):
+        other = Article.objects.create(title="Другая", content="Текст")
+        counter = ViewCounter(flush_interval=3600)
+        counter.increment(self.article.pk, 2)
+        counter.increment(other.pk)
+        counter.increment(other.pk)
+
+        # Одинаковые приросты сохраняются одним UPDATE (плюс точка сохранения).
+        with self.assertNumQueries(3):
+            self.assertEqual(counter.flush(), 4)
+
+        self.article.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual((self.article.views_count, other.views_count), (7, 2))
+
+
+@override_settings(ROOT_URLCONF="benchmarks.urls")
+class AsyncArticleViewsTest(TestCase):
+    """
+    Проверяет асинхронные версии списка и карточки статьи.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.article = Article.objects.create(title="Статья", content="Текст", views_count=5)
+        Article.objects.create(title="Черновик", content="Текст", is_published=False)
+
+    def setUp(self):
+        caches["counters"].clear()
+
+    async def test_list_and_detail(self):
+        response = await self.async_client.get(reverse("async_article_list"))
+        self.assertContains(response, "Статья")
+        self.assertNotContains(response, "Черновик")
+
+        url = reverse("async_article_detail", args=[self.article.pk])
+        await self.async_client.get(url)
+        response = await self.async_client.get(url)
+        self.assertContains(response, "Просмотров: 7")
+        self.assertEqual(article_views.pending(self.article.pk), 2)
+
+        response = await self.async_client.get(url, headers={"If-None-Match": response["ETag"]})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(article_views.pending(self.article.pk), 3)
+
+        response = await self.async_client.get(reverse("async_article_detail", args=[0]))
+        self.assertEqual(response.status_code, 404)
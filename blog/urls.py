@@ -1,10 +1,15 @@
+from django.conf import settings
 from django.urls import path
 
 from blog.apps import BlogConfig
-from blog.views import ArticleListView, ArticleDetailView, ArticleCreateView, ArticleUpdateView, ArticleDeleteView
+from blog.views import ArticleListView, ArticleDetailView, ArticleCreateView, ArticleUpdateView, ArticleDeleteView, \
+    AsyncArticleListView, AsyncArticleDetailView
 
 app_name = BlogConfig.name
 
+if settings.ASYNC_READ_VIEWS:
+    ArticleListView, ArticleDetailView = AsyncArticleListView, AsyncArticleDetailView
+
 urlpatterns = [
     path('', ArticleListView.as_view(), name='article_list'),
     path("view/<int:pk>", ArticleDetailView.as_view(), name="article_detail"),
@@ -1,3 +1,5 @@
+from asgiref.sync import sync_to_async
+from django.http import Http404
 from django.urls import reverse_lazy, reverse
 from django.views.generic import (
     ListView,
@@ -8,18 +10,34 @@ from django.views.generic import (
 )
 from pytils.translit import slugify
 
+from blog.counters import article_views
 from blog.forms import ArticleUpdateForm
 from blog.models import Article
+from catalog.async_views import AsyncTemplateView
+from catalog.conditional import AsyncConditionalGetMixin, ConditionalGetMixin
+from catalog.paginators import KeysetPaginationMixin
 
 
-class ArticleListView(ListView):
+def add_pending_views(articles):
+    """
+    Добавляет к счетчикам просмотров еще не сохраненные в базу приросты.
+    """
+    pending = article_views.pending_many(article.pk for article in articles)
+    for article in articles:
+        article.views_count += pending.get(article.pk, 0)
+
+
+class ArticleListView(KeysetPaginationMixin, ListView):
     """
     Представление для отображения списка статей блога.
 
-    Отображает только опубликованные статьи.
+    Отображает только опубликованные статьи, разбитые на страницы
+    курсорной пагинацией по дате создания.
     """
 
     model = Article
+    paginate_by = 10
+    keyset_ordering = "-created_at"
 
     def get_queryset(self, *args, **kwargs):
         """
@@ -29,23 +47,112 @@ class ArticleListView(ListView):
         queryset = queryset.filter(is_published=True)
         return queryset
 
+    def get_context_data(self, **kwargs):
+        """
+        Добавляет к счетчикам просмотров еще не сохраненные в базу приросты.
+        """
+        context = super().get_context_data(**kwargs)
+        add_pending_views(context["object_list"])
+        return context
+
+
+class AsyncArticleListView(KeysetPaginationMixin, AsyncTemplateView):
+    """
+    Асинхронная версия ``ArticleListView`` для запуска под ASGI.
+    """
+
+    template_name = "blog/article_list.html"
+    paginate_by = 10
+    keyset_ordering = "-created_at"
+
+    async def aget_context_data(self, **kwargs):
+        """
+        Загружает страницу опубликованных статей асинхронным ORM.
+
+        :param kwargs: Дополнительные параметры контекста.
+        :return: Контекст, совпадающий с контекстом ``ArticleListView``.
+        """
+        paginator, page, object_list, is_paginated = await self.apaginate_queryset(
+            Article.objects.filter(is_published=True), self.paginate_by
+        )
+        # Синхронный кеш счетчиков читается за один переход в пул потоков.
+        await sync_to_async(add_pending_views)(object_list)
+        return self.get_context_data(
+            paginator=paginator,
+            page_obj=page,
+            is_paginated=is_paginated,
+            object_list=object_list,
+            article_list=object_list,
+            **kwargs,
+        )
+
+
+def article_validator_values(updated_at):
+    """
+    Возвращает валидаторы условного GET статьи по времени ее изменения.
+
+    Счетчик просмотров в валидаторы не входит: иначе страница менялась бы
+    при каждом просмотре, и в кешированной копии он может отставать.
+    """
+    if updated_at is None:
+        return None
+    return (updated_at.isoformat(),), updated_at
+
 
-class ArticleDetailView(DetailView):
+class ArticleDetailView(ConditionalGetMixin, DetailView):
     """
     Представление для отображения деталей статьи.
 
-    Увеличивает счетчик просмотров при каждом обращении к статье.
+    Увеличивает счетчик просмотров при каждом обращении к статье, в том
+    числе при ответе 304. Прирост копится в кеше и сбрасывается в базу
+    пакетно (см. ``blog.counters``).
     """
 
     model = Article
 
+    def get_validators(self):
+        return article_validator_values(
+            Article.objects.filter(pk=self.kwargs["pk"]).values_list("updated_at", flat=True).first()
+        )
+
+    def not_modified(self):
+        article_views.increment(self.kwargs["pk"])
+
     def get_object(self, queryset=None):
         self.object = super().get_object(queryset)
-        self.object.views_count += 1
-        self.object.save()
+        self.object.views_count += article_views.increment(self.object.pk)
         return self.object
 
 
+class AsyncArticleDetailView(AsyncConditionalGetMixin, AsyncTemplateView):
+    """
+    Асинхронная версия ``ArticleDetailView`` для запуска под ASGI.
+    """
+
+    template_name = "blog/article_detail.html"
+
+    async def aget_validators(self):
+        return article_validator_values(
+            await Article.objects.filter(pk=self.kwargs["pk"]).values_list("updated_at", flat=True).afirst()
+        )
+
+    async def anot_modified(self):
+        await article_views.aincrement(self.kwargs["pk"])
+
+    async def aget_context_data(self, **kwargs):
+        """
+        Загружает статью и увеличивает счетчик просмотров.
+
+        :raises Http404: Если статья не найдена.
+        """
+        try:
+            article = await Article.objects.aget(pk=kwargs["pk"])
+        except Article.DoesNotExist:
+            raise Http404("Статья не найдена")
+        article.views_count += await article_views.aincrement(article.pk)
+        return self.get_context_data(object=article, article=article, **kwargs)
+
+
 class ArticleCreateView(CreateView):
     """
     Представление для создания новой статьи.
@@ -1,7 +1,7 @@
 from django.contrib import admin
 
 from blog.models import Article
-from catalog.models import Product, Category, ContactsInfo, Version
+from catalog.models import ForbiddenWord, Product, Category, ContactsInfo, Version
 
 
 @admin.register(Product)
@@ -9,7 +9,8 @@ class ProductAdmin(admin.ModelAdmin):
     # list_display = ('id', 'name', 'price', 'description', 'category', 'photo', 'created_at', 'updated_at')
     list_display = ('id', 'name', 'price', 'description', 'category')
     list_filter = ('category',)
-    search_fields = ('name', 'description',)
+    search_fields = ('name', 'description', 'external_id')
+    readonly_fields = ('external_id',)
 
 
 @admin.register(Category)
@@ -28,6 +29,14 @@ class VersionAdmin(admin.ModelAdmin):
     list_filter = ("is_active", "product")
 
 
+@admin.register(ForbiddenWord)
+class ForbiddenWordAdmin(admin.ModelAdmin):
+    list_display = ("word", "is_active", "created_at")
+    list_editable = ("is_active",)
+    list_filter = ("is_active",)
+    search_fields = ("word",)
+
+
 @admin.register(Article)
 class ArticleAdmin(admin.ModelAdmin):
     list_display = ("id", "title", "content", "created_at", "is_published", "slug")
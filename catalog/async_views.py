@@ -0,0 +1,43 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.shortcuts import render
+from django.views.generic import View
+from django.views.generic.base import ContextMixin, TemplateResponseMixin
+
+
+async def aload_user(request):
+    """
+    Загружает пользователя запроса до рендеринга шаблона.
+
+    ``request.user`` — ленивый объект, который при первом обращении читает
+    сессию и пользователя синхронным ORM. Без cookie сессии пользователь
+    анонимный и загружается без обращения к базе; иначе загрузка выполняется
+    в пуле потоков один раз на запрос.
+
+    :param request: Запрос.
+    :return: Пользователь запроса.
+    """
+    if settings.SESSION_COOKIE_NAME in request.COOKIES:
+        await sync_to_async(lambda: request.user.is_authenticated)()
+    return request.user
+
+
+class AsyncTemplateView(TemplateResponseMixin, ContextMixin, View):
+    """
+    Базовое асинхронное представление страницы только для чтения.
+
+    Данные страницы загружаются асинхронным ORM в ``aget_context_data``,
+    шаблон рендерится сразу в цикле событий. Поэтому шаблон не должен
+    обращаться к базе: все связанные объекты загружаются заранее, иначе
+    Django выбросит ``SynchronousOnlyOperation``.
+    """
+
+    async def aget_context_data(self, **kwargs):
+        return self.get_context_data(**kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        await aload_user(request)
+        context = await self.aget_context_data(**kwargs)
+        # Обычный HttpResponse, а не TemplateResponse: отложенный рендеринг
+        # Django выполнил бы в пуле потоков.
+        return render(request, self.get_template_names(), context)
@@ -0,0 +1,115 @@
+import hashlib
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from catalog.async_views import aload_user
+
+
+def make_etag(*parts):
+    """
+    Возвращает слабый ETag по значениям, от которых зависит страница.
+    """
+    digest = hashlib.md5(":".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+class BaseConditionalGetMixin:
+    """
+    Условный GET (ETag и Last-Modified) для страниц деталей.
+
+    Валидаторы вычисляются одним легким запросом,
+    без загрузки объекта и рендеринга шаблона. Если клиент уже получил
+    эту версию страницы, возвращается 304. В ETag входит пользователь:
+    страница содержит меню, которое зависит от авторизации.
+
+    Анонимные ответы можно кешировать на общем прокси или CDN
+    CONDITIONAL_GET_SHARED_MAX_AGE секунд, браузер перепроверяет их
+    при каждом запросе; ответы авторизованным пользователям приватны.
+    """
+
+    def get_conditional_headers(self, validators):
+        parts, last_modified = validators
+        user = self.request.user
+        etag = make_etag(user.pk if user.is_authenticated else 0, *parts)
+        return etag, int(last_modified.timestamp())
+
+    def patch_conditional_response(self, response, etag, last_modified):
+        if response.status_code not in (200, 304):
+            return response
+        response.headers.setdefault("ETag", etag)
+        response.headers.setdefault("Last-Modified", http_date(last_modified))
+        if self.request.user.is_authenticated:
+            patch_cache_control(response, private=True, no_cache=True)
+        else:
+            patch_cache_control(
+                response,
+                public=True,
+                max_age=0,
+                s_maxage=settings.CONDITIONAL_GET_SHARED_MAX_AGE,
+            )
+        patch_vary_headers(response, ("Cookie",))
+        return response
+
+
+class ConditionalGetMixin(BaseConditionalGetMixin):
+    """
+    Условный GET для синхронных представлений.
+    """
+
+    def get_validators(self):
+        """
+        Возвращает данные, от которых зависит страница.
+
+        :return: Кортеж (части ETag, время последнего изменения) или None,
+                 если объекта нет (тогда страница обрабатывается как обычно).
+        """
+        raise NotImplementedError
+
+    def not_modified(self):
+        """
+        Вызывается перед ответом 304, например для учета просмотра.
+        """
+
+    def get(self, request, *args, **kwargs):
+        validators = self.get_validators()
+        if validators is None:
+            return super().get(request, *args, **kwargs)
+        etag, last_modified = self.get_conditional_headers(validators)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None and response.status_code == 304:
+            self.not_modified()
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        return self.patch_conditional_response(response, etag, last_modified)
+
+
+class AsyncConditionalGetMixin(BaseConditionalGetMixin):
+    """
+    Условный GET для асинхронных представлений (см. ``AsyncTemplateView``).
+    """
+
+    async def aget_validators(self):
+        """
+        Асинхронная версия ``ConditionalGetMixin.get_validators``.
+        """
+        raise NotImplementedError
+
+    async def anot_modified(self):
+        """
+        Асинхронная версия ``ConditionalGetMixin.not_modified``.
+        """
+
+    async def get(self, request, *args, **kwargs):
+        await aload_user(request)
+        validators = await self.aget_validators()
+        if validators is None:
+            return await super().get(request, *args, **kwargs)
+        etag, last_modified = self.get_conditional_headers(validators)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None and response.status_code == 304:
+            await self.anot_modified()
+        if response is None:
+            response = await super().get(request, *args, **kwargs)
+        return self.patch_conditional_response(response, etag, last_modified)
@@ -0,0 +1,175 @@
+import contextlib
+import csv
+import json
+import sys
+from decimal import Decimal, InvalidOperation
+
+FORMATS = ("csv", "jsonl")
+
+# В CSV у товара одна строка, поэтому из версий выгружается только активная.
+CSV_FIELDS = (
+    "external_id",
+    "name",
+    "description",
+    "price",
+    "category",
+    "publication",
+    "version_number",
+    "version_name",
+)
+
+TRUE_VALUES = {"1", "true", "yes", "да"}
+
+
+def detect_format(path, file_format=None):
+    """
+    Определяет формат файла обмена по явному значению или расширению.
+
+    :param path: Путь к файлу или ``-`` для стандартного потока.
+    :param file_format: Формат из параметров команды или None.
+    :return: ``"csv"`` или ``"jsonl"`` (по умолчанию).
+    """
+    if file_format:
+        return file_format
+    return "csv" if str(path).lower().endswith(".csv") else "jsonl"
+
+
+def open_stream(path, mode):
+    """
+    Открывает файл обмена в UTF-8; ``-`` означает stdin или stdout.
+
+    :param path: Путь к файлу.
+    :param mode: ``"r"`` или ``"w"``.
+    :return: Контекстный менеджер файла.
+    """
+    if path == "-":
+        return contextlib.nullcontext(sys.stdin if mode == "r" else sys.stdout)
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUE_VALUES
+
+
+def normalize_row(data):
+    """
+    Приводит запись файла обмена к единому виду для импорта.
+
+    :param data: Словарь строки CSV или объекта JSON.
+    :return: Словарь с полями товара и списком версий.
+    :raises ValueError: Если цена или версии записаны неверно.
+    """
+    try:
+        price = Decimal(str(data.get("price") or "0"))
+    except InvalidOperation:
+        raise ValueError(f"неверная цена {data.get('price')!r}")
+    if "versions" in data:
+        versions = [
+            {
+                "version_number": str(version["version_number"]),
+                "version_name": version.get("version_name") or "",
+                "is_active": parse_bool(version.get("is_active", False)),
+            }
+            for version in data["versions"]
+        ]
+    elif data.get("version_number"):
+        versions = [
+            {
+                "version_number": data["version_number"],
+                "version_name": data.get("version_name") or "",
+                "is_active": True,
+            }
+        ]
+    else:
+        versions = []
+    return {
+        "external_id": (data.get("external_id") or "").strip(),
+        "name": data.get("name") or "",
+        "description": data.get("description") or "",
+        "price": price,
+        "category": (data.get("category") or "").strip(),
+        "publication": parse_bool(data.get("publication", False)),
+        "versions": versions,
+    }
+
+
+def iter_rows(file, file_format):
+    """
+    Потоково читает записи файла обмена по одной.
+
+    :param file: Открытый текстовый файл.
+    :param file_format: ``"csv"`` или ``"jsonl"``.
+    :return: Генератор пар (номер строки, нормализованная запись).
+    :raises ValueError: Если строка повреждена.
+    """
+    if file_format == "csv":
+        reader = csv.DictReader(file)
+        for data in reader:
+            try:
+                yield reader.line_num, normalize_row(data)
+            except ValueError as error:
+                raise ValueError(f"строка {reader.line_num}: {error}")
+        return
+
+    for line_number, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, normalize_row(json.loads(line))
+        except (ValueError, KeyError, TypeError) as error:
+            raise ValueError(f"строка {line_number}: {error}")
+
+
+def product_row(product):
+    """
+    Возвращает запись файла обмена для товара.
+
+    :param product: Товар с загруженными категорией и версиями.
+    """
+    return {
+        "external_id": product.external_id or "",
+        "name": product.name,
+        "description": product.description,
+        "price": str(product.price),
+        "category": product.category.name if product.category else "",
+        "publication": product.publication,
+        "versions": [
+            {
+                "version_number": version.version_number,
+                "version_name": version.version_name,
+                "is_active": version.is_active,
+            }
+            for version in product.version_set.all()
+        ],
+    }
+
+
+def make_writer(file, file_format):
+    """
+    Возвращает функцию, записывающую одну запись в файл обмена.
+
+    :param file: Открытый текстовый файл.
+    :param file_format: ``"csv"`` или ``"jsonl"``.
+    """
+    if file_format == "jsonl":
+        def write(row):
+            file.write(json.dumps(row, ensure_ascii=False))
+            file.write("\n")
+        return write
+
+    writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+
+    def write(row):
+        active = next((version for version in row["versions"] if version["is_active"]), None)
+        writer.writerow(
+            {
+                **{field: row[field] for field in CSV_FIELDS[:5]},
+                "publication": "1" if row["publication"] else "0",
+                "version_number": active["version_number"] if active else "",
+                "version_name": active["version_name"] if active else "",
+            }
+        )
+    return write
@@ -1,6 +1,7 @@
 from django.forms import ValidationError, BooleanField, ModelForm
 
 from catalog.models import Product, Version
+from catalog.moderation import find_forbidden_words
 
 
 class StyleFormMixin:
@@ -39,21 +40,10 @@ class ProductForm(StyleFormMixin, ModelForm):
     """
     Форма для создания и редактирования продукта.
 
-    Проверяет наличие запрещенных слов в названии и описании продукта.
+    Проверяет наличие запрещенных слов словаря модерации (``ForbiddenWord``)
+    в названии и описании продукта.
     """
 
-    forbidden_words = [
-        "казино",
-        "криптовалюта",
-        "крипта",
-        "биржа",
-        "дешево",
-        "бесплатно",
-        "обман",
-        "полиция",
-        "радар",
-    ]
-
     class Meta:
         model = Product
         fields = "__all__"
@@ -66,7 +56,7 @@ class ProductForm(StyleFormMixin, ModelForm):
         :raises ValidationError: Если в названии содержатся запрещенные слова.
         """
         name = self.cleaned_data.get("name")
-        if any(word in name.lower() for word in self.forbidden_words):
+        if find_forbidden_words(name):
             raise ValidationError(
                 "Название товара не должно содержать запрещенные слова"
             )
@@ -80,7 +70,7 @@ class ProductForm(StyleFormMixin, ModelForm):
         :raises ValidationError: Если в описании содержатся запрещенные слова.
         """
         description = self.cleaned_data.get("description")
-        if any(word in description.lower() for word in self.forbidden_words):
+        if find_forbidden_words(description):
             raise ValidationError("Описание не должно содержать запрещенные слова")
         return description
 
@@ -0,0 +1,76 @@
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+PRODUCT_CARD_TEMPLATE = "catalog/includes/product_card.html"
+PRODUCT_CARD_KEY = "catalog:product_card:{pk}"
+PRODUCT_CARD_TIMEOUT = 60 * 60 * 24
+
+
+def product_card_key(pk):
+    """
+    Возвращает ключ кеша для карточки продукта.
+    """
+    return PRODUCT_CARD_KEY.format(pk=pk)
+
+
+def product_card_fingerprint(product):
+    """
+    Возвращает отпечаток данных, от которых зависит карточка продукта.
+
+    Закешированная карточка с другим отпечатком считается устаревшей,
+    даже если сигнал об изменении не дошел до кеша.
+
+    :param product: Строка проекции ``ProductCard`` из ``.values()``.
+    """
+    return product["updated_at"], product["version_number"]
+
+
+def get_product_cards(products):
+    """
+    Возвращает общую (не зависящую от пользователя) разметку карточек продуктов.
+
+    Карточки читаются из кеша одним запросом, недостающие рендерятся
+    и сохраняются одним запросом.
+
+    :param products: Строки проекции ``ProductCard`` из ``.values()``.
+    :return: Список пар (строка проекции, HTML карточки).
+    """
+    keys = {
+        product["product_id"]: product_card_key(product["product_id"]) for product in products
+    }
+    cached = cache.get_many(keys.values())
+    cards = []
+    rendered = {}
+    for product in products:
+        key = keys[product["product_id"]]
+        fingerprint = product_card_fingerprint(product)
+        entry = cached.get(key)
+        if entry and entry[0] == fingerprint:
+            html = entry[1]
+        else:
+            html = render_to_string(PRODUCT_CARD_TEMPLATE, {"object": product})
+            rendered[key] = (fingerprint, str(html))
+        cards.append((product, mark_safe(html)))
+    if rendered:
+        cache.set_many(rendered, PRODUCT_CARD_TIMEOUT)
+    return cards
+
+
+async def aget_product_cards(products):
+    """
+    Асинхронная версия ``get_product_cards``.
+
+    В Django 4.2 ``aget_many``/``aset_many`` встроенных бэкендов обращаются
+    к кешу по одному ключу, каждый раз через пул потоков. Поэтому чтение,
+    рендер и запись карточек целиком выполняются за один переход в пул.
+    """
+    return await sync_to_async(get_product_cards)(products)
+
+
+def invalidate_product_card(pk):
+    """
+    Удаляет карточку продукта из кеша.
+    """
+    cache.delete(product_card_key(pk))
@@ -0,0 +1,85 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.models import Article
+from catalog.models import Product
+from catalog.thumbnails import save_thumbnail, thumbnail_name
+from users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Создает уменьшенные копии для уже загруженных изображений:
+    фото продуктов, превью статей и аватаров пользователей.
+
+    Изображения обрабатываются в пуле процессов, готовые копии пропускаются,
+    поэтому команду можно безопасно запускать повторно.
+    """
+
+    help = "Создает уменьшенные копии загруженных изображений"
+
+    image_fields = ((Product, "photo"), (Article, "photo"), (User, "avatar"))
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Количество процессов (по умолчанию — число ядер)",
+        )
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=None,
+            help="Ширины копий (по умолчанию THUMBNAIL_SIZES)",
+        )
+
+    def get_image_names(self):
+        """
+        Возвращает пути всех загруженных изображений без повторов.
+        """
+        names = set()
+        for model, field in self.image_fields:
+            names.update(
+                model.objects.exclude(**{field: ""})
+                .exclude(**{f"{field}__isnull": True})
+                .values_list(field, flat=True)
+                .distinct()
+            )
+        return sorted(names)
+
+    def handle(self, *args, **options):
+        sizes = options["sizes"] or settings.THUMBNAIL_SIZES
+        image_format = settings.THUMBNAIL_FORMAT.upper()
+        names = self.get_image_names()
+        tasks = [
+            (
+                os.path.join(settings.MEDIA_ROOT, name),
+                os.path.join(settings.MEDIA_ROOT, thumbnail_name(name, width, image_format)),
+                width,
+                image_format,
+                settings.THUMBNAIL_QUALITY,
+            )
+            for name in names
+            for width in sizes
+        ]
+
+        started = time.monotonic()
+        with ProcessPoolExecutor(max_workers=options["workers"]) as executor:
+            results = list(executor.map(save_thumbnail, *zip(*tasks), chunksize=16)) if tasks else []
+        elapsed = time.monotonic() - started
+
+        created = results.count(True)
+        failed = results.count(False)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Изображений: {len(names)}, копий: {created}, "
+                f"пропущено (исходник уже копии): {len(results) - created - failed}, "
+                f"ошибок: {failed}, время: {elapsed:.2f} с"
+            )
+        )
@@ -0,0 +1,68 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Prefetch
+
+from catalog.exchange import FORMATS, detect_format, make_writer, open_stream, product_row
+from catalog.models import Product, Version
+
+
+class Command(BaseCommand):
+    """
+    Выгружает товары в CSV или JSON Lines.
+
+    Товары читаются через ``.iterator(chunk_size=...)``: в PostgreSQL это
+    серверный курсор, категории подгружаются в том же запросе, а версии —
+    одним запросом на каждую порцию. В памяти одновременно держится только
+    текущая порция, поэтому размер каталога не ограничен.
+    """
+
+    help = "Выгружает товары в CSV или JSON Lines"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Файл выгрузки или - для стандартного вывода")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Формат файла (по умолчанию по расширению, иначе jsonl)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Количество товаров, читаемых из базы за раз",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        chunk_size = options["chunk_size"]
+        file_format = detect_format(path, options["format"])
+        # При выгрузке в stdout отчет о скорости не должен смешиваться с данными.
+        log = self.stderr if path == "-" else self.stdout
+        queryset = (
+            Product.objects.select_related("category")
+            .prefetch_related(Prefetch("version_set", queryset=Version.objects.order_by("pk")))
+            .order_by("pk")
+        )
+
+        count = 0
+        started = batch_started = time.monotonic()
+        with open_stream(path, "w") as file:
+            write = make_writer(file, file_format)
+            for product in queryset.iterator(chunk_size=chunk_size):
+                write(product_row(product))
+                count += 1
+                if count % chunk_size == 0:
+                    elapsed = time.monotonic() - batch_started
+                    log.write(
+                        f"Выгружено {count}, {chunk_size / elapsed if elapsed else 0:.0f} строк/с"
+                    )
+                    batch_started = time.monotonic()
+
+        total_time = time.monotonic() - started
+        log.write(
+            self.style.SUCCESS(
+                f"Выгружено {count} товаров за {total_time:.2f} с "
+                f"({count / total_time if total_time else 0:.0f} строк/с)"
+            )
+        )
@@ -0,0 +1,217 @@
+import time
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DataError, IntegrityError, transaction
+
+from catalog.exchange import FORMATS, detect_format, iter_rows, open_stream
+from catalog.models import Category, Product, Version
+from catalog.projections import refresh_product_cards
+
+
+class Command(BaseCommand):
+    """
+    Загружает товары из CSV или JSON Lines с обновлением существующих.
+
+    Товар определяется внешним ключом ``external_id``: новые товары создаются,
+    существующие обновляются. Файл читается потоково, записи обрабатываются
+    пакетами, каждый пакет — одна транзакция:
+
+    - товары вставляются одним ``bulk_create(update_conflicts=True)``;
+    - категории ищутся по названию в словаре, загруженном один раз,
+      отсутствующие создаются;
+    - версии добавляются или обновляются по номеру; если в файле есть
+      активная версия, прежняя активная версия товара снимается с активности;
+    - карточки товаров для главной страницы пересчитываются для всего пакета.
+
+    Сигналы моделей при этом не вызываются. Записи без ``external_id``
+    пропускаются. Длина строк и цена каждой записи проверяются по полям
+    моделей при чтении, поэтому слишком длинное название или цена вне
+    ``max_digits`` останавливают загрузку с номером строки, а не ошибкой
+    базы посреди пакета.
+    """
+
+    help = "Загружает товары из CSV или JSON Lines"
+
+    product_fields = ["name", "description", "price", "category", "publication", "updated_at"]
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Файл для загрузки или - для стандартного ввода")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Формат файла (по умолчанию по расширению, иначе jsonl)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Количество записей в одном пакете",
+        )
+
+    def validate_row(self, line_number, row):
+        """
+        Проверяет значения записи валидаторами полей моделей.
+
+        Пустые значения допускаются, как и раньше: проверяется то, что база
+        отвергла бы ошибкой ``DataError`` (длина строк, разрядность цены).
+
+        :param line_number: Номер строки файла.
+        :param row: Нормализованная запись.
+        :raises ValueError: С номером строки и названием поля.
+        """
+        values = [
+            (Product, "external_id", row["external_id"]),
+            (Product, "name", row["name"]),
+            (Product, "price", row["price"]),
+            (Category, "name", row["category"]),
+        ]
+        for version in row["versions"]:
+            values.append((Version, "version_number", version["version_number"]))
+            values.append((Version, "version_name", version["version_name"]))
+        for model, name, value in values:
+            field = model._meta.get_field(name)
+            try:
+                field.run_validators(field.to_python(value))
+            except ValidationError as error:
+                raise ValueError(
+                    f"строка {line_number}: {field.verbose_name}: {' '.join(error.messages)}"
+                )
+
+    def get_category_id(self, name):
+        """
+        Возвращает первичный ключ категории по названию, создавая новую при необходимости.
+
+        :param name: Название категории или пустая строка.
+        :return: Первичный ключ или None для товара без категории.
+        """
+        if not name:
+            return None
+        if name not in self.category_ids:
+            self.category_ids[name] = Category.objects.create(name=name, description="").pk
+        return self.category_ids[name]
+
+    def import_versions(self, rows, product_ids):
+        """
+        Добавляет и обновляет версии товаров пакета.
+
+        :param rows: Записи пакета по внешнему ключу.
+        :param product_ids: Первичные ключи товаров по внешнему ключу.
+        """
+        imported = {
+            (product_ids[external_id], version["version_number"]): version
+            for external_id, row in rows.items()
+            for version in row["versions"]
+        }
+        if not imported:
+            return
+        existing = {
+            (product_id, number): pk
+            for pk, product_id, number in Version.objects.filter(
+                product_id__in={product_id for product_id, _ in imported}
+            ).values_list("pk", "product_id", "version_number")
+        }
+        # Сначала снимается прежняя активная версия: двух активных версий
+        # не допускает ограничение catalog_version_one_active.
+        Version.objects.filter(
+            product_id__in={key[0] for key, version in imported.items() if version["is_active"]},
+            is_active=True,
+        ).update(is_active=False)
+
+        created, updated = [], []
+        for (product_id, number), data in imported.items():
+            version = Version(
+                pk=existing.get((product_id, number)),
+                product_id=product_id,
+                version_number=number,
+                version_name=data["version_name"],
+                is_active=data["is_active"],
+            )
+            (updated if version.pk else created).append(version)
+        Version.objects.bulk_update(updated, ["version_name", "is_active"])
+        Version.objects.bulk_create(created)
+
+    def import_batch(self, batch):
+        """
+        Загружает пакет записей в одной транзакции.
+
+        :param batch: Список пар (номер строки, запись).
+        :return: Кортеж (создано, обновлено).
+        """
+        # Повтор товара внутри пакета: побеждает последняя запись,
+        # иначе INSERT ... ON CONFLICT затронул бы одну строку дважды.
+        rows = {row["external_id"]: row for _, row in batch}
+        with transaction.atomic():
+            existing = set(
+                Product.objects.filter(external_id__in=rows).values_list("external_id", flat=True)
+            )
+            Product.objects.bulk_create(
+                [
+                    Product(
+                        external_id=external_id,
+                        name=row["name"],
+                        description=row["description"],
+                        price=row["price"],
+                        category_id=self.get_category_id(row["category"]),
+                        publication=row["publication"],
+                    )
+                    for external_id, row in rows.items()
+                ],
+                update_conflicts=True,
+                unique_fields=["external_id"],
+                update_fields=self.product_fields,
+            )
+            product_ids = dict(
+                Product.objects.filter(external_id__in=rows).values_list("external_id", "pk")
+            )
+            self.import_versions(rows, product_ids)
+            refresh_product_cards(product_ids.values())
+        return len(rows) - len(existing), len(existing)
+
+    def flush(self, batch):
+        started = time.monotonic()
+        try:
+            created, updated = self.import_batch(batch)
+        except (IntegrityError, DataError) as error:
+            raise CommandError(f"строки {batch[0][0]}–{batch[-1][0]}: {error}")
+        elapsed = time.monotonic() - started
+        self.created += created
+        self.updated += updated
+        self.stdout.write(
+            f"Строки {batch[0][0]}–{batch[-1][0]}: создано {created}, обновлено {updated}, "
+            f"{len(batch) / elapsed if elapsed else 0:.0f} строк/с"
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        batch_size = options["batch_size"]
+        file_format = detect_format(path, options["format"])
+        self.category_ids = dict(Category.objects.values_list("name", "pk"))
+        self.created = self.updated = skipped = 0
+        started = time.monotonic()
+
+        batch = []
+        try:
+            with open_stream(path, "r") as file:
+                for line_number, row in iter_rows(file, file_format):
+                    if not row["external_id"]:
+                        skipped += 1
+                        continue
+                    self.validate_row(line_number, row)
+                    batch.append((line_number, row))
+                    if len(batch) >= batch_size:
+                        self.flush(batch)
+                        batch = []
+        except ValueError as error:
+            raise CommandError(f"{path}: {error}")
+        if batch:
+            self.flush(batch)
+
+        total = self.created + self.updated
+        total_time = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Создано {self.created}, обновлено {self.updated}, пропущено {skipped} "
+                f"за {total_time:.2f} с ({total / total_time if total_time else 0:.0f} строк/с)"
+            )
+        )
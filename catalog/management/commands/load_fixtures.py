@@ -1,105 +1,242 @@
+import codecs
+import io
 import json
+import time
+from collections import defaultdict
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
 
 from blog.models import Article
-from catalog.models import Product, Category, ContactsInfo
+from catalog.models import Product, Category, ContactsInfo, ProductCard, Version
+from catalog.projections import rebuild_product_cards
+
+BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def iter_fixture(path, chunk_size=64 * 1024):
+    """
+    Потоково читает файл фикстуры — JSON-массив объектов.
+
+    Файл читается кусками по ``chunk_size`` символов, объекты массива
+    разбираются по одному через ``JSONDecoder.raw_decode``, поэтому в памяти
+    держится только текущий кусок, а не весь файл. Кодировка определяется
+    по BOM (фикстуры, выгруженные в Windows, сохранены в UTF-16).
+
+    :param path: Путь к файлу фикстуры.
+    :param chunk_size: Размер читаемого куска.
+    :return: Генератор словарей фикстуры.
+    """
+    with open(path, "rb") as raw:
+        head = raw.read(4)
+        encoding = next((name for bom, name in BOMS if head.startswith(bom)), "utf-8")
+        raw.seek(0)
+        file = io.TextIOWrapper(raw, encoding=encoding)
+        decoder = json.JSONDecoder()
+        buffer = ""
+        position = 0
+        started = False
+        eof = False
+
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position >= len(buffer):
+                if eof:
+                    raise CommandError(f"{path}: неожиданный конец файла")
+                chunk = file.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[position:] + chunk
+                position = 0
+                continue
+
+            if not started:
+                if buffer[position] != "[":
+                    raise CommandError(f"{path}: фикстура должна быть JSON-массивом")
+                started = True
+                position += 1
+                continue
+            if buffer[position] == "]":
+                return
+
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise CommandError(f"{path}: поврежденный JSON")
+                chunk = file.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[position:] + chunk
+                position = 0
+                continue
+            yield item
 
 
 class Command(BaseCommand):
     """
-    Пользовательская команда управления для заполнения базы данных данными из файла фикстуры JSON.
-    Команда сначала очищает существующие данные в таблицах Product, Category и ContactsInfo,
-    а затем заполняет их данными из файла фикстуры `catalog_data.json`.
+    Пользовательская команда управления для заполнения базы данных данными из файлов фикстур JSON.
+    Команда сначала очищает существующие данные в таблицах Product, Category, ContactsInfo и Article,
+    а затем заполняет их данными из файлов `catalog_data.json` и `blog_data.json`.
+
+    Каждый файл читается один раз потоково, записи вставляются пакетами внутри одной транзакции,
+    а внешние ключи на категории проверяются по набору уже загруженных идентификаторов,
+    без запроса к базе на каждую строку.
     """
 
-    @staticmethod
-    def json_read_categories():
+    help = "Загружает каталог и блог из файлов фикстур"
+
+    default_fixtures = ("fixtures/catalog_data.json", "fixtures/blog_data.json")
+
+    models = {
+        "catalog.category": Category,
+        "catalog.product": Product,
+        "catalog.contactsinfo": ContactsInfo,
+        "blog.article": Article,
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "fixtures",
+            nargs="*",
+            help="Файлы фикстур (по умолчанию catalog_data.json и blog_data.json)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Количество записей в одном INSERT",
+        )
+
+    def build_instance(self, model, item):
         """
-        Читает и фильтрует данные категорий из файла фикстуры.
+        Создает экземпляр модели из записи фикстуры.
 
-        Returns:
-            list: Список словарей, содержащих данные для экземпляров модели Category.
-        """
-        with open("fixtures/catalog_data.json", encoding="utf-8") as file:
-            data = json.load(file)
-            return [item for item in data if item["model"] == "catalog.category"]
+        Внешние ключи передаются как ``<поле>_id``, без загрузки связанных объектов.
+        Ссылка на категорию, которой нет в загружаемых данных, обнуляется.
 
-    @staticmethod
-    def json_read_products():
+        :param model: Класс модели.
+        :param item: Словарь записи фикстуры.
+        :return: Несохраненный экземпляр модели.
         """
-        Читает и фильтрует данные продуктов из файла фикстуры.
-
-        Returns:
-            list: Список словарей, содержащих данные для экземпляров модели Product.
+        fields = {}
+        for name, value in item["fields"].items():
+            field = model._meta.get_field(name)
+            if field.is_relation:
+                if field.related_model is Category and value not in self.category_ids:
+                    value = None
+                fields[field.attname] = value
+            else:
+                fields[name] = value
+        return model(pk=item["pk"], **fields)
+
+    def flush(self, model):
         """
-        with open("fixtures/catalog_data.json", encoding="utf-8") as file:
-            data = json.load(file)
-            return [item for item in data if item["model"] == "catalog.product"]
-
-    @staticmethod
-    def json_read_contacts_info():
+        Вставляет накопленный пакет записей модели одним запросом.
         """
-        Читает и фильтрует данные контактной информации из файла фикстуры.
-
-        Returns:
-            list: Список словарей, содержащих данные для экземпляров модели ContactsInfo.
+        batch = self.batches.pop(model, [])
+        if not batch:
+            return
+        started = time.monotonic()
+        model.objects.bulk_create(batch, batch_size=self.batch_size)
+        self.elapsed[model] += time.monotonic() - started
+        self.counts[model] += len(batch)
+
+    def add(self, model, instance):
         """
-        with open("fixtures/catalog_data.json", encoding="utf-8") as file:
-            data = json.load(file)
-            return [item for item in data if item["model"] == "catalog.contactsinfo"]
+        Добавляет запись в пакет и вставляет пакет, когда он заполнен.
 
-    @staticmethod
-    def json_read_articles():
+        Перед вставкой продуктов вставляются накопленные категории,
+        чтобы ссылки на них уже существовали в базе.
         """
-        Читает и фильтрует данные статей из файла фикстуры.
+        if model is Category:
+            self.category_ids.add(instance.pk)
+        self.batches[model].append(instance)
+        if len(self.batches[model]) >= self.batch_size:
+            if model is Product:
+                self.flush(Category)
+            self.flush(model)
+
+    def clear_products(self):
+        """
+        Удаляет продукты, их версии и карточки без сигналов моделей.
 
-        Returns:
-            list: Список словарей, содержащих данные для экземпляров модели Article.
+        У ``Product`` и ``Version`` есть приемники ``post_delete``, поэтому
+        ``delete()`` загружал бы каждую строку и пересчитывал ее карточку
+        отдельными запросами. Карточки после загрузки все равно строятся
+        заново, так что таблицы очищаются по одному запросу на каждую,
+        начиная с зависимых.
         """
-        with open("fixtures/blog_data.json", encoding="utf-8") as file:
-            data = json.load(file)
-            return [item for item in data if item["model"] == "blog.article"]
+        for model in (ProductCard, Version, Product):
+            model.objects.all()._raw_delete(connection.alias)
 
     def handle(self, *args, **options):
         """
         Основной метод, который обрабатывает выполнение команды.
 
-        - Удаляет все существующие данные из таблиц Product и Category.
-        - Читает данные о категориях и продуктах из файла фикстуры.
-        - Создает новые экземпляры Category и Product на основе данных из фикстуры.
-        - Сохраняет новые экземпляры в базе данных в пакетном режиме.
+        - Удаляет все существующие данные из таблиц Product (вместе с версиями и карточками),
+          Category, ContactsInfo и Article.
+        - Потоково читает каждый файл фикстуры один раз.
+        - Вставляет записи пакетами по --batch-size в одной транзакции.
+        - Сбрасывает последовательности первичных ключей и перестраивает карточки продуктов.
+        - Выводит статистику скорости.
         """
-        Product.objects.all().delete()
-        Category.objects.all().delete()
-        ContactsInfo.objects.all().delete()
-        Article.objects.all().delete()
-
-        categories_for_create = []
-        for item in Command.json_read_categories():
-            category_data = item["fields"]
-            categories_for_create.append(Category(id=item["pk"], **category_data))
-        Category.objects.bulk_create(categories_for_create)
-
-        products_for_create = []
-        for item in Command.json_read_products():
-            product_data = item["fields"]
-            category = Category.objects.get(pk=product_data.pop("category"))
-            products_for_create.append(
-                Product(id=item["pk"], category=category, **product_data)
+        self.batch_size = options["batch_size"]
+        self.batches = defaultdict(list)
+        self.counts = defaultdict(int)
+        self.elapsed = defaultdict(float)
+        self.category_ids = set()
+        # Продукты, встретившиеся раньше своей категории, вставляются в конце.
+        deferred_products = []
+        started = time.monotonic()
+
+        with transaction.atomic():
+            self.clear_products()
+            Category.objects.all().delete()
+            ContactsInfo.objects.all().delete()
+            Article.objects.all().delete()
+
+            for path in options["fixtures"] or self.default_fixtures:
+                for item in iter_fixture(path):
+                    model = self.models.get(item["model"])
+                    if model is None:
+                        continue
+                    category = item["fields"].get("category")
+                    if model is Product and category is not None and category not in self.category_ids:
+                        deferred_products.append(item)
+                        continue
+                    self.add(model, self.build_instance(model, item))
+
+            for item in deferred_products:
+                self.add(Product, self.build_instance(Product, item))
+            self.flush(Category)
+            for model in self.models.values():
+                self.flush(model)
+
+            sequence_sql = connection.ops.sequence_reset_sql(no_style(), self.models.values())
+            if sequence_sql:
+                with connection.cursor() as cursor:
+                    for sql in sequence_sql:
+                        cursor.execute(sql)
+
+            # bulk_create не вызывает сигналы, поэтому карточки строятся заново.
+            rebuild_product_cards(batch_size=self.batch_size)
+
+        total_time = time.monotonic() - started
+        for model in self.models.values():
+            count = self.counts[model]
+            rate = count / self.elapsed[model] if self.elapsed[model] else 0
+            self.stdout.write(
+                f"{model._meta.label}: {count} записей, {rate:.0f} записей/с"
             )
-        Product.objects.bulk_create(products_for_create)
-
-        contacts_info_for_create = []
-        for item in Command.json_read_contacts_info():
-            contacts_data = item["fields"]
-            contacts_info_for_create.append(
-                ContactsInfo(id=item["pk"], **contacts_data)
+        total = sum(self.counts.values())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Загружено {total} записей за {total_time:.2f} с "
+                f"({total / total_time if total_time else 0:.0f} записей/с)"
             )
-        ContactsInfo.objects.bulk_create(contacts_info_for_create)
-
-        articles_for_create = []
-        for item in Command.json_read_articles():
-            article_data = item["fields"]
-            articles_for_create.append(Article(id=item["pk"], **article_data))
-        Article.objects.bulk_create(articles_for_create)
+        )
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from catalog.projections import rebuild_product_cards
+
+
+class Command(BaseCommand):
+    """
+    Перестраивает проекцию ``ProductCard`` по текущим продуктам и версиям.
+
+    Сигналы поддерживают карточки при обычных сохранениях, команда нужна
+    после массовых операций, которые сигналы не вызывают: ``bulk_create``,
+    ``QuerySet.update``, загрузки данных напрямую в базу.
+    """
+
+    help = "Перестраивает карточки продуктов для главной страницы"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Количество карточек в одном INSERT",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        count = rebuild_product_cards(batch_size=options["batch_size"])
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(f"Карточек: {count}, время: {elapsed:.2f} с")
+        )
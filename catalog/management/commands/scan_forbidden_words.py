@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from catalog.models import Product
+from catalog.moderation import find_forbidden_words
+
+
+class Command(BaseCommand):
+    """
+    Проверяет существующие товары по словарю модерации.
+
+    Товары читаются пакетами по возрастанию первичного ключа (условие
+    ``pk > последний``, без OFFSET), из базы выбираются только название
+    и описание. Для каждого товара с запрещенными словами выводится строка
+    с первичным ключом, названием и найденными словами.
+    """
+
+    help = "Проверяет существующие товары по словарю модерации"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Количество товаров, читаемых из базы за раз",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        queryset = Product.objects.order_by("pk").values("pk", "name", "description")
+
+        checked = found = 0
+        last_pk = 0
+        started = time.monotonic()
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            for row in batch:
+                words = find_forbidden_words(f"{row['name']}\n{row['description']}")
+                if words:
+                    found += 1
+                    self.stdout.write(f"{row['pk']}\t{row['name']}\t{', '.join(words)}")
+            checked += len(batch)
+            last_pk = batch[-1]["pk"]
+
+        total_time = time.monotonic() - started
+        summary = (
+            f"Проверено {checked}, с запрещенными словами {found} за {total_time:.2f} с "
+            f"({checked / total_time if total_time else 0:.0f} строк/с)"
+        )
+        self.stdout.write(self.style.WARNING(summary) if found else self.style.SUCCESS(summary))
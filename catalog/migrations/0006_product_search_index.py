@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from catalog.search import product_index
+
+
+def install_search_index(apps, schema_editor):
+    product_index.install(schema_editor.connection)
+
+
+def uninstall_search_index(apps, schema_editor):
+    product_index.uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0005_alter_product_options"),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.2 on 2026-10-18 18:07
+
+from django.db import migrations, models
+
+
+def deactivate_extra_versions(apps, schema_editor):
+    """
+    Оставляет активной только последнюю активную версию каждого продукта,
+    чтобы существующие данные не нарушали новое ограничение.
+    """
+    Version = apps.get_model("catalog", "Version")
+    kept = {}
+    for pk, product_id in (
+        Version.objects.filter(is_active=True).order_by("pk").values_list("pk", "product_id")
+    ):
+        kept[product_id] = pk
+    Version.objects.filter(is_active=True).exclude(pk__in=kept.values()).update(is_active=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0006_product_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(deactivate_extra_versions, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['name', '-price', 'created_at', '-updated_at'], name='catalog_product_ordering_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['-created_at', '-id'], name='catalog_product_created_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='version',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('product',), name='catalog_version_one_active', violation_error_message='У продукта не может быть более одной активной версии.'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.2 on 2026-10-18 18:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0007_product_version_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='product',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, help_text='Укажите дату изменения', verbose_name='Дата последнего изменения'),
+        ),
+    ]
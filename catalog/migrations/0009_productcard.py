@@ -0,0 +1,68 @@
+# Generated by Django 4.2.2 on 2026-10-18 18:26
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import OuterRef, Subquery
+from django.utils.text import Truncator
+
+
+def fill_product_cards(apps, schema_editor):
+    """
+    Заполняет карточки для уже существующих продуктов.
+    """
+    Product = apps.get_model("catalog", "Product")
+    ProductCard = apps.get_model("catalog", "ProductCard")
+    Version = apps.get_model("catalog", "Version")
+    active_version = Version.objects.filter(product=OuterRef("pk"), is_active=True)
+    products = Product.objects.order_by().annotate(
+        active_version_number=Subquery(active_version.values("version_number")[:1])
+    )
+    ProductCard.objects.bulk_create(
+        (
+            ProductCard(
+                product_id=product.pk,
+                name=product.name,
+                short_description=Truncator(product.description).chars(100),
+                photo=product.photo.name or "",
+                price=product.price,
+                version_number=product.active_version_number,
+                user_id=product.user_id,
+                created_at=product.created_at,
+                updated_at=product.updated_at,
+            )
+            for product in products.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('catalog', '0008_alter_product_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductCard',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='card', serialize=False, to='catalog.product', verbose_name='Товар')),
+                ('name', models.CharField(max_length=150, verbose_name='Наименование товара')),
+                ('short_description', models.CharField(max_length=100, verbose_name='Краткое описание')),
+                ('photo', models.CharField(blank=True, max_length=100, verbose_name='Фото')),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Цена за покупку')),
+                ('version_number', models.CharField(blank=True, max_length=50, null=True, verbose_name='Номер активной версии')),
+                ('created_at', models.DateField(verbose_name='Дата создания')),
+                ('updated_at', models.DateTimeField(verbose_name='Дата последнего изменения')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'Карточка товара',
+                'verbose_name_plural': 'Карточки товаров',
+                'indexes': [models.Index(fields=['-created_at', '-product'], name='catalog_card_created_idx')],
+            },
+        ),
+        migrations.RunPython(fill_product_cards, migrations.RunPython.noop),
+    ]
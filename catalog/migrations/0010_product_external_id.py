@@ -0,0 +1,18 @@
+# Generated by Django 4.2.2 on 2026-10-18 18:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0009_productcard'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='external_id',
+            field=models.CharField(blank=True, editable=False, help_text='Ключ товара во внешней системе, по нему работает import_products', max_length=100, null=True, unique=True, verbose_name='Внешний идентификатор'),
+        ),
+    ]
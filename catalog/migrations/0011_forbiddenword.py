@@ -0,0 +1,48 @@
+# Generated by Django 4.2.2 on 2026-10-18 18:36
+
+from django.db import migrations, models
+
+# Слова, которые раньше были зашиты в ProductForm.
+INITIAL_WORDS = (
+    "казино",
+    "криптовалюта",
+    "крипта",
+    "биржа",
+    "дешево",
+    "бесплатно",
+    "обман",
+    "полиция",
+    "радар",
+)
+
+
+def add_initial_words(apps, schema_editor):
+    ForbiddenWord = apps.get_model("catalog", "ForbiddenWord")
+    ForbiddenWord.objects.bulk_create(
+        [ForbiddenWord(word=word) for word in INITIAL_WORDS], ignore_conflicts=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0010_product_external_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ForbiddenWord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('word', models.CharField(max_length=100, unique=True, verbose_name='Слово')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Активно')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+            ],
+            options={
+                'verbose_name': 'Запрещенное слово',
+                'verbose_name_plural': 'Запрещенные слова',
+                'ordering': ['word'],
+            },
+        ),
+        migrations.RunPython(add_initial_words, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.2 on 2026-10-18 18:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0011_forbiddenword'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='forbiddenword',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Изменено'),
+        ),
+    ]
@@ -61,7 +61,7 @@ class Product(models.Model):
         verbose_name="Дата создания",
         help_text="Укажите дату создания",
     )
-    updated_at = models.DateField(
+    updated_at = models.DateTimeField(
         auto_now=True,
         verbose_name="Дата последнего изменения",
         help_text="Укажите дату изменения",
@@ -78,14 +78,43 @@ class Product(models.Model):
         verbose_name="признак публикации продукта",
         help_text="продукт опубликован",
     )
+    external_id = models.CharField(
+        max_length=100,
+        unique=True,
+        editable=False,
+        **NULLABLE,
+        verbose_name="Внешний идентификатор",
+        help_text="Ключ товара во внешней системе, по нему работает import_products",
+    )
 
     def __str__(self):
         return self.name
 
+    @property
+    def active_version(self):
+        """
+        Возвращает активную версию продукта или None.
+
+        Если активные версии предзагружены в атрибут ``active_versions``,
+        обращения к базе данных не происходит.
+        """
+        if hasattr(self, "active_versions"):
+            return self.active_versions[0] if self.active_versions else None
+        return self.version_set.filter(is_active=True).first()
+
     class Meta:
         verbose_name = "Товар"
         verbose_name_plural = "Товары"
         ordering = ["name", "-price", "created_at", "-updated_at"]
+        indexes = [
+            # Сортировка по умолчанию (админка, связанные наборы).
+            models.Index(
+                fields=["name", "-price", "created_at", "-updated_at"],
+                name="catalog_product_ordering_idx",
+            ),
+            # Главная страница: курсорная пагинация по дате создания.
+            models.Index(fields=["-created_at", "-id"], name="catalog_product_created_idx"),
+        ]
         permissions = [
             ('set_published', 'Can publish products'),
             ("can_edit_category", "Can edit category"),
@@ -118,3 +147,88 @@ class Version(models.Model):
     class Meta:
         verbose_name = "Версия"
         verbose_name_plural = "Версии"
+        constraints = [
+            # У продукта не больше одной активной версии. Индекс также
+            # обслуживает выборку активных версий для списка продуктов.
+            models.UniqueConstraint(
+                fields=["product"],
+                condition=models.Q(is_active=True),
+                name="catalog_version_one_active",
+                violation_error_message="У продукта не может быть более одной активной версии.",
+            ),
+        ]
+
+
+class ProductCard(models.Model):
+    """
+    Денормализованная карточка продукта для главной страницы.
+
+    Содержит все поля, которые показывает список продуктов, включая номер
+    активной версии, поэтому страница читается одним запросом по индексу
+    без соединений и предзагрузок. Поддерживается сигналами при сохранении
+    продуктов и версий (см. ``catalog.projections``), после массовых загрузок
+    перестраивается командой ``rebuild_product_cards``.
+    """
+
+    product = models.OneToOneField(
+        Product,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="card",
+        verbose_name="Товар",
+    )
+    name = models.CharField(max_length=150, verbose_name="Наименование товара")
+    short_description = models.CharField(max_length=100, verbose_name="Краткое описание")
+    photo = models.CharField(max_length=100, blank=True, verbose_name="Фото")
+    price = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Цена за покупку")
+    version_number = models.CharField(
+        max_length=50, **NULLABLE, verbose_name="Номер активной версии"
+    )
+    user = models.ForeignKey(
+        User,
+        **NULLABLE,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        verbose_name="Пользователь",
+    )
+    created_at = models.DateField(verbose_name="Дата создания")
+    updated_at = models.DateTimeField(verbose_name="Дата последнего изменения")
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        verbose_name = "Карточка товара"
+        verbose_name_plural = "Карточки товаров"
+        indexes = [
+            # Главная страница: курсорная пагинация по дате создания.
+            models.Index(fields=["-created_at", "-product"], name="catalog_card_created_idx"),
+        ]
+
+
+class ForbiddenWord(models.Model):
+    """
+    Запрещенное слово словаря модерации.
+
+    Название и описание товара не должны содержать активные слова словаря
+    (см. ``catalog.moderation``). Слово хранится в нижнем регистре.
+    По количеству слов и последнему ``updated_at`` процессы узнают
+    об изменении словаря.
+    """
+
+    word = models.CharField(max_length=100, unique=True, verbose_name="Слово")
+    is_active = models.BooleanField(default=True, verbose_name="Активно")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Добавлено")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Изменено")
+
+    def __str__(self):
+        return self.word
+
+    def save(self, *args, **kwargs):
+        self.word = self.word.strip().lower()
+        super().save(*args, **kwargs)
+
+    class Meta:
+        verbose_name = "Запрещенное слово"
+        verbose_name_plural = "Запрещенные слова"
+        ordering = ["word"]
@@ -0,0 +1,143 @@
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import Count, Max
+
+from catalog.models import ForbiddenWord
+
+
+def trie_pattern(words):
+    """
+    Собирает из слов регулярное выражение в виде префиксного дерева.
+
+    Общие префиксы слов выносятся за скобки, например ``крипт(?:а|овалюта)``,
+    поэтому на каждой позиции текста движок проверяет не все слова подряд,
+    а только ветку дерева, совпадающую с текстом. Время поиска почти
+    не зависит от размера словаря.
+
+    :param words: Слова в нижнем регистре.
+    :return: Строка регулярного выражения или None для пустого словаря.
+    """
+    trie = {}
+    for word in filter(None, words):
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return node_pattern(trie) or None
+
+
+def node_pattern(node):
+    branches = [
+        re.escape(char) + node_pattern(child) for char, child in sorted(node.items()) if char
+    ]
+    if not branches:
+        return ""
+    if len(branches) == 1 and "" not in node:
+        return branches[0]
+    pattern = "(?:" + "|".join(branches) + ")"
+    # Слово может закончиться в этом узле: продолжение необязательно,
+    # но жадный квантификатор предпочтет более длинное слово.
+    return pattern + "?" if "" in node else pattern
+
+
+class ForbiddenWordMatcher:
+    """
+    Поиск запрещенных слов словаря модерации в тексте.
+
+    Как и раньше, слово ищется как подстрока без учета регистра, в том
+    числе внутри другого найденного слова. Выражение компилируется один раз
+    на процесс. Версия словаря — количество слов и время последнего
+    изменения — хранится в базе и сверяется не чаще раза
+    в FORBIDDEN_WORDS_CHECK_INTERVAL секунд, поэтому правка словаря доходит
+    до всех процессов без общего кеша. В процессе, где слово изменено,
+    сигналы ``ForbiddenWord`` сбрасывают словарь сразу.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.checked_at = None
+        self.words = frozenset()
+        self.regex = None
+
+    def current_version(self):
+        stats = ForbiddenWord.objects.aggregate(count=Count("pk"), updated_at=Max("updated_at"))
+        return stats["count"], stats["updated_at"]
+
+    def is_stale(self, now):
+        return (
+            self.checked_at is None
+            or now - self.checked_at >= settings.FORBIDDEN_WORDS_CHECK_INTERVAL
+        )
+
+    def get_regex(self):
+        """
+        Возвращает скомпилированное выражение текущей версии словаря.
+
+        Выражение ищет на каждой позиции текста самое длинное слово словаря,
+        которое начинается с нее (группа 1 внутри опережающей проверки),
+        поэтому перекрывающиеся слова не теряются.
+        """
+        now = time.monotonic()
+        if self.is_stale(now):
+            with self.lock:
+                if self.is_stale(now):
+                    version = self.current_version()
+                    if version != self.version:
+                        words = ForbiddenWord.objects.filter(is_active=True)
+                        self.words = frozenset(words.values_list("word", flat=True))
+                        pattern = trie_pattern(self.words)
+                        self.regex = re.compile(f"(?=({pattern}))") if pattern else None
+                        self.version = version
+                    self.checked_at = now
+        return self.regex
+
+    def reset(self):
+        """
+        Заставляет сверить версию словаря с базой при следующей проверке.
+        """
+        self.checked_at = None
+
+    def find(self, text):
+        """
+        Возвращает запрещенные слова, найденные в тексте.
+
+        Слово словаря, которое встречается в тексте, всегда начало самого
+        длинного совпадения на своей позиции: поэтому кроме него проверяются
+        его начала, например «ab» при совпадении «abc».
+
+        :param text: Проверяемый текст.
+        :return: Список различных найденных слов в порядке появления.
+        """
+        regex = self.get_regex()
+        if regex is None or not text:
+            return []
+        words = self.words
+        found = {}
+        for match in regex.finditer(text.lower()):
+            longest = match.group(1)
+            for end in range(1, len(longest) + 1):
+                if longest[:end] in words:
+                    found[longest[:end]] = None
+        return list(found)
+
+
+matcher = ForbiddenWordMatcher()
+
+
+def find_forbidden_words(text):
+    """
+    Возвращает запрещенные слова, найденные в тексте.
+    """
+    return matcher.find(text)
+
+
+def invalidate_dictionary():
+    """
+    Сбрасывает словарь модерации в текущем процессе; остальные процессы
+    заметят новую версию в базе в течение FORBIDDEN_WORDS_CHECK_INTERVAL.
+    """
+    matcher.reset()
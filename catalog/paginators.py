@@ -0,0 +1,220 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import Http404
+
+
+class KeysetPage:
+    """
+    Страница курсорной пагинации.
+
+    Повторяет ту часть интерфейса ``django.core.paginator.Page``, которой
+    пользуются шаблоны, и дополнительно содержит курсоры соседних страниц.
+    """
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Курсорный (keyset) пагинатор.
+
+    Вместо ``OFFSET`` страница выбирается условием по полю сортировки и
+    первичному ключу (для одинаковых значений поля), поэтому стоимость
+    запроса не зависит от номера страницы. Курсор — непрозрачная строка,
+    содержащая значения ключа крайней записи и направление перехода.
+    """
+
+    NEXT = "n"
+    PREVIOUS = "p"
+
+    def __init__(self, queryset, per_page, ordering):
+        """
+        :param queryset: Исходный набор записей.
+        :param per_page: Количество записей на странице.
+        :param ordering: Поле сортировки, например ``"-created_at"``.
+        """
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.descending = ordering.startswith("-")
+        self.field_name = ordering.lstrip("-")
+        self.field = queryset.model._meta.get_field(self.field_name)
+
+    def get_ordering(self, reverse=False):
+        """
+        Возвращает сортировку по полю и первичному ключу.
+
+        :param reverse: Развернуть направление сортировки.
+        """
+        prefix = "-" if self.descending != reverse else ""
+        return [f"{prefix}{self.field_name}", f"{prefix}pk"]
+
+    def get_value(self, item, name):
+        """
+        Возвращает значение ключа у модели или у словаря из ``.values()``.
+        """
+        if isinstance(item, dict):
+            return item[name]
+        return getattr(item, name)
+
+    def encode_cursor(self, item, direction):
+        """
+        Кодирует курсор по записи, на которой остановилась страница.
+
+        :param item: Крайняя запись страницы.
+        :param direction: Направление перехода: ``NEXT`` или ``PREVIOUS``.
+        :return: Строка курсора, безопасная для URL.
+        """
+        value = self.get_value(item, self.field.attname)
+        if hasattr(value, "isoformat"):
+            value = value.isoformat()
+        elif value is not None:
+            value = str(value)
+        pk_name = self.queryset.model._meta.pk.attname
+        payload = json.dumps([direction, value, self.get_value(item, pk_name)])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        """
+        Раскодирует курсор.
+
+        :param cursor: Строка курсора из запроса.
+        :return: Кортеж (направление, значение поля, первичный ключ).
+        :raises Http404: Если курсор поврежден.
+        """
+        try:
+            padding = "=" * (-len(cursor) % 4)
+            direction, value, pk = json.loads(
+                base64.urlsafe_b64decode(cursor + padding)
+            )
+            if direction not in (self.NEXT, self.PREVIOUS):
+                raise ValueError(direction)
+            return direction, self.field.to_python(value), int(pk)
+        except (TypeError, ValueError, binascii.Error, ValidationError):
+            raise Http404("Неверный курсор страницы")
+
+    def get_window(self, cursor=None):
+        """
+        Возвращает запрос записей страницы, на которую указывает курсор.
+
+        Запрашивается на одну запись больше размера страницы, чтобы узнать,
+        есть ли следующая.
+
+        :param cursor: Строка курсора или None для первой страницы.
+        :return: Кортеж (набор записей, направление ``NEXT`` или ``PREVIOUS``).
+        """
+        if not cursor:
+            return self.queryset.order_by(*self.get_ordering())[: self.per_page + 1], None
+
+        direction, value, pk = self.decode_cursor(cursor)
+        forward = direction == self.NEXT
+        # Для движения назад выборка идет в обратном порядке и затем разворачивается.
+        greater = self.descending != forward
+        lookup = "gt" if greater else "lt"
+        condition = Q(**{f"{self.field_name}__{lookup}": value}) | Q(
+            **{self.field_name: value, f"pk__{lookup}": pk}
+        )
+        queryset = self.queryset.filter(condition).order_by(
+            *self.get_ordering(reverse=not forward)
+        )
+        return queryset[: self.per_page + 1], direction
+
+    def make_page(self, items, direction):
+        """
+        Собирает страницу из выбранных записей.
+
+        :param items: Записи, выбранные по запросу ``get_window``.
+        :param direction: Направление перехода или None для первой страницы.
+        :return: Объект ``KeysetPage``.
+        """
+        has_more = len(items) > self.per_page
+        items = items[: self.per_page]
+        if direction is None:
+            next_cursor = self.encode_cursor(items[-1], self.NEXT) if has_more else None
+            return KeysetPage(items, next_cursor=next_cursor)
+
+        forward = direction == self.NEXT
+        if not forward:
+            items.reverse()
+        if not items:
+            return KeysetPage(items)
+
+        if forward:
+            next_cursor = self.encode_cursor(items[-1], self.NEXT) if has_more else None
+            previous_cursor = self.encode_cursor(items[0], self.PREVIOUS)
+        else:
+            next_cursor = self.encode_cursor(items[-1], self.NEXT)
+            previous_cursor = (
+                self.encode_cursor(items[0], self.PREVIOUS) if has_more else None
+            )
+        return KeysetPage(items, next_cursor, previous_cursor)
+
+    def get_page(self, cursor=None):
+        """
+        Возвращает страницу, на которую указывает курсор.
+
+        :param cursor: Строка курсора или None для первой страницы.
+        :return: Объект ``KeysetPage``.
+        """
+        queryset, direction = self.get_window(cursor)
+        return self.make_page(list(queryset), direction)
+
+    async def aget_page(self, cursor=None):
+        """
+        Асинхронная версия ``get_page`` для асинхронных представлений.
+        """
+        queryset, direction = self.get_window(cursor)
+        return self.make_page([item async for item in queryset], direction)
+
+
+class KeysetPaginationMixin:
+    """
+    Миксин для ``ListView``, заменяющий постраничную пагинацию на курсорную.
+
+    В контекст шаблона попадают ``page_obj`` (``KeysetPage``) и ``is_paginated``.
+    """
+
+    paginate_by = 12
+    keyset_ordering = "-pk"
+    cursor_kwarg = "cursor"
+
+    def paginate_queryset(self, queryset, page_size):
+        """
+        Разбивает набор записей на страницы по курсору из запроса.
+
+        :param queryset: Набор записей.
+        :param page_size: Размер страницы.
+        :return: Кортеж (paginator, page, object_list, is_paginated).
+        """
+        paginator = KeysetPaginator(queryset, page_size, self.keyset_ordering)
+        page = paginator.get_page(self.request.GET.get(self.cursor_kwarg))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    async def apaginate_queryset(self, queryset, page_size):
+        """
+        Асинхронная версия ``paginate_queryset`` для асинхронных представлений.
+        """
+        paginator = KeysetPaginator(queryset, page_size, self.keyset_ordering)
+        page = await paginator.aget_page(self.request.GET.get(self.cursor_kwarg))
+        return paginator, page, page.object_list, page.has_other_pages()
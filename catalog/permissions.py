@@ -0,0 +1,132 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+ROLE_OWNER = "owner"
+ROLE_MODERATOR = "moderator"
+ROLE_CONTENT_MANAGER = "content_manager"
+
+MODERATOR_PERMISSIONS = {
+    "catalog.set_published",
+    "catalog.can_edit_description",
+    "catalog.can_edit_category",
+}
+CONTENT_MANAGER_PERMISSIONS = {"catalog.set_published"}
+
+ROLE_CACHE_KEY = "catalog:role:{generation}:{pk}"
+ROLE_GENERATION_KEY = "catalog:role_generation"
+NO_ROLE = ""
+
+
+def role_cache():
+    """
+    Возвращает кеш ролей ``ROLE_CACHE`` или None, если он не общий для процессов.
+
+    Сигналы сбрасывают роль только в кеше процесса, обработавшего изменение
+    прав. В локальном кеше (locmem) остальные процессы продолжали бы выдавать
+    отозванные права, поэтому с ним роль запоминается только до конца запроса.
+    """
+    backend = caches[settings.ROLE_CACHE]
+    return None if isinstance(backend, LocMemCache) else backend
+
+
+def role_cache_key(cache, pk):
+    """
+    Возвращает ключ кеша роли пользователя в текущем поколении ролей.
+
+    Поколение увеличивается при изменении прав групп: это сбрасывает роли
+    всех пользователей без перебора ключей.
+    """
+    generation = cache.get_or_set(ROLE_GENERATION_KEY, 1, timeout=None)
+    return ROLE_CACHE_KEY.format(generation=generation, pk=pk)
+
+
+def resolve_role(permissions):
+    """
+    Определяет роль в каталоге по набору прав пользователя.
+
+    :param permissions: Права вида ``"app_label.codename"``.
+    :return: ``ROLE_MODERATOR``, ``ROLE_CONTENT_MANAGER`` или None.
+    """
+    if MODERATOR_PERMISSIONS <= permissions:
+        return ROLE_MODERATOR
+    if CONTENT_MANAGER_PERMISSIONS <= permissions:
+        return ROLE_CONTENT_MANAGER
+    return None
+
+
+def get_user_role(user):
+    """
+    Возвращает роль пользователя в каталоге, не зависящую от конкретного продукта.
+
+    Роль вычисляется один раз по всем правам пользователя и запоминается
+    на объекте пользователя до конца запроса. Между запросами она кешируется
+    на ``ROLE_CACHE_TIMEOUT`` секунд, только если кеш ролей общий (см. ``role_cache``).
+
+    :param user: Пользователь запроса.
+    :return: ``ROLE_MODERATOR``, ``ROLE_CONTENT_MANAGER`` или None.
+    """
+    if not user.is_authenticated:
+        return None
+    if not hasattr(user, "_catalog_role"):
+        cache = role_cache()
+        if cache is None:
+            role = resolve_role(user.get_all_permissions())
+        else:
+            key = role_cache_key(cache, user.pk)
+            role = cache.get(key)
+            if role is None:
+                role = resolve_role(user.get_all_permissions()) or NO_ROLE
+                cache.set(key, role, settings.ROLE_CACHE_TIMEOUT)
+        user._catalog_role = role or None
+    return user._catalog_role
+
+
+async def aget_user_role(user):
+    """
+    Асинхронная версия ``get_user_role``.
+
+    Для анонимного пользователя и уже вычисленной в этом запросе роли
+    обходится без обращения к пулу потоков.
+    """
+    if not user.is_authenticated:
+        return None
+    if hasattr(user, "_catalog_role"):
+        return user._catalog_role
+    return await sync_to_async(get_user_role)(user)
+
+
+def get_product_role(user, product):
+    """
+    Возвращает роль пользователя по отношению к продукту.
+
+    Владелец продукта получает ``ROLE_OWNER`` независимо от прав.
+
+    :param user: Пользователь запроса.
+    :param product: Продукт или словарь с ключом ``user_id``.
+    :return: Роль или None, если у пользователя нет прав на продукт.
+    """
+    owner_id = product["user_id"] if isinstance(product, dict) else product.user_id
+    if user.is_authenticated and owner_id == user.pk:
+        return ROLE_OWNER
+    return get_user_role(user)
+
+
+def invalidate_user_role(pk):
+    """
+    Сбрасывает закешированную роль одного пользователя.
+    """
+    cache = role_cache()
+    if cache is not None:
+        cache.delete(role_cache_key(cache, pk))
+
+
+def invalidate_all_roles():
+    """
+    Сбрасывает роли всех пользователей (например, после изменения прав группы).
+    """
+    cache = role_cache()
+    if cache is not None:
+        cache.add(ROLE_GENERATION_KEY, 1, timeout=None)
+        cache.incr(ROLE_GENERATION_KEY)
@@ -0,0 +1,118 @@
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils.text import Truncator
+
+from catalog.models import Product, ProductCard, Version
+
+SHORT_DESCRIPTION_LENGTH = 100
+
+# Поля карточки, которые читает список продуктов.
+PRODUCT_CARD_FIELDS = (
+    "product_id",
+    "name",
+    "short_description",
+    "photo",
+    "price",
+    "version_number",
+    "user_id",
+    "created_at",
+    "updated_at",
+)
+
+
+def product_card_rows(queryset):
+    """
+    Добавляет к продуктам номер активной версии и возвращает строки
+    со всеми данными карточки.
+
+    :param queryset: Набор продуктов.
+    :return: Набор словарей ``.values()``.
+    """
+    active_version = Version.objects.filter(product=OuterRef("pk"), is_active=True)
+    return queryset.annotate(
+        active_version_number=Subquery(active_version.values("version_number")[:1])
+    ).values(
+        "pk",
+        "name",
+        "description",
+        "photo",
+        "price",
+        "active_version_number",
+        "user_id",
+        "created_at",
+        "updated_at",
+    )
+
+
+def build_product_card(row):
+    """
+    Создает несохраненную карточку из строки ``product_card_rows``.
+    """
+    return ProductCard(
+        product_id=row["pk"],
+        name=row["name"],
+        short_description=Truncator(row["description"]).chars(SHORT_DESCRIPTION_LENGTH),
+        photo=row["photo"] or "",
+        price=row["price"],
+        version_number=row["active_version_number"],
+        user_id=row["user_id"],
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+    )
+
+
+def refresh_product_card(pk):
+    """
+    Пересчитывает карточку одного продукта.
+
+    Карточка удаленного продукта удаляется.
+
+    :param pk: Первичный ключ продукта.
+    """
+    row = product_card_rows(Product.objects.filter(pk=pk)).first()
+    if row is None:
+        ProductCard.objects.filter(pk=pk).delete()
+        return
+    # Сохранение с заданным ключом — это UPDATE, а для новой карточки INSERT.
+    build_product_card(row).save()
+
+
+def refresh_product_cards(pks):
+    """
+    Пересчитывает карточки нескольких продуктов двумя запросами.
+
+    Используется после массовых операций над частью продуктов, например импорта.
+
+    :param pks: Первичные ключи продуктов.
+    """
+    pks = list(pks)
+    ProductCard.objects.filter(pk__in=pks).delete()
+    ProductCard.objects.bulk_create(
+        build_product_card(row) for row in product_card_rows(Product.objects.filter(pk__in=pks))
+    )
+
+
+def rebuild_product_cards(batch_size=1000):
+    """
+    Перестраивает все карточки продуктов.
+
+    Продукты читаются потоково одним запросом, карточки вставляются пакетами
+    в одной транзакции, поэтому читатели не видят частично заполненную таблицу.
+
+    :param batch_size: Количество карточек в одном INSERT.
+    :return: Количество созданных карточек.
+    """
+    count = 0
+    with transaction.atomic():
+        ProductCard.objects.all().delete()
+        batch = []
+        for row in product_card_rows(Product.objects.order_by()).iterator(chunk_size=batch_size):
+            batch.append(build_product_card(row))
+            if len(batch) >= batch_size:
+                ProductCard.objects.bulk_create(batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            ProductCard.objects.bulk_create(batch)
+            count += len(batch)
+    return count
@@ -0,0 +1,241 @@
+import re
+
+from django.apps import apps
+from django.db import connection
+
+SEARCH_CONFIG = "russian"
+WORD_RE = re.compile(r"\w+")
+
+
+class SearchIndex:
+    """
+    Полнотекстовый индекс по текстовым полям таблицы.
+
+    В PostgreSQL индекс — это колонка ``search_vector`` типа tsvector
+    (русская морфология, веса полей по порядку A, B, C, D), которую
+    поддерживает триггер, и GIN-индекс по ней. В SQLite, используемом
+    для локальной разработки, это внешняя FTS5-таблица ``<table>_fts``
+    с триггерами синхронизации.
+
+    Колонка и таблица создаются миграциями и не описаны в моделях.
+    """
+
+    weights = "ABCD"
+
+    def __init__(self, model_label, table, fields, condition=None):
+        """
+        :param model_label: Метка модели результатов, например ``"catalog.Product"``.
+        :param table: Имя таблицы модели.
+        :param fields: Индексируемые поля в порядке убывания веса.
+        :param condition: SQL-условие на строки таблицы, попадающие в выдачу.
+        """
+        self.model_label = model_label
+        self.table = table
+        self.fields = fields
+        self.condition = condition
+
+    @property
+    def fts_table(self):
+        return f"{self.table}_fts"
+
+    def postgresql_install_sql(self):
+        vector = " || ".join(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.{field}, '')), '{weight}')"
+            for field, weight in zip(self.fields, self.weights)
+        )
+        columns = ", ".join(self.fields)
+        return [
+            f"ALTER TABLE {self.table} ADD COLUMN IF NOT EXISTS search_vector tsvector",
+            f"""
+            CREATE OR REPLACE FUNCTION {self.table}_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {vector};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+            """,
+            f"DROP TRIGGER IF EXISTS {self.table}_search_vector ON {self.table}",
+            f"""
+            CREATE TRIGGER {self.table}_search_vector
+            BEFORE INSERT OR UPDATE OF {columns} ON {self.table}
+            FOR EACH ROW EXECUTE FUNCTION {self.table}_search_vector_update()
+            """,
+            # Пустое обновление запускает триггер для уже существующих строк.
+            f"UPDATE {self.table} SET {self.fields[0]} = {self.fields[0]}",
+            f"CREATE INDEX IF NOT EXISTS {self.table}_search_vector_gin "
+            f"ON {self.table} USING gin(search_vector)",
+        ]
+
+    def postgresql_uninstall_sql(self):
+        return [
+            f"DROP TRIGGER IF EXISTS {self.table}_search_vector ON {self.table}",
+            f"DROP FUNCTION IF EXISTS {self.table}_search_vector_update()",
+            f"ALTER TABLE {self.table} DROP COLUMN IF EXISTS search_vector",
+        ]
+
+    def sqlite_trigger_sql(self):
+        columns = ", ".join(self.fields)
+        new_values = ", ".join(f"new.{field}" for field in self.fields)
+        old_values = ", ".join(f"old.{field}" for field in self.fields)
+        insert = f"INSERT INTO {self.fts_table}(rowid, {columns}) VALUES (new.id, {new_values});"
+        delete = (
+            f"INSERT INTO {self.fts_table}({self.fts_table}, rowid, {columns}) "
+            f"VALUES ('delete', old.id, {old_values});"
+        )
+        return [
+            f"CREATE TRIGGER IF NOT EXISTS {self.fts_table}_ai AFTER INSERT ON {self.table} "
+            f"BEGIN {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.fts_table}_ad AFTER DELETE ON {self.table} "
+            f"BEGIN {delete} END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.fts_table}_au AFTER UPDATE OF {columns} "
+            f"ON {self.table} BEGIN {delete} {insert} END",
+        ]
+
+    def sqlite_install_sql(self):
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.fts_table} USING fts5("
+            f"{', '.join(self.fields)}, content='{self.table}', content_rowid='id', "
+            f"tokenize='unicode61 remove_diacritics 2')",
+            f"INSERT INTO {self.fts_table}({self.fts_table}) VALUES ('rebuild')",
+            *self.sqlite_trigger_sql(),
+        ]
+
+    def sqlite_uninstall_sql(self):
+        return [
+            *(
+                f"DROP TRIGGER IF EXISTS {self.fts_table}_{suffix}"
+                for suffix in ("ai", "ad", "au")
+            ),
+            f"DROP TABLE IF EXISTS {self.fts_table}",
+        ]
+
+    def execute(self, db_connection, statements):
+        with db_connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    def install(self, db_connection):
+        """
+        Создает индекс и заполняет его существующими строками. Вызывается из миграции.
+        """
+        if db_connection.vendor == "postgresql":
+            self.execute(db_connection, self.postgresql_install_sql())
+        elif db_connection.vendor == "sqlite":
+            self.execute(db_connection, self.sqlite_install_sql())
+
+    def uninstall(self, db_connection):
+        """
+        Удаляет индекс. Вызывается при откате миграции.
+        """
+        if db_connection.vendor == "postgresql":
+            self.execute(db_connection, self.postgresql_uninstall_sql())
+        elif db_connection.vendor == "sqlite":
+            self.execute(db_connection, self.sqlite_uninstall_sql())
+
+    def repair(self, db_connection):
+        """
+        Восстанавливает триггеры FTS5 в SQLite.
+
+        SQLite не умеет изменять колонки, поэтому Django пересоздает таблицу
+        при AlterField, а вместе со старой таблицей удаляются и ее триггеры.
+        """
+        if db_connection.vendor != "sqlite":
+            return
+        if self.fts_table in db_connection.introspection.table_names():
+            self.execute(db_connection, self.sqlite_trigger_sql())
+
+    def build_query(self, text):
+        """
+        Возвращает SQL-выражения и параметры поиска для текущей базы данных.
+
+        :param text: Поисковый запрос пользователя.
+        :return: Кортеж (FROM, WHERE, ORDER BY, параметры) или None для пустого запроса.
+        """
+        words = WORD_RE.findall(text.lower())
+        if not words:
+            return None
+        condition = f" AND {self.table}.{self.condition}" if self.condition else ""
+
+        # Все слова запроса обязательны и ищутся по префиксу, как при наборе текста.
+        if connection.vendor == "postgresql":
+            return (
+                f"{self.table}, to_tsquery('{SEARCH_CONFIG}', %s) search_query",
+                f"{self.table}.search_vector @@ search_query{condition}",
+                f"ts_rank({self.table}.search_vector, search_query) DESC, {self.table}.id DESC",
+                [" & ".join(f"{word}:*" for word in words)],
+            )
+
+        # В FTS5 нет русской морфологии, поэтому совпадения ищутся только по префиксам.
+        weights = ", ".join(
+            str(10 ** (len(self.fields) - position - 1)) for position in range(len(self.fields))
+        )
+        return (
+            f"{self.fts_table} JOIN {self.table} ON {self.table}.id = {self.fts_table}.rowid",
+            f"{self.fts_table} MATCH %s{condition}",
+            f"bm25({self.fts_table}, {weights}), {self.table}.id DESC",
+            [" ".join(f'"{word}"*' for word in words)],
+        )
+
+    def search(self, text):
+        """
+        Ищет записи по тексту.
+
+        :param text: Поисковый запрос пользователя.
+        :return: Ленивые ранжированные результаты ``RankedResults``.
+        """
+        return RankedResults(self, text)
+
+
+class RankedResults:
+    """
+    Ранжированные результаты поиска для ``django.core.paginator.Paginator``.
+
+    Количество и срезы вычисляются отдельными запросами, модели страницы
+    загружаются одним ``in_bulk`` в порядке релевантности.
+    """
+
+    def __init__(self, index, text):
+        self.index = index
+        self.query = index.build_query(text)
+        self._count = None
+
+    @property
+    def model(self):
+        return apps.get_model(self.index.model_label)
+
+    def count(self):
+        if self.query is None:
+            return 0
+        if self._count is None:
+            source, where, _, params = self.query
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT count(*) FROM {source} WHERE {where}", params)
+                self._count = cursor.fetchone()[0]
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            return self[key:key + 1][0]
+        if self.query is None:
+            return []
+        start = key.start or 0
+        stop = key.stop if key.stop is not None else self.count()
+        source, where, order, params = self.query
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT {self.index.table}.id FROM {source} WHERE {where} "
+                f"ORDER BY {order} LIMIT %s OFFSET %s",
+                [*params, max(stop - start, 0), start],
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        objects = self.model.objects.in_bulk(ids)
+        return [objects[pk] for pk in ids if pk in objects]
+
+
+product_index = SearchIndex("catalog.Product", "catalog_product", ("name", "description"))
+article_index = SearchIndex(
+    "blog.Article", "blog_article", ("title", "content"), condition="is_published"
+)
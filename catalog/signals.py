@@ -0,0 +1,97 @@
+from django.contrib.auth.models import Group
+from django.db import connections
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from catalog.fragments import invalidate_product_card
+from catalog.models import ForbiddenWord, Product, Version
+from catalog.moderation import invalidate_dictionary
+from catalog.permissions import invalidate_all_roles, invalidate_user_role
+from catalog.projections import refresh_product_card
+from catalog.search import article_index, product_index
+from catalog.thumbnails import make_thumbnails
+from users.models import User
+
+
+@receiver([post_save, post_delete], sender=Product)
+def product_changed(sender, instance, **kwargs):
+    """
+    Пересчитывает карточку продукта в проекции и сбрасывает ее разметку
+    в кеше при изменении или удалении продукта.
+    """
+    refresh_product_card(instance.pk)
+    invalidate_product_card(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Version)
+def version_changed(sender, instance, **kwargs):
+    """
+    Обновляет время изменения продукта, от которого зависят его ETag
+    и Last-Modified, и пересчитывает карточку продукта при изменении его версий.
+    """
+    Product.objects.filter(pk=instance.product_id).update(updated_at=timezone.now())
+    refresh_product_card(instance.product_id)
+    invalidate_product_card(instance.product_id)
+
+
+@receiver(post_save, sender=Product)
+def product_photo_thumbnails(sender, instance, **kwargs):
+    """
+    Создает уменьшенные копии фото продукта после загрузки.
+    """
+    if instance.photo:
+        make_thumbnails(instance.photo.name, refresh=True)
+
+
+@receiver([post_save, post_delete], sender=ForbiddenWord)
+def forbidden_word_changed(sender, **kwargs):
+    """
+    Сбрасывает скомпилированный словарь модерации в текущем процессе.
+    """
+    invalidate_dictionary()
+
+
+@receiver(post_migrate)
+def repair_search_indexes(sender, using, **kwargs):
+    """
+    Восстанавливает триггеры полнотекстового поиска в SQLite после миграций.
+    """
+    for index in (product_index, article_index):
+        index.repair(connections[using])
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, **kwargs):
+    """
+    Сбрасывает роль пользователя: могли измениться is_active или is_superuser.
+    """
+    invalidate_user_role(instance.pk)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def user_permissions_changed(sender, instance, action, **kwargs):
+    """
+    Сбрасывает роли при изменении групп или личных прав пользователей.
+    """
+    if not action.startswith("post_"):
+        return
+    if isinstance(instance, User):
+        invalidate_user_role(instance.pk)
+    else:
+        invalidate_all_roles()
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def group_permissions_changed(sender, action, **kwargs):
+    """
+    Сбрасывает роли всех пользователей при изменении прав групп.
+    """
+    if action.startswith("post_"):
+        invalidate_all_roles()
+
+
+@receiver(post_delete, sender=Group)
+def group_deleted(sender, **kwargs):
+    invalidate_all_roles()
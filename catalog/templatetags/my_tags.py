@@ -1,5 +1,7 @@
 from django import template
 
+from catalog.thumbnails import get_thumbnail, make_thumbnails
+
 register = template.Library()
 
 
@@ -8,3 +10,32 @@ def media_filter(path):
     if path:
         return f"/media/{path}"
     return "#"
+
+
+@register.filter()
+def thumbnail(path, width):
+    """
+    Возвращает URL уменьшенной копии изображения заданной ширины.
+
+    Копия создается при первом обращении. Если создать ее не удалось,
+    возвращается URL исходного файла, как у ``media_filter``.
+
+    :param path: Путь изображения относительно MEDIA_ROOT.
+    :param width: Ширина копии в пикселях.
+    """
+    name = get_thumbnail(path, int(width))
+    return media_filter(name or path)
+
+
+@register.filter()
+def srcset(path):
+    """
+    Возвращает значение атрибута ``srcset`` со всеми размерами из THUMBNAIL_SIZES.
+
+    :param path: Путь изображения относительно MEDIA_ROOT.
+    :return: Строка вида ``/media/... 320w, /media/... 640w`` или пустая строка.
+    """
+    thumbnails = make_thumbnails(path)
+    return ", ".join(
+        f"{media_filter(name)} {width}w" for width, name in thumbnails.items()
+    )
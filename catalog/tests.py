@@ -1,3 +1,802 @@
-from django.test import TestCase
+import json
+import os
+import re
+import tempfile
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import ExifTags, Image
+
+from blog.models import Article
+from catalog.forms import ProductForm
+from catalog.fragments import product_card_key
+from catalog.management.commands.load_fixtures import iter_fixture
+from catalog.models import Category, ContactsInfo, ForbiddenWord, Product, ProductCard, Version
+from catalog.moderation import (
+    ForbiddenWordMatcher,
+    find_forbidden_words,
+    invalidate_dictionary,
+    trie_pattern,
+)
+from catalog.templatetags.my_tags import srcset, thumbnail
+from catalog.thumbnails import save_thumbnail, thumbnail_name
+from catalog.views import is_active_version_conflict
+from catalog.paginators import KeysetPaginator
+from catalog.permissions import ROLE_CONTENT_MANAGER, ROLE_MODERATOR, get_user_role
+from catalog.projections import rebuild_product_cards
+from catalog.search import article_index, product_index
+from users.models import User
+
+
+class ProductListViewQueriesTest(TestCase):
+    """
+    Проверяет, что главная страница не делает запрос на каждый продукт.
+    """
+
+    @staticmethod
+    def create_products(count, start=0, user=None):
+        for number in range(start, start + count):
+            product = Product.objects.create(
+                name=f"Товар {number}", description="Описание", user=user
+            )
+            Version.objects.create(
+                product=product,
+                version_number=f"{number}.0",
+                version_name="Активная",
+                is_active=True,
+            )
+            Version.objects.create(
+                product=product, version_number=f"{number}.1", version_name="Старая"
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def count_home_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("catalog:home"))
+        self.assertEqual(response.status_code, 200)
+        return len(context), response
+
+    def test_query_count_does_not_depend_on_products(self):
+        owner = User.objects.create(email="owner@example.com")
+        self.client.force_login(owner)
+
+        self.create_products(2, user=owner)
+        small_count, _ = self.count_home_queries()
+
+        self.create_products(10, start=2, user=owner)
+        large_count, response = self.count_home_queries()
+
+        self.assertEqual(small_count, large_count)
+        self.assertContains(response, "Версия: 11.0")
+        self.assertNotContains(response, "Версия: 11.1")
+
+
+@override_settings(ROOT_URLCONF="benchmarks.urls")
+class AsyncProductViewsTest(TestCase):
+    """
+    Проверяет, что асинхронные страницы каталога совпадают с синхронными.
+    """
+
+    def setUp(self):
+        cache.clear()
+        ProductListViewQueriesTest.create_products(14)
+
+    async def test_list_matches_sync_view(self):
+        sync_response = await self.async_client.get(reverse("catalog:home"))
+        response = await self.async_client.get(reverse("async_home"))
+        self.assertEqual(response.context["product_cards"], sync_response.context["product_cards"])
+
+        cursor = response.context["page_obj"].next_cursor
+        response = await self.async_client.get(reverse("async_home"), {"cursor": cursor})
+        self.assertEqual(len(response.context["product_cards"]), 2)
+        self.assertContains(response, "Версия: 0.0")
+
+    async def test_list_fills_card_cache(self):
+        response = await self.async_client.get(reverse("async_home"))
+        product = response.context["product_cards"][0][0]
+        self.assertIsNotNone(await cache.aget(product_card_key(product["product_id"])))
+
+    async def test_detail(self):
+        product = await Product.objects.afirst()
+        response = await self.async_client.get(reverse("async_product_detail", args=[product.pk]))
+        self.assertContains(response, product.name)
+        response = await self.async_client.get(reverse("async_product_detail", args=[0]))
+        self.assertEqual(response.status_code, 404)
+
+
+class ConditionalGetTest(TestCase):
+    """
+    Проверяет ETag и Last-Modified страницы продукта.
+    """
+
+    def setUp(self):
+        self.product = Product.objects.create(name="Товар", description="Описание")
+        self.url = reverse("catalog:product_detail", args=[self.product.pk])
+
+    def test_not_modified_until_product_or_version_changes(self):
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+        self.assertIn("s-maxage=60", response["Cache-Control"])
+        self.assertIn("Last-Modified", response)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        Version.objects.create(
+            product=self.product, version_number="1", version_name="Первая", is_active=True
+        )
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_etag_depends_on_user(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.client.force_login(User.objects.create(email="reader@example.com"))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("private", response["Cache-Control"])
+        self.assertEqual(self.client.get(reverse("catalog:product_detail", args=[0])).status_code, 404)
+
+
+class KeysetPaginatorTest(TestCase):
+    """
+    Проверяет обход страниц курсорной пагинации в обе стороны.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        # Все продукты созданы в один день: порядок определяется первичным ключом.
+        Product.objects.bulk_create(
+            Product(name=f"Товар {number}", description="Описание")
+            for number in range(25)
+        )
+        rebuild_product_cards()
+        cls.expected = list(
+            Product.objects.order_by("-created_at", "-pk").values_list("pk", flat=True)
+        )
+
+    def test_walk_forward_and_back(self):
+        paginator = KeysetPaginator(Product.objects.all(), 10, "-created_at")
+        pages = [paginator.get_page()]
+        while pages[-1].has_next():
+            pages.append(paginator.get_page(pages[-1].next_cursor))
+
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertFalse(pages[0].has_previous())
+        walked = [product.pk for page in pages for product in page]
+        self.assertEqual(walked, self.expected)
+
+        previous = paginator.get_page(pages[-1].previous_cursor)
+        self.assertEqual(
+            [product.pk for product in previous], [product.pk for product in pages[1]]
+        )
+        first = paginator.get_page(previous.previous_cursor)
+        self.assertEqual(
+            [product.pk for product in first], [product.pk for product in pages[0]]
+        )
+        self.assertFalse(first.has_previous())
+
+    def test_home_page_links_and_bad_cursor(self):
+        response = self.client.get(reverse("catalog:home"))
+        self.assertEqual(len(response.context["object_list"]), 12)
+        next_cursor = response.context["page_obj"].next_cursor
+        self.assertContains(response, f"?cursor={next_cursor}")
+
+        response = self.client.get(reverse("catalog:home"), {"cursor": next_cursor})
+        self.assertEqual(response.context["object_list"][0]["product_id"], self.expected[12])
+
+        response = self.client.get(reverse("catalog:home"), {"cursor": "bad"})
+        self.assertEqual(response.status_code, 404)
+
+
+class ProductCardCacheTest(TestCase):
+    """
+    Проверяет кеширование карточек продуктов и их сброс сигналами.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.product = Product.objects.create(name="Ноутбук", description="Описание")
+
+    def test_card_is_cached_and_invalidated(self):
+        self.client.get(reverse("catalog:home"))
+        self.assertIsNotNone(cache.get(product_card_key(self.product.pk)))
+
+        Version.objects.create(
+            product=self.product,
+            version_number="2.0",
+            version_name="Новая",
+            is_active=True,
+        )
+        self.assertIsNone(cache.get(product_card_key(self.product.pk)))
+
+        response = self.client.get(reverse("catalog:home"))
+        self.assertContains(response, "Версия: 2.0")
+
+        self.product.name = "Планшет"
+        self.product.save()
+        response = self.client.get(reverse("catalog:home"))
+        self.assertContains(response, "Планшет")
+
+    def test_buttons_are_not_shared_between_users(self):
+        owner = User.objects.create(email="owner@example.com")
+        self.product.user = owner
+        self.product.save()
+
+        self.client.force_login(owner)
+        response = self.client.get(reverse("catalog:home"))
+        self.assertContains(response, "Удалить")
+
+        self.client.logout()
+        response = self.client.get(reverse("catalog:home"))
+        self.assertNotContains(response, "Удалить")
+
+
+class ProductCardProjectionTest(TestCase):
+    """
+    Проверяет поддержку проекции ``ProductCard`` сигналами и ее перестроение.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create(email="owner@example.com")
+        self.product = Product.objects.create(
+            name="Ноутбук", description="Очень длинное описание. " * 10, user=self.owner
+        )
+
+    def test_signals_keep_card_in_sync(self):
+        card = ProductCard.objects.get(pk=self.product.pk)
+        self.assertEqual(
+            (card.name, card.user_id, card.version_number), ("Ноутбук", self.owner.pk, None)
+        )
+        self.assertEqual(len(card.short_description), 100)
+
+        version = Version.objects.create(
+            product=self.product, version_number="3.0", version_name="Новая", is_active=True
+        )
+        self.assertEqual(ProductCard.objects.get(pk=self.product.pk).version_number, "3.0")
+        version.delete()
+        self.assertIsNone(ProductCard.objects.get(pk=self.product.pk).version_number)
+
+        self.product.delete()
+        self.assertFalse(ProductCard.objects.exists())
+
+    def test_rebuild_after_bulk_operations(self):
+        Product.objects.filter(pk=self.product.pk).update(name="Планшет")
+        Product.objects.bulk_create([Product(name="Телефон", description="Описание")])
+
+        call_command("rebuild_product_cards", stdout=StringIO())
+        self.assertEqual(
+            sorted(ProductCard.objects.values_list("name", flat=True)), ["Планшет", "Телефон"]
+        )
+
+    def test_home_page_reads_projection_only(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("catalog:home"))
+        self.assertContains(response, "Ноутбук")
+        tables = " ".join(query["sql"] for query in context.captured_queries)
+        self.assertIn("catalog_productcard", tables)
+        self.assertNotIn('"catalog_product"', tables)
+        self.assertNotIn('"catalog_version"', tables)
+
+
+class RoleCacheTest(TestCase):
+    """
+    Проверяет кеширование роли пользователя и ее сброс при изменении прав.
+
+    Кеши ``roles_a`` и ``roles_b`` — два экземпляра общего файлового кеша,
+    как в двух процессах; ``default`` — локальный кеш процесса.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        shared = {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": directory.name,
+        }
+        override = override_settings(
+            CACHES={**settings.CACHES, "roles_a": shared, "roles_b": shared},
+            ROLE_CACHE="roles_a",
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        cache.clear()
+
+        self.manager = User.objects.create(email="manager@example.com")
+        self.group = Group.objects.create(name="Контент-менеджеры")
+        self.group.permissions.add(
+            Permission.objects.get(codename="set_published", content_type__app_label="catalog")
+        )
+        self.manager.groups.add(self.group)
+        self.product = Product.objects.create(name="Товар", description="Описание")
+
+    def fresh_role(self):
+        return get_user_role(User.objects.get(pk=self.manager.pk))
+
+    def test_role_is_cached_between_requests(self):
+        self.assertEqual(get_user_role(self.manager), ROLE_CONTENT_MANAGER)
+
+        user = User.objects.get(pk=self.manager.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_role(user), ROLE_CONTENT_MANAGER)
+
+    def test_role_is_reset_on_permission_change(self):
+        self.assertEqual(get_user_role(self.manager), ROLE_CONTENT_MANAGER)
+        self.group.permissions.add(
+            *Permission.objects.filter(
+                codename__in=("can_edit_description", "can_edit_category"),
+                content_type__app_label="catalog",
+            )
+        )
+        self.assertEqual(self.fresh_role(), ROLE_MODERATOR)
+
+        self.manager.groups.remove(self.group)
+        self.assertIsNone(self.fresh_role())
+
+    def test_reset_in_other_process_is_seen(self):
+        self.assertEqual(self.fresh_role(), ROLE_CONTENT_MANAGER)
+        # Права отзываются в другом процессе: сигнал сбрасывает роль в его кеше.
+        with self.settings(ROLE_CACHE="roles_b"):
+            self.manager.groups.remove(self.group)
+        self.assertIsNone(self.fresh_role())
+
+    @override_settings(ROLE_CACHE="default")
+    def test_local_cache_keeps_role_only_for_request(self):
+        self.assertEqual(self.fresh_role(), ROLE_CONTENT_MANAGER)
+        # Изменение без сигнала, как в другом процессе с собственным locmem.
+        User.groups.through.objects.filter(user=self.manager).delete()
+        self.assertIsNone(self.fresh_role())
+
+    def test_update_view_uses_role_form(self):
+        self.client.force_login(self.manager)
+        response = self.client.get(reverse("catalog:product_edit", args=[self.product.pk]))
+        self.assertEqual(list(response.context["form"].fields), ["publication"])
+
+        self.manager.groups.clear()
+        response = self.client.get(reverse("catalog:product_edit", args=[self.product.pk]))
+        self.assertEqual(response.status_code, 403)
+
+
+class LoadFixturesTest(TestCase):
+    """
+    Проверяет потоковую загрузку фикстур.
+    """
+
+    def test_stream_matches_json_load(self):
+        with open("fixtures/catalog_data.json", encoding="utf-8") as file:
+            expected = json.load(file)
+        # Маленький кусок заставляет парсер дочитывать объекты по частям.
+        self.assertEqual(list(iter_fixture("fixtures/catalog_data.json", chunk_size=7)), expected)
+        self.assertTrue(list(iter_fixture("fixtures/blog_data.json")))
+
+    def test_command_loads_fixtures(self):
+        with CaptureQueriesContext(connection) as context:
+            call_command("load_fixtures", batch_size=2, stdout=StringIO())
+
+        # Категории продуктов не запрашиваются из базы построчно.
+        category_lookups = [
+            query for query in context if 'FROM "catalog_category" WHERE' in query["sql"]
+        ]
+        self.assertEqual(category_lookups, [])
+
+        self.assertEqual(Category.objects.count(), 4)
+        self.assertEqual(Product.objects.count(), 10)
+        self.assertEqual(ProductCard.objects.count(), 10)
+        self.assertEqual(ContactsInfo.objects.count(), 1)
+        self.assertTrue(Article.objects.exists())
+        self.assertEqual(Product.objects.get(pk=3).category_id, 1)
+
+    def test_reload_clears_products_without_signals(self):
+        call_command("load_fixtures", stdout=StringIO())
+        product = Product.objects.first()
+        Version.objects.create(product=product, version_number="1", version_name="Первая")
+        with mock.patch("catalog.signals.refresh_product_card") as refresh:
+            call_command("load_fixtures", stdout=StringIO())
+        refresh.assert_not_called()
+        self.assertFalse(Version.objects.exists())
+        self.assertEqual(ProductCard.objects.count(), 10)
+
+
+class ProductExchangeTest(TestCase):
+    """
+    Проверяет импорт и выгрузку товаров в CSV и JSON Lines.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write_file(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+        return path
+
+    def test_import_upserts_products_and_versions(self):
+        Category.objects.create(name="Ноутбуки", description="")
+        path = self.write_file(
+            "products.csv",
+            "external_id,name,description,price,category,publication,version_number,version_name\n"
+            "sku-1,Ноутбук,Описание,100.50,Ноутбуки,1,1.0,Первая\n"
+            "sku-2,Планшет,Описание,50,Планшеты,0,,\n"
+            ",Без ключа,Описание,1,,0,,\n",
+        )
+        call_command("import_products", path, batch_size=2, stdout=StringIO())
+        laptop = Product.objects.get(external_id="sku-1")
+        self.assertEqual(
+            (laptop.category.name, laptop.price, laptop.publication), ("Ноутбуки", 100.5, True)
+        )
+        self.assertEqual(laptop.active_version.version_number, "1.0")
+        self.assertEqual(Category.objects.count(), 2)
+        self.assertEqual(ProductCard.objects.get(pk=laptop.pk).version_number, "1.0")
+
+        path = self.write_file(
+            "update.jsonl",
+            '{"external_id": "sku-1", "name": "Ноутбук Pro", "price": "120", "versions": ['
+            '{"version_number": "1.0", "version_name": "Первая"}, '
+            '{"version_number": "2.0", "version_name": "Вторая", "is_active": true}]}\n',
+        )
+        out = StringIO()
+        call_command("import_products", path, stdout=out)
+        self.assertIn("создано 0, обновлено 1", out.getvalue())
+        self.assertEqual(Product.objects.count(), 2)
+        laptop.refresh_from_db()
+        self.assertEqual(laptop.name, "Ноутбук Pro")
+        self.assertEqual(
+            list(laptop.version_set.order_by("pk").values_list("version_number", "is_active")),
+            [("1.0", False), ("2.0", True)],
+        )
+        self.assertEqual(ProductCard.objects.get(pk=laptop.pk).name, "Ноутбук Pro")
+
+    def test_export_round_trip(self):
+        category = Category.objects.create(name="Телефоны", description="")
+        product = Product.objects.create(
+            name="Смартфон", description="Описание", price=10, category=category,
+            external_id="sku-9",
+        )
+        Version.objects.create(
+            product=product, version_number="3", version_name="Третья", is_active=True
+        )
+
+        for name in ("products.csv", "products.jsonl"):
+            path = os.path.join(self.directory.name, name)
+            call_command("export_products", path, chunk_size=1, stdout=StringIO())
+            Product.objects.update(name="Изменено")
+            call_command("import_products", path, stdout=StringIO())
+            product.refresh_from_db()
+            self.assertEqual((product.name, product.category_id), ("Смартфон", category.pk))
+            self.assertEqual(product.active_version.version_number, "3")
+            self.assertEqual(Version.objects.count(), 1)
+
+    def test_bad_row_reports_line(self):
+        path = self.write_file("bad.jsonl", '{"external_id": "sku-1", "name": "A"}\n{oops\n')
+        with self.assertRaisesMessage(CommandError, "строка 2"):
+            call_command("import_products", path, stdout=StringIO())
+
+    def test_values_out_of_field_range_report_line(self):
+        first = '{"external_id": "sku-1", "name": "Ноутбук", "price": "10"}'
+        rows = [
+            ('{"external_id": "sku-2", "price": "123456789012"}', "Цена за покупку"),
+            ('{"external_id": "sku-3", "name": "%s"}' % ("Н" * 151), "Наименование товара"),
+            (
+                '{"external_id": "sku-4", "versions": [{"version_number": "%s"}]}' % ("1" * 51),
+                "Номер версии",
+            ),
+        ]
+        for line, field in rows:
+            path = self.write_file("bad.jsonl", f"{first}\n{line}\n")
+            with self.assertRaisesMessage(CommandError, f"строка 2: {field}"):
+                call_command("import_products", path, batch_size=1, stdout=StringIO())
+        # Первая строка загружена своим пакетом, ошибочные не записаны.
+        self.assertEqual(list(Product.objects.values_list("external_id", flat=True)), ["sku-1"])
+
+
+class ForbiddenWordsTest(TestCase):
+    """
+    Проверяет словарь модерации и поиск запрещенных слов.
+    """
+
+    def setUp(self):
+        # Откат транзакции теста не вызывает сигналов словаря.
+        invalidate_dictionary()
+
+    def test_trie_pattern_matches_words(self):
+        pattern = trie_pattern(["крипта", "криптовалюта", "кот", ""])
+        self.assertEqual(pattern, "к(?:от|рипт(?:а|овалюта))")
+        self.assertEqual(
+            re.findall(pattern, "криптовалюта, крипта, котик, крипто"),
+            ["криптовалюта", "крипта", "кот"],
+        )
+        self.assertEqual(trie_pattern(["ab", "abc"]), "ab(?:c)?")
+        self.assertIsNone(trie_pattern([]))
+
+    def test_initial_words_are_seeded(self):
+        self.assertEqual(
+            find_forbidden_words("Бесплатно и ДЕШЕВО, бесплатно"), ["бесплатно", "дешево"]
+        )
+        self.assertEqual(find_forbidden_words("Обычный ноутбук"), [])
+
+    def test_dictionary_changes_are_applied(self):
+        self.assertEqual(find_forbidden_words("Подделка"), [])
+        word = ForbiddenWord.objects.create(word="  ПОДДЕЛКА ")
+        self.assertEqual(word.word, "подделка")
+        self.assertEqual(find_forbidden_words("Подделка"), ["подделка"])
+        word.is_active = False
+        word.save()
+        self.assertEqual(find_forbidden_words("Подделка"), [])
+
+    def test_overlapping_words_are_found(self):
+        ForbiddenWord.objects.create(word="abc")
+        ForbiddenWord.objects.create(word="ab")
+        ForbiddenWord.objects.create(word="b")
+        self.assertEqual(find_forbidden_words("ABC"), ["ab", "abc", "b"])
+        self.assertEqual(
+            find_forbidden_words("Криптовалюта без обмана"), ["криптовалюта", "обман"]
+        )
+
+    def test_other_processes_see_changes(self):
+        other = ForbiddenWordMatcher()
+        self.assertEqual(other.find("Подделка"), [])
+        # Сигналы сбрасывают словарь только в своем процессе; другой процесс
+        # сверяет версию с базой не чаще FORBIDDEN_WORDS_CHECK_INTERVAL.
+        ForbiddenWord.objects.create(word="подделка")
+        self.assertEqual(other.find("Подделка"), [])
+        with override_settings(FORBIDDEN_WORDS_CHECK_INTERVAL=0):
+            self.assertEqual(other.find("Подделка"), ["подделка"])
+            ForbiddenWord.objects.filter(word="подделка").delete()
+            self.assertEqual(other.find("Подделка"), [])
+
+    def test_form_rejects_dictionary_words(self):
+        ForbiddenWord.objects.create(word="подделка")
+        form = ProductForm(data={"name": "Подделка", "description": "Крипта", "price": 1})
+        self.assertFalse(form.is_valid())
+        self.assertEqual(
+            form.errors["name"], ["Название товара не должно содержать запрещенные слова"]
+        )
+        self.assertEqual(
+            form.errors["description"], ["Описание не должно содержать запрещенные слова"]
+        )
+
+    def test_scan_reports_offending_products(self):
+        clean = Product.objects.create(name="Ноутбук", description="Описание", price=1)
+        bad = Product.objects.create(name="Казино", description="Радар", price=1)
+        out = StringIO()
+        call_command("scan_forbidden_words", batch_size=1, stdout=out)
+        self.assertIn(f"{bad.pk}\tКазино\tказино, радар", out.getvalue())
+        self.assertNotIn(f"{clean.pk}\t", out.getvalue())
+        self.assertIn("Проверено 2, с запрещенными словами 1", out.getvalue())
+
+
+class ThumbnailsTest(TestCase):
+    """
+    Проверяет создание уменьшенных копий изображений.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media_root.cleanup)
+        override = override_settings(MEDIA_ROOT=self.media_root.name)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        os.makedirs(os.path.join(self.media_root.name, "catalog/photo"))
+        self.name = "catalog/photo/big.png"
+        Image.new("RGB", (1200, 600), "red").save(os.path.join(self.media_root.name, self.name))
+
+    def thumbnail_path(self, width):
+        return os.path.join(self.media_root.name, thumbnail_name(self.name, width))
+
+    def test_srcset_creates_thumbnails(self):
+        value = srcset(self.name)
+
+        self.assertIn(f"/media/{thumbnail_name(self.name, 320)} 320w", value)
+        with Image.open(self.thumbnail_path(320)) as image:
+            self.assertEqual((image.format, image.size), ("WEBP", (320, 160)))
+        self.assertEqual(srcset("catalog/photo/missing.png"), "")
+
+    def test_narrow_and_broken_images(self):
+        narrow = "catalog/photo/narrow.png"
+        Image.new("RGB", (500, 250), "red").save(os.path.join(self.media_root.name, narrow))
+        self.assertEqual(srcset(narrow), f"/media/{thumbnail_name(narrow, 320)} 320w")
+        self.assertEqual(thumbnail(narrow, 640), f"/media/{narrow}")
+
+        broken = "catalog/photo/broken.png"
+        with open(os.path.join(self.media_root.name, broken), "wb") as file:
+            file.write(b"\x89PNG\r\n\x1a\n" + b"\x00" * 64)
+        self.assertEqual(srcset(broken), "")
+        self.assertEqual(thumbnail(broken, 320), f"/media/{broken}")
+        # Временные файлы не остаются, копии для широких ширин не создаются.
+        self.assertEqual(
+            os.listdir(os.path.join(self.media_root.name, "thumbs/catalog/photo")),
+            [os.path.basename(thumbnail_name(narrow, 320))],
+        )
+
+    def test_skipped_sizes_are_remembered(self):
+        narrow = "catalog/photo/narrow.png"
+        Image.new("RGB", (500, 250), "red").save(os.path.join(self.media_root.name, narrow))
+        srcset(narrow)
+        srcset("catalog/photo/missing.png")
+        with mock.patch("catalog.thumbnails.save_thumbnail", wraps=save_thumbnail) as save:
+            self.assertEqual(srcset(narrow), f"/media/{thumbnail_name(narrow, 320)} 320w")
+            self.assertEqual(thumbnail(narrow, 640), f"/media/{narrow}")
+            self.assertEqual(srcset("catalog/photo/missing.png"), "")
+        # Повторно вызывается только проверка уже созданной копии 320w.
+        self.assertEqual(save.call_count, 1)
+
+    def test_exif_rotation_is_checked_before_decoding(self):
+        rotated = "catalog/photo/rotated.jpg"
+        exif = Image.Exif()
+        exif[ExifTags.Base.Orientation] = 6
+        Image.new("RGB", (500, 700), "red").save(
+            os.path.join(self.media_root.name, rotated), exif=exif
+        )
+        self.assertEqual(thumbnail(rotated, 640), f"/media/{thumbnail_name(rotated, 640)}")
+        with Image.open(os.path.join(self.media_root.name, thumbnail_name(rotated, 640))) as image:
+            self.assertEqual(image.size, (640, 457))
+
+    def test_upload_and_backfill(self):
+        Product.objects.create(name="Товар", description="Описание", photo=self.name)
+        self.assertTrue(os.path.exists(self.thumbnail_path(640)))
+
+        os.remove(self.thumbnail_path(640))
+        call_command("build_thumbnails", workers=1, stdout=StringIO())
+        self.assertTrue(os.path.exists(self.thumbnail_path(640)))
+
+
+class SearchTest(TestCase):
+    """
+    Проверяет полнотекстовый поиск и поддержку индекса триггерами.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.in_description = Product.objects.create(
+            name="Наушники", description="Подходят к любому смартфону"
+        )
+        cls.in_name = Product.objects.create(name="Смартфон", description="Новая модель")
+        Product.objects.create(name="Ноутбук", description="Для работы")
+        Article.objects.create(title="Как выбрать смартфон", content="Советы")
+        Article.objects.create(title="Смартфон-черновик", content="Текст", is_published=False)
+
+    def test_ranking_and_updates(self):
+        results = product_index.search("смартфон")
+        self.assertEqual(results.count(), 2)
+        self.assertEqual(list(results[0:10]), [self.in_name, self.in_description])
+
+        self.in_name.name = "Планшет"
+        self.in_name.save()
+        self.assertEqual(list(product_index.search("смартфон")[0:10]), [self.in_description])
+
+        self.in_description.delete()
+        self.assertEqual(product_index.search("смартфон").count(), 0)
+
+    def test_unpublished_articles_are_hidden(self):
+        titles = [article.title for article in article_index.search("смартфон")[0:10]]
+        self.assertEqual(titles, ["Как выбрать смартфон"])
+
+    def test_search_view(self):
+        response = self.client.get(reverse("catalog:search"), {"q": "смартф"})
+        self.assertContains(response, "Наушники")
+        self.assertNotContains(response, "Ноутбук")
+
+        response = self.client.get(
+            reverse("catalog:search"), {"q": "смартфон", "section": "articles"}
+        )
+        self.assertContains(response, "Как выбрать смартфон")
+        self.assertEqual(response.context["page_obj"].paginator.count, 1)
+
+
+class ActiveVersionConstraintTest(TestCase):
+    """
+    Проверяет, что база данных допускает только одну активную версию продукта.
+    """
+
+    def setUp(self):
+        self.owner = User.objects.create(email="owner@example.com")
+        self.product = Product.objects.create(
+            name="Товар", description="Описание", user=self.owner
+        )
+        self.first = Version.objects.create(
+            product=self.product, version_number="1", version_name="Первая", is_active=True
+        )
+        self.second = Version.objects.create(
+            product=self.product, version_number="2", version_name="Вторая"
+        )
+        self.client.force_login(self.owner)
+
+    def post_versions(self, first_active, second_active):
+        data = {
+            "name": "Товар",
+            "description": "Описание",
+            "price": "10.00",
+            "user": self.owner.pk,
+            "version_set-TOTAL_FORMS": "3",
+            "version_set-INITIAL_FORMS": "2",
+            "version_set-MIN_NUM_FORMS": "0",
+            "version_set-MAX_NUM_FORMS": "1000",
+        }
+        for number, (version, active) in enumerate(
+            ((self.first, first_active), (self.second, second_active))
+        ):
+            data.update({
+                f"version_set-{number}-id": version.pk,
+                f"version_set-{number}-product": self.product.pk,
+                f"version_set-{number}-version_number": version.version_number,
+                f"version_set-{number}-version_name": version.version_name,
+            })
+            if active:
+                data[f"version_set-{number}-is_active"] = "on"
+        return self.client.post(reverse("catalog:product_edit", args=[self.product.pk]), data)
+
+    def test_database_rejects_second_active_version(self):
+        with self.assertRaises(IntegrityError) as caught, transaction.atomic():
+            Version.objects.filter(pk=self.second.pk).update(is_active=True)
+        self.assertTrue(is_active_version_conflict(caught.exception))
+
+    def test_other_integrity_errors_are_not_active_version_conflicts(self):
+        Product.objects.filter(pk=self.product.pk).update(external_id="sku-1")
+        with self.assertRaises(IntegrityError) as caught, transaction.atomic():
+            Product.objects.create(name="Товар", description="", price=1, external_id="sku-1")
+        self.assertFalse(is_active_version_conflict(caught.exception))
+
+    def test_switch_active_version_in_one_submit(self):
+        response = self.post_versions(first_active=False, second_active=True)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.product.active_version, self.second)
+
+    def test_two_active_versions_show_form_error(self):
+        response = self.post_versions(first_active=True, second_active=True)
+        self.assertContains(response, "более одной активной версии")
+        self.assertEqual(self.product.active_version, self.first)
+
+
+class IndexUsageTest(TestCase):
+    """
+    Проверяет по плану запроса (EXPLAIN), что частые запросы используют индексы.
+    """
+
+    def assertUsesIndex(self, queryset, index_name):
+        with transaction.atomic():
+            if connection.vendor == "postgresql":
+                # На маленьких тестовых таблицах планировщик предпочел бы полный просмотр.
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+        self.assertIn(index_name, plan)
+
+    def test_product_list_uses_created_index(self):
+        self.assertUsesIndex(
+            Product.objects.order_by("-created_at", "-pk")[:13], "catalog_product_created_idx"
+        )
+
+    def test_product_cards_use_created_index(self):
+        self.assertUsesIndex(
+            ProductCard.objects.order_by("-created_at", "-pk")[:13], "catalog_card_created_idx"
+        )
+
+    def test_default_ordering_uses_ordering_index(self):
+        self.assertUsesIndex(Product.objects.all()[:10], "catalog_product_ordering_idx")
+
+    def test_article_list_uses_partial_index(self):
+        self.assertUsesIndex(
+            Article.objects.filter(is_published=True).order_by("-created_at", "-pk")[:11],
+            "blog_article_published_idx",
+        )
+
+    def test_active_version_prefetch_uses_partial_unique_index(self):
+        self.assertUsesIndex(
+            Version.objects.filter(is_active=True, product_id__in=[1, 2, 3]),
+            "catalog_version_one_active",
+        )
@@ -0,0 +1,161 @@
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+
+THUMBNAIL_DIR = "thumbs"
+THUMBNAIL_SKIPPED_KEY = "catalog:thumbnail_skipped:{thumbnail}"
+
+# Значения EXIF Orientation с поворотом на 90°: ширина и высота меняются местами.
+TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+FORMAT_EXTENSIONS = {"JPEG": "jpg", "WEBP": "webp", "PNG": "png"}
+
+
+def thumbnail_name(name, width, image_format=None):
+    """
+    Возвращает путь уменьшенной копии относительно MEDIA_ROOT.
+
+    :param name: Путь исходного файла относительно MEDIA_ROOT.
+    :param width: Ширина уменьшенной копии в пикселях.
+    :param image_format: Формат PIL (по умолчанию THUMBNAIL_FORMAT).
+    """
+    image_format = (image_format or settings.THUMBNAIL_FORMAT).upper()
+    base, _ = os.path.splitext(str(name))
+    return f"{THUMBNAIL_DIR}/{base}_{width}w.{FORMAT_EXTENSIONS[image_format]}"
+
+
+def save_thumbnail(source, target, width, image_format, quality):
+    """
+    Сохраняет уменьшенную копию изображения.
+
+    Функция не обращается к настройкам Django, поэтому ее можно выполнять
+    в отдельных процессах. Файл пишется во временный с уникальным именем
+    и затем атомарно переименовывается, чтобы параллельные запросы (в том
+    числе потоки одного процесса) не писали в один файл и не увидели его
+    недописанным.
+
+    :param source: Абсолютный путь исходного изображения.
+    :param target: Абсолютный путь уменьшенной копии.
+    :param width: Ширина копии. Изображения уже этой ширины не увеличиваются,
+        и копия для них не создается.
+    :param image_format: Формат PIL: ``WEBP``, ``JPEG`` или ``PNG``.
+    :param quality: Качество сжатия.
+    :return: True, если копия создана или уже существовала; None, если исходное
+        изображение уже ``width``; False, если изображение не удалось прочитать.
+    """
+    target = Path(target)
+    if target.exists():
+        return True
+    # Pillow импортируется при первой обработке изображения, а не при запуске
+    # процесса: модуль загружают сигналы моделей, и импорт удлинял бы django.setup().
+    from PIL import ExifTags, Image, ImageOps
+
+    temporary = None
+    try:
+        with Image.open(source) as image:
+            # Размер и EXIF читаются из заголовка: узкое изображение пропускается
+            # до полного декодирования, которое делает exif_transpose.
+            source_width, source_height = image.size
+            if image.getexif().get(ExifTags.Base.Orientation) in TRANSPOSED_ORIENTATIONS:
+                source_width = source_height
+            if source_width < width:
+                return None
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((width, image.height * width // image.width))
+            if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=target.parent, prefix=f".{target.name}.", suffix=".tmp", delete=False
+            ) as file:
+                temporary = file.name
+                image.save(file, format=image_format, quality=quality)
+            os.replace(temporary, target)
+    except (OSError, ValueError, SyntaxError, Image.DecompressionBombError):
+        # Файла нет, это не изображение (UnidentifiedImageError — подкласс OSError),
+        # файл поврежден или слишком велик.
+        if temporary and os.path.exists(temporary):
+            os.remove(temporary)
+        return False
+    return True
+
+
+def thumbnail_skipped_key(thumbnail):
+    """
+    Возвращает ключ кеша отметки о том, что копию создать нельзя.
+    """
+    return THUMBNAIL_SKIPPED_KEY.format(thumbnail=thumbnail)
+
+
+def create_thumbnail(name, width, image_format):
+    """
+    Создает уменьшенную копию и запоминает в кеше неудачу.
+
+    Если исходное изображение уже ``width``, отсутствует или не читается,
+    на THUMBNAIL_SKIPPED_TIMEOUT секунд ставится отметка: следующие рендеры
+    страницы не открывают файл заново.
+
+    :return: Путь копии относительно MEDIA_ROOT или None.
+    """
+    thumbnail = thumbnail_name(name, width, image_format)
+    created = save_thumbnail(
+        os.path.join(settings.MEDIA_ROOT, str(name)),
+        os.path.join(settings.MEDIA_ROOT, thumbnail),
+        width,
+        image_format,
+        settings.THUMBNAIL_QUALITY,
+    )
+    if created is True:
+        return thumbnail
+    cache.set(thumbnail_skipped_key(thumbnail), True, settings.THUMBNAIL_SKIPPED_TIMEOUT)
+    return None
+
+
+def get_thumbnail(name, width, image_format=None):
+    """
+    Возвращает путь уменьшенной копии, при необходимости создавая ее.
+
+    :param name: Путь исходного файла относительно MEDIA_ROOT.
+    :param width: Ширина копии.
+    :param image_format: Формат PIL (по умолчанию THUMBNAIL_FORMAT).
+    :return: Путь копии относительно MEDIA_ROOT или None, если исходное изображение
+        уже ``width`` или копию не удалось создать.
+    """
+    if not name:
+        return None
+    image_format = (image_format or settings.THUMBNAIL_FORMAT).upper()
+    if cache.get(thumbnail_skipped_key(thumbnail_name(name, width, image_format))):
+        return None
+    return create_thumbnail(name, width, image_format)
+
+
+def make_thumbnails(name, refresh=False):
+    """
+    Создает уменьшенные копии изображения всех размеров из THUMBNAIL_SIZES.
+
+    Отметки о пропущенных размерах читаются из кеша одним запросом.
+
+    :param name: Путь исходного файла относительно MEDIA_ROOT.
+    :param refresh: Не учитывать отметки (файл только что загружен).
+    :return: Словарь {ширина: путь копии} для успешно созданных копий; ширины больше
+        исходного изображения пропускаются, поэтому ``srcset`` не обещает их браузеру.
+    """
+    if not name:
+        return {}
+    image_format = settings.THUMBNAIL_FORMAT.upper()
+    keys = {
+        width: thumbnail_skipped_key(thumbnail_name(name, width, image_format))
+        for width in settings.THUMBNAIL_SIZES
+    }
+    skipped = {} if refresh else cache.get_many(keys.values())
+    thumbnails = {}
+    for width, key in keys.items():
+        if key in skipped:
+            continue
+        thumbnail = create_thumbnail(name, width, image_format)
+        if thumbnail:
+            thumbnails[width] = thumbnail
+    return thumbnails
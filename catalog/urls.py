@@ -1,14 +1,19 @@
+from django.conf import settings
 from django.urls import path
 
 from catalog.apps import CatalogConfig
 from catalog.views import ProductListView, ProductDetailView, ContactsTemplateView, ProductCreateView, \
-    ProductDeleteView, ProductUpdateView
+    ProductDeleteView, ProductUpdateView, SearchView, AsyncProductListView, AsyncProductDetailView
 
 app_name = CatalogConfig.name
 
+if settings.ASYNC_READ_VIEWS:
+    ProductListView, ProductDetailView = AsyncProductListView, AsyncProductDetailView
+
 urlpatterns = [
     path('', ProductListView.as_view(), name='home'),
     path("contact/", ContactsTemplateView.as_view(), name="contacts"),
+    path("search/", SearchView.as_view(), name="search"),
     path("products/<int:pk>/", ProductDetailView.as_view(), name="product_detail"),
     path("products/create/", ProductCreateView.as_view(), name="product_create"),
     path("products/edit/<int:pk>/", ProductUpdateView.as_view(), name="product_edit"),
@@ -1,6 +1,10 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator
+from django.db import IntegrityError, transaction
+from django.db.models import OuterRef, Subquery
 from django.forms import inlineformset_factory
+from django.http import Http404, HttpResponseRedirect
 from django.urls import reverse_lazy
 from django.views.generic import (
     ListView,
@@ -11,26 +15,206 @@ from django.views.generic import (
     UpdateView,
 )
 
+from catalog.async_views import AsyncTemplateView
+from catalog.conditional import AsyncConditionalGetMixin, ConditionalGetMixin
 from catalog.forms import ProductForm, VersionForm, ProductModeratorForm, ProductContentManagerForm
-from catalog.models import Product, ContactsInfo, Version
+from catalog.fragments import aget_product_cards, get_product_cards
+from catalog.models import Product, ContactsInfo, ProductCard, Version
+from catalog.paginators import KeysetPaginationMixin
+from catalog.permissions import (
+    ROLE_CONTENT_MANAGER,
+    ROLE_MODERATOR,
+    ROLE_OWNER,
+    aget_user_role,
+    get_product_role,
+)
+from catalog.projections import PRODUCT_CARD_FIELDS
+from catalog.search import article_index, product_index
+
+
+ACTIVE_VERSION_ERROR = "У продукта не может быть более одной активной версии."
+
+
+def save_versions(formset):
+    """
+    Сохраняет формсет версий продукта.
+
+    Сначала удаляются и деактивируются версии, затем сохраняются активные:
+    иначе замена активной версии за одно сохранение нарушила бы ограничение
+    ``catalog_version_one_active`` на промежуточном шаге.
+
+    :param formset: Проверенный формсет версий.
+    :raises IntegrityError: Если активных версий больше одной.
+    """
+    versions = formset.save(commit=False)
+    for version in formset.deleted_objects:
+        version.delete()
+    for version in sorted(versions, key=lambda version: version.is_active):
+        version.save()
+
+
+def is_active_version_conflict(error):
+    """
+    Проверяет, что ошибка вызвана ограничением ``catalog_version_one_active``.
+
+    PostgreSQL называет нарушенное ограничение, SQLite — таблицу и столбец
+    уникального индекса. Прочие нарушения целостности (внешние ключи, NOT NULL,
+    другие уникальные поля) так не распознаются и должны пробрасываться дальше.
+
+    :param error: ``IntegrityError``.
+    """
+    message = str(error)
+    return "catalog_version_one_active" in message or "catalog_version.product_id" in message
+
+
+def get_product_cards_with_roles(products, user):
+    """
+    Возвращает карточки продуктов вместе с ролью пользователя для каждого продукта.
+
+    :return: Список троек (строка проекции, HTML карточки, роль).
+    """
+    return [
+        (product, card, get_product_role(user, product))
+        for product, card in get_product_cards(products)
+    ]
+
+
+async def aget_product_cards_with_roles(products, user):
+    """
+    Асинхронная версия ``get_product_cards_with_roles``.
+
+    Карточки читаются асинхронным API кеша, а роль пользователя вычисляется
+    заранее через ``aget_user_role``: после этого ``get_product_role`` берет ее
+    с объекта пользователя и не обращается ни к кешу, ни к базе.
+    """
+    await aget_user_role(user)
+    return [
+        (product, card, get_product_role(user, product))
+        for product, card in await aget_product_cards(products)
+    ]
+
+
+def product_validators(pk):
+    """
+    Возвращает запрос данных, от которых зависит страница продукта:
+    время изменения продукта и первичный ключ активной версии.
+    """
+    active_version = Version.objects.filter(product=OuterRef("pk"), is_active=True)
+    return (
+        Product.objects.filter(pk=pk)
+        .annotate(active_version_pk=Subquery(active_version.values("pk")[:1]))
+        .values_list("updated_at", "active_version_pk")
+    )
 
 
-class ProductListView(ListView):
+def product_validator_values(row):
+    """
+    Превращает строку ``product_validators`` в валидаторы условного GET.
+    """
+    if row is None:
+        return None
+    updated_at, version_pk = row
+    return (updated_at.isoformat(), version_pk), updated_at
+
+
+class ProductListView(KeysetPaginationMixin, ListView):
     """
     Представление для отображения списка продуктов.
+
+    Продукты читаются из проекции ``ProductCard`` одним запросом по индексу
+    в виде словарей, без создания моделей. Список разбит на страницы курсорной
+    пагинацией по дате создания, общая часть карточек берется из кеша фрагментов.
     """
 
-    model = Product
-    ordering = ["-created_at"]
+    queryset = ProductCard.objects.values(*PRODUCT_CARD_FIELDS)
+    template_name = "catalog/product_list.html"
+    paginate_by = 12
+    keyset_ordering = "-created_at"
+
+    def get_context_data(self, **kwargs):
+        """
+        Добавляет в контекст закешированную разметку карточек продуктов
+        и роль пользователя для каждого продукта.
+
+        :param kwargs: Дополнительные параметры контекста.
+        :return: Контекст с тройками (продукт, HTML карточки, роль).
+        """
+        context = super().get_context_data(**kwargs)
+        context["product_cards"] = get_product_cards_with_roles(
+            context["object_list"], self.request.user
+        )
+        return context
+
+
+class AsyncProductListView(KeysetPaginationMixin, AsyncTemplateView):
+    """
+    Асинхронная версия ``ProductListView`` для запуска под ASGI.
+
+    Использует тот же шаблон и ту же курсорную пагинацию, записи страницы
+    загружаются асинхронным ORM.
+    """
+
+    template_name = "catalog/product_list.html"
+    paginate_by = 12
+    keyset_ordering = "-created_at"
+
+    async def aget_context_data(self, **kwargs):
+        """
+        Загружает страницу продуктов, карточки и роль пользователя.
+
+        :param kwargs: Дополнительные параметры контекста.
+        :return: Контекст, совпадающий с контекстом ``ProductListView``.
+        """
+        paginator, page, object_list, is_paginated = await self.apaginate_queryset(
+            ProductCard.objects.values(*PRODUCT_CARD_FIELDS), self.paginate_by
+        )
+        product_cards = await aget_product_cards_with_roles(object_list, self.request.user)
+        return self.get_context_data(
+            paginator=paginator,
+            page_obj=page,
+            is_paginated=is_paginated,
+            object_list=object_list,
+            productcard_list=object_list,
+            product_cards=product_cards,
+            **kwargs,
+        )
 
 
-class ProductDetailView(DetailView):
+class ProductDetailView(ConditionalGetMixin, DetailView):
     """
     Представление для отображения деталей продукта.
+
+    Поддерживает условный GET: неизмененная страница не рендерится заново.
     """
 
     model = Product
 
+    def get_validators(self):
+        return product_validator_values(product_validators(self.kwargs["pk"]).first())
+
+
+class AsyncProductDetailView(AsyncConditionalGetMixin, AsyncTemplateView):
+    """
+    Асинхронная версия ``ProductDetailView`` для запуска под ASGI.
+    """
+
+    template_name = "catalog/product_detail.html"
+
+    async def aget_validators(self):
+        return product_validator_values(await product_validators(self.kwargs["pk"]).afirst())
+
+    async def aget_context_data(self, **kwargs):
+        """
+        Загружает продукт по первичному ключу из URL.
+
+        :raises Http404: Если продукт не найден.
+        """
+        try:
+            product = await Product.objects.aget(pk=kwargs["pk"])
+        except Product.DoesNotExist:
+            raise Http404("Продукт не найден")
+        return self.get_context_data(object=product, product=product, **kwargs)
+
 
 class ContactsTemplateView(TemplateView):
     """
@@ -51,6 +235,43 @@ class ContactsTemplateView(TemplateView):
         return context
 
 
+class SearchView(TemplateView):
+    """
+    Представление для полнотекстового поиска по товарам и статьям блога.
+
+    Результаты ранжируются по релевантности и разбиты на страницы.
+    """
+
+    template_name = "catalog/search.html"
+    paginate_by = 12
+    sections = {
+        "products": ("Товары", product_index),
+        "articles": ("Статьи", article_index),
+    }
+
+    def get_context_data(self, **kwargs):
+        """
+        Добавляет в контекст запрос, раздел поиска и страницу результатов.
+
+        :param kwargs: Дополнительные параметры контекста.
+        :return: Обновленный контекст с результатами поиска.
+        """
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get("q", "").strip()
+        section = self.request.GET.get("section")
+        if section not in self.sections:
+            section = "products"
+        _, index = self.sections[section]
+        paginator = Paginator(index.search(query), self.paginate_by)
+        context.update(
+            query=query,
+            section=section,
+            sections={name: title for name, (title, _) in self.sections.items()},
+            page_obj=paginator.get_page(self.request.GET.get("page")),
+        )
+        return context
+
+
 class ProductCreateView(LoginRequiredMixin, CreateView):
     """
     Представление для создания нового продукта.
@@ -88,9 +309,17 @@ class ProductCreateView(LoginRequiredMixin, CreateView):
         context = self.get_context_data()
         formset = context["formset"]
         if formset.is_valid():
-            self.object = form.save()
-            formset.instance = self.object
-            formset.save()
+            try:
+                with transaction.atomic():
+                    self.object = form.save()
+                    formset.instance = self.object
+                    save_versions(formset)
+            except IntegrityError as error:
+                if not is_active_version_conflict(error):
+                    raise
+                self.object = None
+                form.add_error(None, ACTIVE_VERSION_ERROR)
+                return self.form_invalid(form)
         return super().form_valid(form)
 
 
@@ -102,6 +331,11 @@ class ProductUpdateView(LoginRequiredMixin, UpdateView):
     model = Product
     form_class = ProductForm
     success_url = reverse_lazy("catalog:home")
+    role_forms = {
+        ROLE_OWNER: ProductForm,
+        ROLE_MODERATOR: ProductModeratorForm,
+        ROLE_CONTENT_MANAGER: ProductContentManagerForm,
+    }
 
     def get_context_data(self, **kwargs):
         """
@@ -143,12 +377,6 @@ class ProductUpdateView(LoginRequiredMixin, UpdateView):
             if version_form.cleaned_data.get("is_active", False)
         ]
 
-        # Проверка: должно быть не больше одной активной версии
-        if len(active_versions) > 1:
-            form.add_error(
-                None, "У продукта не может быть более одной активной версии."
-            )
-
         # Проверка: если версия активна, у неё должно быть указано название версии
         for version_form in active_versions:
             version_name = version_form.cleaned_data.get("version_name", "").strip()
@@ -163,23 +391,33 @@ class ProductUpdateView(LoginRequiredMixin, UpdateView):
         if form.errors or any(version_form.errors for version_form in formset.forms):
             return self.form_invalid(form)
 
-        # Сохраняем объект и формсет
-        self.object = form.save()
-        formset.instance = self.object
-        formset.save()
+        # Сохраняем объект и формсет. Не больше одной активной версии
+        # гарантирует ограничение catalog_version_one_active в базе данных.
+        try:
+            with transaction.atomic():
+                self.object = form.save()
+                formset.instance = self.object
+                save_versions(formset)
+        except IntegrityError as error:
+            if not is_active_version_conflict(error):
+                raise
+            form.add_error(None, ACTIVE_VERSION_ERROR)
+            return self.form_invalid(form)
 
-        return super().form_valid(form)
+        return HttpResponseRedirect(self.get_success_url())
 
     def get_form_class(self):
-        user = self.request.user
-        if user == self.object.user:
-            return ProductForm
-        if user.has_perm("catalog.set_published") and user.has_perm("catalog.can_edit_description") and user.has_perm(
-                "catalog.can_edit_category"):
-            return ProductModeratorForm
-        if user.has_perm("catalog.set_published"):
-            return ProductContentManagerForm
-        raise PermissionDenied
+        """
+        Возвращает форму, соответствующую роли пользователя.
+
+        Роль вычисляется один раз по закешированному набору прав.
+
+        :raises PermissionDenied: Если у пользователя нет прав на продукт.
+        """
+        form_class = self.role_forms.get(get_product_role(self.request.user, self.object))
+        if form_class is None:
+            raise PermissionDenied
+        return form_class
 
 
 class ProductDeleteView(DeleteView):
@@ -0,0 +1,122 @@
+"""
+Бэкенды кеша со статистикой обращений.
+
+Каждый бэкенд Django дополнен ``StatsCacheMixin``: попадания и промахи
+считаются для всего процесса (по имени кеша) и для текущего запроса
+(``config.instrumentation``), вытеснения — при очистке переполненного
+локального или файлового кеша. Статистика процесса видна на странице
+``/_profiler/`` как показатель ``cache``.
+
+Имя кеша передается в настройках ключом ``STATS_NAME``: экземпляры
+бэкендов Django создаются отдельно для каждого потока и своего имени
+не знают.
+"""
+import random
+import threading
+from collections import Counter, defaultdict
+
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+
+from config import instrumentation
+
+_stats = defaultdict(Counter)
+_stats_lock = threading.Lock()
+_missing = object()
+
+
+def cache_stats():
+    """
+    Возвращает статистику кешей процесса: {имя: {hits, misses, sets, evictions, hit_rate}}.
+    """
+    with _stats_lock:
+        stats = {name: dict(counter) for name, counter in _stats.items()}
+    for counter in stats.values():
+        lookups = counter.get("hits", 0) + counter.get("misses", 0)
+        counter["hit_rate"] = round(counter.get("hits", 0) / lookups, 3) if lookups else None
+    return stats
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+instrumentation.register_gauge("cache", cache_stats)
+
+
+class StatsCacheMixin:
+    """
+    Считает попадания, промахи, записи и вытеснения кеша.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(location, params)
+        self.stats_name = params.get("STATS_NAME", location)
+        # Базовый get_many вызывает get для каждого ключа: их не считаем дважды.
+        self._in_get_many = False
+
+    def record(self, **counts):
+        with _stats_lock:
+            _stats[self.stats_name].update(counts)
+        if "hits" in counts or "misses" in counts:
+            instrumentation.record_cache(counts.get("hits", 0), counts.get("misses", 0))
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _missing, version)
+        if self._in_get_many:
+            return default if value is _missing else value
+        if value is _missing:
+            self.record(misses=1)
+            return default
+        self.record(hits=1)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        self._in_get_many = True
+        try:
+            values = super().get_many(keys, version)
+        finally:
+            self._in_get_many = False
+        self.record(hits=len(values), misses=len(keys) - len(values))
+        return values
+
+    def set(self, key, value, timeout=None, version=None):
+        self.record(sets=1)
+        return super().set(key, value, timeout, version)
+
+    def set_many(self, data, timeout=None, version=None):
+        self.record(sets=len(data))
+        return super().set_many(data, timeout, version)
+
+
+class StatsLocMemCache(StatsCacheMixin, LocMemCache):
+    def _cull(self):
+        size = len(self._cache)
+        super()._cull()
+        self.record(evictions=size - len(self._cache))
+
+
+class StatsFileBasedCache(StatsCacheMixin, FileBasedCache):
+    def _cull(self):
+        # Повторяет FileBasedCache._cull: он вызывается при каждой записи,
+        # и лишний обход каталога ради подсчета был бы заметен.
+        filelist = self._list_cache_files()
+        if len(filelist) < self._max_entries:
+            return
+        if self._cull_frequency == 0:
+            self.record(evictions=len(filelist))
+            return self.clear()
+        filelist = random.sample(filelist, int(len(filelist) / self._cull_frequency))
+        for fname in filelist:
+            self._delete(fname)
+        self.record(evictions=len(filelist))
+
+
+class StatsRedisCache(StatsCacheMixin, RedisCache):
+    """
+    Redis вытесняет ключи сам, поэтому вытеснения здесь не считаются
+    (см. ``evicted_keys`` в ``INFO stats``).
+    """
@@ -0,0 +1,129 @@
+import threading
+
+from django.db.backends.postgresql import base, creation
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from config import instrumentation
+from config.db_pool.pool import ConnectionPool, PoolTimeout
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+POOL_DEFAULTS = {"MAX_SIZE": 10, "TIMEOUT": 5.0, "MAX_IDLE": 300}
+
+# Статус соединения без открытой транзакции (одинаков в psycopg2 и psycopg 3).
+TRANSACTION_STATUS_IDLE = 0
+
+
+def get_pool(alias, settings_dict):
+    """
+    Возвращает пул соединений процесса для настроек базы данных.
+
+    Пулы различаются и по параметрам подключения: тестовая база данных
+    получает свой пул, а не соединения рабочей.
+    """
+    key = (
+        alias,
+        settings_dict["NAME"],
+        settings_dict["HOST"],
+        settings_dict["PORT"],
+        settings_dict["USER"],
+    )
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            options = {**POOL_DEFAULTS, **settings_dict.get("POOL", {})}
+            pool = _pools[key] = ConnectionPool(
+                max_size=options["MAX_SIZE"],
+                timeout=options["TIMEOUT"],
+                max_idle=options["MAX_IDLE"],
+            )
+            instrumentation.register_gauge(f"db_pool.{alias}", pool.stats)
+        return pool
+
+
+def close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+def close_idle_pools():
+    """
+    Закрывает свободные соединения всех пулов процесса.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_idle(close_quietly)
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Свободные соединения пула к тестовой базе помешали бы DROP DATABASE.
+        close_idle_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Бэкенд PostgreSQL с пулом соединений внутри процесса.
+
+    Django по-прежнему «открывает» и «закрывает» соединение на каждый запрос
+    (используйте ``CONN_MAX_AGE = 0``), но соединение берется из пула
+    и возвращается в него, а не создается заново. Настройки пула задаются
+    ключом ``POOL`` настроек базы данных: ``MAX_SIZE``, ``TIMEOUT``
+    (ожидание свободного соединения, с) и ``MAX_IDLE`` (после такого простоя
+    соединение проверяется перед выдачей, с).
+    """
+
+    creation_class = DatabaseCreation
+
+    @property
+    def pool(self):
+        return get_pool(self.alias, self.settings_dict)
+
+    def check_pooled(self, connection):
+        """
+        Проверяет простаивавшее соединение перед выдачей из пула.
+        """
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except self.Database.Error:
+            return False
+
+    def get_new_connection(self, conn_params):
+        try:
+            connection = self.pool.acquire(
+                lambda: super(DatabaseWrapper, self).get_new_connection(conn_params),
+                check=self.check_pooled,
+                close=close_quietly,
+            )
+        except PoolTimeout as error:
+            raise self.Database.OperationalError(str(error)) from error
+        # Для новых соединений это делает базовый класс, для взятых из пула — нет.
+        options = self.settings_dict["OPTIONS"]
+        self.isolation_level = IsolationLevel(
+            options.get("isolation_level", IsolationLevel.READ_COMMITTED)
+        )
+        return connection
+
+    def _close(self):
+        """
+        Возвращает соединение в пул вместо закрытия.
+
+        Незавершенная транзакция откатывается, сломанное соединение закрывается.
+        """
+        if self.connection is None:
+            return
+        connection = self.connection
+        discard = bool(connection.closed)
+        if not discard and connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            try:
+                connection.rollback()
+            except self.Database.Error:
+                discard = True
+        self.pool.release(connection, discard=discard, close=close_quietly)
@@ -0,0 +1,152 @@
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    """
+    Свободное соединение не появилось за время ожидания.
+    """
+
+
+class ConnectionPool:
+    """
+    Пул соединений с базой данных внутри процесса.
+
+    Открытых соединений (выданных и свободных) не больше ``max_size``.
+    Если все заняты, запрос ждет освобождения соединения до ``timeout``
+    секунд. Соединение, простаивавшее дольше ``max_idle`` секунд, перед
+    выдачей проверяется функцией ``check``.
+
+    Пул не знает, как открывать и закрывать соединения: это передает
+    бэкенд базы данных (см. ``config.db_pool.base``).
+    """
+
+    def __init__(self, max_size=10, timeout=5.0, max_idle=300):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._idle = deque()
+        self._condition = threading.Condition()
+        self._started = time.monotonic()
+        self.checked_out = 0
+        self.created = 0
+        self.discarded = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.timeouts = 0
+
+    def _take(self):
+        """
+        Резервирует место в пуле: возвращает свободное соединение или None,
+        если можно открыть новое.
+
+        :return: Кортеж (соединение или None, время освобождения).
+        :raises PoolTimeout: Если место не освободилось за ``timeout``.
+        """
+        started = time.monotonic()
+        waited = False
+        with self._condition:
+            while True:
+                if self._idle:
+                    self.checked_out += 1
+                    connection, released_at = self._idle.pop()
+                    break
+                if self.checked_out < self.max_size:
+                    self.checked_out += 1
+                    connection, released_at = None, None
+                    break
+                remaining = self.timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise PoolTimeout(
+                        f"Нет свободного соединения за {self.timeout} с (размер пула {self.max_size})"
+                    )
+                if not waited:
+                    waited = True
+                    self.waits += 1
+                self._condition.wait(remaining)
+            if waited:
+                self.wait_time += time.monotonic() - started
+        return connection, released_at
+
+    def _give_back(self):
+        with self._condition:
+            self.checked_out -= 1
+            self._condition.notify()
+
+    def acquire(self, connect, check=None, close=None):
+        """
+        Выдает соединение из пула или открывает новое.
+
+        :param connect: Функция, открывающая новое соединение.
+        :param check: Функция проверки простаивавшего соединения, возвращает bool.
+        :param close: Функция закрытия непригодного соединения.
+        :return: Соединение.
+        :raises PoolTimeout: Если свободное соединение не появилось за ``timeout``.
+        """
+        while True:
+            connection, released_at = self._take()
+            try:
+                if connection is None:
+                    connection = connect()
+                    with self._condition:
+                        self.created += 1
+                    return connection
+                idle = time.monotonic() - released_at
+                if check is None or idle < self.max_idle or check(connection):
+                    return connection
+            except BaseException:
+                self._give_back()
+                raise
+            # Соединение не прошло проверку: закрываем и пробуем следующее.
+            self._give_back()
+            with self._condition:
+                self.discarded += 1
+            if close is not None:
+                close(connection)
+
+    def release(self, connection, discard=False, close=None):
+        """
+        Возвращает соединение в пул.
+
+        :param connection: Выданное пулом соединение.
+        :param discard: Закрыть соединение вместо возврата (оно сломано).
+        :param close: Функция закрытия соединения.
+        """
+        with self._condition:
+            self.checked_out -= 1
+            if discard:
+                self.discarded += 1
+            else:
+                self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+        if discard and close is not None:
+            close(connection)
+
+    def close_idle(self, close):
+        """
+        Закрывает все свободные соединения, например при завершении процесса.
+        """
+        with self._condition:
+            idle, self._idle = self._idle, deque()
+        for connection, _ in idle:
+            close(connection)
+
+    def stats(self):
+        """
+        Возвращает показатели пула для ``config.instrumentation``.
+        """
+        with self._condition:
+            uptime = time.monotonic() - self._started
+            return {
+                "max_size": self.max_size,
+                "checked_out": self.checked_out,
+                "idle": len(self._idle),
+                "created": self.created,
+                "created_per_minute": round(self.created / uptime * 60, 2) if uptime else 0,
+                "discarded": self.discarded,
+                "waits": self.waits,
+                "wait_ms": round(self.wait_time * 1000, 2),
+                "timeouts": self.timeouts,
+            }
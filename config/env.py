@@ -0,0 +1,93 @@
+"""
+Чтение переменных окружения для настроек с проверкой и приведением типов.
+
+Неверное значение или отсутствие обязательной переменной останавливает
+запуск с ``ImproperlyConfigured`` и именем переменной в сообщении, а не
+с ``TypeError`` где-то в середине файла настроек. Переменная без значения
+по умолчанию обязательна.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+REQUIRED = object()
+
+TRUE_VALUES = {"true", "1", "yes", "on"}
+FALSE_VALUES = {"false", "0", "no", "off"}
+
+
+def env_str(name, default=REQUIRED):
+    """
+    Возвращает строковое значение переменной окружения.
+
+    :param name: Имя переменной.
+    :param default: Значение, если переменная не задана; без него переменная обязательна.
+    :raises ImproperlyConfigured: Если обязательная переменная не задана.
+    """
+    value = os.environ.get(name)
+    if value is None:
+        if default is REQUIRED:
+            raise ImproperlyConfigured(f"Не задана переменная окружения {name}")
+        return default
+    return value
+
+
+def parse(name, default, convert):
+    value = env_str(name, default)
+    if value is default:
+        return default
+    try:
+        return convert(value.strip())
+    except ValueError:
+        raise ImproperlyConfigured(f"Неверное значение переменной окружения {name}: {value!r}")
+
+
+def to_bool(value):
+    if value.lower() in TRUE_VALUES:
+        return True
+    if value.lower() in FALSE_VALUES:
+        return False
+    raise ValueError(value)
+
+
+def to_list(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def env_bool(name, default=REQUIRED):
+    """
+    Возвращает логическое значение: ``True``/``False``, ``1``/``0``,
+    ``yes``/``no`` или ``on``/``off`` без учета регистра.
+    """
+    return parse(name, default, to_bool)
+
+
+def env_int(name, default=REQUIRED):
+    return parse(name, default, int)
+
+
+def env_float(name, default=REQUIRED):
+    return parse(name, default, float)
+
+
+def env_list(name, default=REQUIRED):
+    """
+    Возвращает список из значения через запятую; пустые элементы отбрасываются.
+    """
+    return parse(name, default, to_list)
+
+
+def env_choice(name, choices, default=REQUIRED):
+    """
+    Возвращает значение переменной, допустимое для ``choices``.
+
+    :param choices: Допустимые значения (например, ключи словаря).
+    :raises ImproperlyConfigured: Если значение не из ``choices``.
+    """
+    value = env_str(name, default)
+    if value not in choices:
+        raise ImproperlyConfigured(
+            f"Неверное значение переменной окружения {name}: {value!r}, "
+            f"допустимо: {', '.join(choices)}"
+        )
+    return value
@@ -0,0 +1,82 @@
+"""
+Инструментирование запросов и процесса.
+
+Метрики текущего запроса хранятся в contextvar, поэтому одинаково работают
+в WSGI-потоках и в асинхронных обработчиках ASGI. Подсистемы (кеш, пул
+соединений) сообщают о событиях через функции этого модуля и не зависят
+от того, включено ли профилирование.
+"""
+from contextvars import ContextVar
+
+_current = ContextVar("request_metrics", default=None)
+_gauges = {}
+
+
+class RequestMetrics:
+    """
+    Метрики одного запроса: SQL-запросы, рендеринг шаблонов и обращения к кешу.
+    """
+
+    def __init__(self):
+        self.queries = []
+        self.template_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def query_time(self):
+        return sum(duration for _, duration in self.queries)
+
+
+def start_request():
+    """
+    Начинает сбор метрик запроса.
+
+    :return: Пара (метрики, токен для ``finish_request``).
+    """
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def finish_request(token):
+    """
+    Завершает сбор метрик запроса.
+    """
+    _current.reset(token)
+
+
+def current():
+    """
+    Возвращает метрики текущего запроса или None, если запрос не профилируется.
+    """
+    return _current.get()
+
+
+def record_query(sql, duration):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.queries.append((sql, duration))
+
+
+def record_cache(hits=0, misses=0):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.cache_hits += hits
+        metrics.cache_misses += misses
+
+
+def register_gauge(name, callback):
+    """
+    Регистрирует показатель процесса, например состояние пула соединений.
+
+    :param name: Имя показателя.
+    :param callback: Функция без аргументов, возвращающая JSON-совместимое значение.
+    """
+    _gauges[name] = callback
+
+
+def gauges():
+    """
+    Возвращает текущие значения всех зарегистрированных показателей процесса.
+    """
+    return {name: callback() for name, callback in _gauges.items()}
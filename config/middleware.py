@@ -0,0 +1,402 @@
+import json
+import logging
+import mimetypes
+import os
+import random
+import re
+import time
+from collections import Counter, deque
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from config import instrumentation
+
+logger = logging.getLogger("config.profiler")
+
+recent_slow_requests = deque(maxlen=settings.PROFILER_SLOW_REQUESTS_KEPT)
+
+LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+PARAMS_LIST_RE = re.compile(r"\((?:\s*(?:%s|\?)\s*,?)+\)")
+
+
+def normalize_sql(sql):
+    """
+    Приводит SQL к шаблону без значений, чтобы находить повторяющиеся запросы.
+
+    Литералы заменяются на ``?``, списки параметров ``IN (%s, %s, ...)`` — на ``(...)``.
+    """
+    return PARAMS_LIST_RE.sub("(...)", LITERAL_RE.sub("?", sql))
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Обертка выполнения SQL (``connection.execute_wrapper``), замеряющая время запроса.
+    """
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        instrumentation.record_query(sql, time.perf_counter() - started)
+
+
+class RequestProfilerMiddleware:
+    """
+    Профилирует запросы: число и время SQL-запросов, время рендеринга шаблонов,
+    обращения к кешу и общее время обработки.
+
+    Подробно профилируется доля запросов PROFILER_SAMPLE_RATE, у остальных
+    замеряется только общее время. Для каждого профилированного запроса
+    пишется JSON-строка в логгер ``config.profiler``; медленные запросы
+    и запросы с повторяющимся SQL (N+1) пишутся с уровнем WARNING
+    и сохраняются для страницы ``/_profiler/``.
+
+    Работает как в синхронном, так и в асинхронном стеке.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        if not self.is_sampled():
+            response = self.get_response(request)
+            self.finish(request, response, started, None)
+            return response
+
+        metrics, token = instrumentation.start_request()
+        try:
+            with self.query_wrappers():
+                response = self.get_response(request)
+        finally:
+            instrumentation.finish_request(token)
+        self.finish(request, response, started, metrics)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        if not self.is_sampled():
+            response = await self.get_response(request)
+            self.finish(request, response, started, None)
+            return response
+
+        metrics, token = instrumentation.start_request()
+        try:
+            with self.query_wrappers():
+                response = await self.get_response(request)
+        finally:
+            instrumentation.finish_request(token)
+        self.finish(request, response, started, metrics)
+        return response
+
+    def is_sampled(self):
+        rate = settings.PROFILER_SAMPLE_RATE
+        return rate >= 1 or random.random() < rate
+
+    def query_wrappers(self):
+        stack = ExitStack()
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(record_query))
+        return stack
+
+    def process_template_response(self, request, response):
+        """
+        Замеряет время рендеринга ``TemplateResponse``.
+        """
+        metrics = instrumentation.current()
+        if metrics is not None:
+            started = time.perf_counter()
+
+            def rendered(response):
+                metrics.template_time += time.perf_counter() - started
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    def finish(self, request, response, started, metrics):
+        """
+        Пишет запись о запросе в лог и запоминает медленные запросы.
+
+        :param metrics: Метрики запроса или None, если запрос не попал в выборку.
+        """
+        total_ms = (time.perf_counter() - started) * 1000
+        slow = total_ms >= settings.PROFILER_SLOW_REQUEST_MS
+        if metrics is None and not slow:
+            return
+
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round(total_ms, 2),
+            "sampled": metrics is not None,
+        }
+        duplicates = []
+        if metrics is not None:
+            counts = Counter(normalize_sql(sql) for sql, _ in metrics.queries)
+            duplicates = [
+                {"sql": sql, "count": count}
+                for sql, count in counts.most_common()
+                if count >= settings.PROFILER_DUPLICATE_THRESHOLD
+            ]
+            record.update(
+                queries=len(metrics.queries),
+                query_ms=round(metrics.query_time * 1000, 2),
+                template_ms=round(metrics.template_time * 1000, 2),
+                cache_hits=metrics.cache_hits,
+                cache_misses=metrics.cache_misses,
+                duplicates=duplicates,
+            )
+
+        if slow:
+            recent_slow_requests.appendleft({"time": timezone.now().isoformat(), **record})
+        level = logging.WARNING if slow or duplicates else logging.INFO
+        logger.log(level, json.dumps(record, ensure_ascii=False))
+
+
+class ReadOnlySessionMiddleware(SessionMiddleware):
+    """
+    ``SessionMiddleware``, не сохраняющий сессии анонимных посетителей
+    на страницах только для чтения.
+
+    Для GET- и HEAD-запросов к представлениям из SESSION_READ_ONLY_VIEWS
+    сессия без авторизованного пользователя не создается, даже если
+    представление или шаблон ее изменили, и не пересохраняется без изменений
+    (SESSION_SAVE_EVERY_REQUEST). Изменения уже существующей анонимной
+    сессии (например, прочитанные сообщения) сохраняются. Авторизованные
+    пользователи и остальные запросы обрабатываются как обычно.
+    """
+
+    def is_read_only(self, request):
+        match = getattr(request, "resolver_match", None)
+        return (
+            request.method in ("GET", "HEAD")
+            and match is not None
+            and match.view_name in settings.SESSION_READ_ONLY_VIEWS
+        )
+
+    def process_response(self, request, response):
+        session = request.session
+        # К сессии не обращались — сохранять нечего, решает SessionMiddleware.
+        if not session.accessed or SESSION_KEY in session or not self.is_read_only(request):
+            return super().process_response(request, response)
+        is_new = settings.SESSION_COOKIE_NAME not in request.COOKIES
+        if is_new or not session.modified:
+            patch_vary_headers(response, ("Cookie",))
+            return response
+        return super().process_response(request, response)
+
+
+class StaticFile:
+    """
+    Собранный статический файл и его сжатые копии.
+    """
+
+    # Порядок предпочтения кодировок, если клиент принимает несколько.
+    encodings = (("br", ".br"), ("gzip", ".gz"))
+
+    def __init__(self, path, immutable):
+        self.path = path
+        self.immutable = immutable
+        self.mtime = int(os.stat(path).st_mtime)
+        self.content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        self.variants = {
+            encoding: path + suffix
+            for encoding, suffix in self.encodings
+            if os.path.isfile(path + suffix)
+        }
+
+    def choose(self, accept_encoding):
+        """
+        Выбирает сжатую копию по заголовку Accept-Encoding.
+
+        Учитываются веса ``q``: кодировка с ``q=0`` не отдается, копия
+        выбирается с наибольшим весом, при равных весах — в порядке
+        ``encodings``. Несжатый файл отдается, если подходящей копии нет
+        или клиент указал для ``identity`` вес выше, чем у копий.
+
+        :return: Кортеж (кодировка или None, путь файла).
+        """
+        weights = parse_accept_encoding(accept_encoding)
+        default = weights.get("*", 0.0)
+        candidates = [
+            (weights.get(encoding, default), encoding, path)
+            for encoding, path in self.variants.items()
+        ]
+        candidates = [candidate for candidate in candidates if candidate[0] > 0]
+        if not candidates:
+            return None, self.path
+        # max возвращает первый из равных, то есть более предпочтительную кодировку.
+        weight, encoding, path = max(candidates, key=lambda candidate: candidate[0])
+        if weights.get("identity", default) > weight:
+            return None, self.path
+        return encoding, path
+
+
+def parse_accept_encoding(header):
+    """
+    Разбирает заголовок Accept-Encoding.
+
+    :param header: Значение заголовка, например ``br;q=0, gzip``.
+    :return: Словарь {кодировка в нижнем регистре: вес от 0 до 1}; вес
+        без параметра ``q`` равен 1, неверный вес считается нулевым.
+    """
+    weights = {}
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = min(max(float(value), 0.0), 1.0)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+    return weights
+
+
+def read_file(path):
+    with open(path, "rb") as file:
+        return file.read()
+
+
+class StaticFilesMiddleware:
+    """
+    Отдает собранную статику из STATIC_ROOT без участия представлений.
+
+    Список файлов составляется один раз при запуске, поэтому запросы
+    к статике не обращаются к файловой системе за поиском. Клиенту,
+    который принимает brotli или gzip, отдается заранее сжатая копия
+    (см. ``config.staticfiles``). Файлы с хешем в имени (из манифеста
+    ``staticfiles.json``) кешируются браузером и прокси на год как
+    неизменяемые, остальные — на STATIC_MAX_AGE секунд.
+
+    Не используется, пока статика не собрана командой ``collectstatic``.
+    Должен стоять в начале MIDDLEWARE, чтобы запросы к статике не проходили
+    через сессии и авторизацию. Работает как в синхронном, так и
+    в асинхронном стеке.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    immutable_max_age = 60 * 60 * 24 * 365
+
+    def __init__(self, get_response):
+        root = settings.STATIC_ROOT
+        if not root or not os.path.isdir(root):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.prefix = "/" + settings.STATIC_URL.lstrip("/")
+        self.files = self.scan(root)
+
+    @staticmethod
+    def scan(root):
+        """
+        Возвращает собранные файлы по их URL относительно STATIC_URL.
+        """
+        hashed = set()
+        manifest = os.path.join(root, "staticfiles.json")
+        if os.path.isfile(manifest):
+            with open(manifest, encoding="utf-8") as file:
+                hashed.update(json.load(file).get("paths", {}).values())
+
+        files = {}
+        for directory, _, names in os.walk(root):
+            for name in names:
+                if name.endswith((".gz", ".br")) or name == "staticfiles.json":
+                    continue
+                path = os.path.join(directory, name)
+                url = os.path.relpath(path, root).replace(os.sep, "/")
+                files[url] = StaticFile(path, url in hashed)
+        return files
+
+    def find(self, request):
+        if request.method not in ("GET", "HEAD") or not request.path.startswith(self.prefix):
+            return None
+        return self.files.get(request.path[len(self.prefix):])
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        static_file = self.find(request)
+        if static_file is None:
+            return self.get_response(request)
+        return self.serve(request, static_file)
+
+    async def __acall__(self, request):
+        static_file = self.find(request)
+        if static_file is None:
+            return await self.get_response(request)
+        return await self.aserve(request, static_file)
+
+    def serve(self, request, static_file):
+        """
+        Возвращает ответ с файлом или 304, если копия клиента не устарела.
+        """
+        if not was_modified_since(request.META.get("HTTP_IF_MODIFIED_SINCE"), static_file.mtime):
+            return self.finish(HttpResponseNotModified(), static_file, None)
+        encoding, path = static_file.choose(request.headers.get("Accept-Encoding", ""))
+        response = FileResponse(open(path, "rb"), content_type=static_file.content_type)
+        # FileResponse подставляет имя сжатой копии, браузеру оно не нужно.
+        del response.headers["Content-Disposition"]
+        return self.finish(response, static_file, encoding)
+
+    async def aserve(self, request, static_file):
+        """
+        Асинхронная версия ``serve``.
+
+        ``FileResponse`` с синхронным файлом под ASGI читается целиком через
+        ``sync_to_async(list)`` с предупреждением на каждый запрос. Собранная
+        статика невелика, поэтому файл читается целиком за один переход в пул
+        потоков и отдается обычным ``HttpResponse``.
+        """
+        if not was_modified_since(request.META.get("HTTP_IF_MODIFIED_SINCE"), static_file.mtime):
+            return self.finish(HttpResponseNotModified(), static_file, None)
+        encoding, path = static_file.choose(request.headers.get("Accept-Encoding", ""))
+        content = await sync_to_async(read_file)(path)
+        response = HttpResponse(content, content_type=static_file.content_type)
+        response.headers["Content-Length"] = str(len(content))
+        return self.finish(response, static_file, encoding)
+
+    def finish(self, response, static_file, encoding):
+        """
+        Добавляет к ответу заголовки кодировки и кеширования.
+        """
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        response.headers["Last-Modified"] = http_date(static_file.mtime)
+        if static_file.immutable:
+            response.headers["Cache-Control"] = (
+                f"public, max-age={self.immutable_max_age}, immutable"
+            )
+        else:
+            response.headers["Cache-Control"] = f"public, max-age={settings.STATIC_MAX_AGE}"
+        if static_file.variants:
+            patch_vary_headers(response, ("Accept-Encoding",))
+        return response
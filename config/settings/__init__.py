@@ -0,0 +1,12 @@
+"""
+Профили настроек проекта:
+
+- ``config.settings.dev`` — разработка (по умолчанию в manage.py):
+  переменные читаются из файла ``.env``, DEBUG включен;
+- ``config.settings.prod`` — рабочее окружение (по умолчанию в wsgi и asgi):
+  только переменные окружения, DEBUG выключен, SECRET_KEY и ALLOWED_HOSTS
+  обязательны;
+- ``config.settings.bench`` — замеры производительности (``run_benchmarks``).
+
+Профиль выбирается переменной DJANGO_SETTINGS_MODULE или параметром ``--settings``.
+"""
@@ -0,0 +1,336 @@
+"""
+Общие настройки проекта для всех профилей (dev, prod, bench).
+
+Значения читаются из переменных окружения функциями config.env; профиль
+задает свои значения по умолчанию через os.environ.setdefault до импорта
+этого модуля, поэтому зависящие от них настройки (например, STATIC_PIPELINE
+от DEBUG) вычисляются согласованно.
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/4.2/ref/settings/
+"""
+import os
+from pathlib import Path
+
+from config.env import env_bool, env_choice, env_float, env_int, env_list, env_str
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+SECRET_KEY = env_str('SECRET_KEY')
+
+# При DEBUG=True Django хранит все SQL-запросы в connection.queries
+# и показывает страницы отладки, поэтому по умолчанию он выключен.
+DEBUG = env_bool('DEBUG', False)
+
+ALLOWED_HOSTS = env_list('ALLOWED_HOSTS', [])
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+
+    'catalog',
+    'blog',
+    'users',
+    'benchmarks',
+]
+
+MIDDLEWARE = [
+    'config.middleware.RequestProfilerMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'config.middleware.StaticFilesMiddleware',
+    'config.middleware.ReadOnlySessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'config.urls'
+
+# Загрузчики шаблонов. С TEMPLATE_CACHE=True (по умолчанию) шаблон компилируется
+# один раз на процесс (cached.Loader): повторные рендеры, включая вложенные
+# inc_menu.html и inc_footer.html, не ищут и не читают файлы на диске.
+# TEMPLATE_CACHE=False — шаблоны перечитываются при каждом рендере (правка без
+# перезапуска сервера, отличного от runserver). Замер — run_benchmarks --template-items.
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+TEMPLATE_CACHE = env_bool('TEMPLATE_CACHE', True)
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [],
+        'OPTIONS': {
+            'loaders': (
+                [('django.template.loaders.cached.Loader', TEMPLATE_LOADERS)]
+                if TEMPLATE_CACHE
+                else TEMPLATE_LOADERS
+            ),
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'config.wsgi.application'
+
+# Соединения с базой данных. По умолчанию соединение живет DB_CONN_MAX_AGE
+# секунд и проверяется перед повторным использованием. С DB_POOL=True
+# соединения берутся из пула процесса (config.db_pool) и возвращаются в него
+# после каждого запроса; показатели пула видны на странице /_profiler/.
+DB_POOL = env_bool('DB_POOL', False)
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'config.db_pool' if DB_POOL else 'django.db.backends.postgresql',
+        "NAME": env_str("DB_NAME", None),
+        "USER": env_str("DB_USER", None),
+        "PASSWORD": env_str("DB_PASSWORD", None),
+        "HOST": env_str("DB_HOST", "localhost"),
+        "PORT": env_int("DB_PORT", 5432),
+        'CONN_MAX_AGE': 0 if DB_POOL else env_int('DB_CONN_MAX_AGE', 60),
+        'CONN_HEALTH_CHECKS': env_bool('DB_CONN_HEALTH_CHECKS', True),
+        'POOL': {
+            'MAX_SIZE': env_int('DB_POOL_MAX_SIZE', 10),
+            'TIMEOUT': env_float('DB_POOL_TIMEOUT', 5.0),
+            'MAX_IDLE': env_int('DB_POOL_MAX_IDLE', 300),
+        },
+    }
+}
+
+# Хеширование паролей: PASSWORD_HASHER_PROFILE=fast ставит первым быстрый
+# MD5PasswordHasher — только для тестов и замеров, где PBKDF2 на каждого
+# создаваемого пользователя занимает большую часть времени. Остальные
+# алгоритмы остаются в списке, поэтому существующие хеши по-прежнему проверяются.
+PASSWORD_HASHER_PROFILES = {
+    'default': [
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+        'django.contrib.auth.hashers.Argon2PasswordHasher',
+        'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+        'django.contrib.auth.hashers.ScryptPasswordHasher',
+    ],
+}
+PASSWORD_HASHER_PROFILES['fast'] = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+    *PASSWORD_HASHER_PROFILES['default'],
+]
+PASSWORD_HASHERS = PASSWORD_HASHER_PROFILES[
+    env_choice('PASSWORD_HASHER_PROFILE', PASSWORD_HASHER_PROFILES, 'default')
+]
+# Команда provision_users отказывается создавать пользователей с быстрым
+# хешем вне профилей, где он разрешен явно (bench, тесты).
+PASSWORD_HASHER_FAST_ALLOWED = False
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+LANGUAGE_CODE = 'en-us'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_TZ = True
+
+STATIC_URL = 'static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+STATICFILES_DIRS = [
+    # Здесь вы можете добавить пути к вашим статическим файлам,
+    # если они располагаются вне приложений
+    os.path.join(BASE_DIR, 'static')
+]
+
+# Сборка статики (config.staticfiles): collectstatic минифицирует CSS, добавляет
+# к именам файлов хеш содержимого и создает сжатые копии .gz и .br (если
+# установлен brotli). Включена, когда DEBUG выключен, или при STATIC_PIPELINE=True.
+# Собранную статику отдает config.middleware.StaticFilesMiddleware: файлы с хешем
+# кешируются на год, остальные — на STATIC_MAX_AGE секунд.
+STATIC_PIPELINE = env_bool('STATIC_PIPELINE', not DEBUG)
+STATIC_MAX_AGE = env_int('STATIC_MAX_AGE', 60)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'config.staticfiles.PipelineStaticFilesStorage'
+            if STATIC_PIPELINE
+            else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+MEDIA_URL = '/media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Уменьшенные копии загруженных изображений (MEDIA_ROOT/thumbs)
+THUMBNAIL_SIZES = (320, 640)
+THUMBNAIL_FORMAT = 'WEBP'
+THUMBNAIL_QUALITY = 80
+# Сколько секунд помнить, что копию создать нельзя (изображение уже нужной
+# ширины, файла нет или он поврежден), чтобы не открывать файл при каждом рендере.
+THUMBNAIL_SKIPPED_TIMEOUT = 60 * 60
+
+AUTH_USER_MODEL = 'users.User'
+
+LOGIN_REDIRECT_URL = '/'
+LOGOUT_REDIRECT_URL = '/'
+
+# Профилирование запросов (config.middleware.RequestProfilerMiddleware).
+# Подробно профилируется доля PROFILER_SAMPLE_RATE запросов; медленные
+# запросы и запросы с повторяющимся SQL пишутся в лог всегда.
+PROFILER_SAMPLE_RATE = env_float('PROFILER_SAMPLE_RATE', 0.1)
+PROFILER_SLOW_REQUEST_MS = env_int('PROFILER_SLOW_REQUEST_MS', 500)
+PROFILER_DUPLICATE_THRESHOLD = 3
+PROFILER_SLOW_REQUESTS_KEPT = 50
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json_line': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'profiler': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'json_line',
+        },
+    },
+    'loggers': {
+        'config.profiler': {
+            'handlers': ['profiler'],
+            'level': env_str('PROFILER_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
+    },
+}
+
+# Кеши: default — фрагменты страниц и роли, sessions — сессии, counters —
+# счетчики просмотров. Бэкенд и расположение каждого кеша задаются
+# переменными CACHE_<ИМЯ>_BACKEND (locmem, file, redis) и CACHE_<ИМЯ>_LOCATION.
+# Бэкенды из config.cache собирают статистику обращений (страница /_profiler/).
+CACHE_BACKENDS = {
+    'locmem': 'config.cache.StatsLocMemCache',
+    'file': 'config.cache.StatsFileBasedCache',
+    'redis': 'config.cache.StatsRedisCache',
+}
+
+
+def cache_settings(name, backend, location):
+    backend = env_choice(f'CACHE_{name.upper()}_BACKEND', CACHE_BACKENDS, backend)
+    return {
+        'BACKEND': CACHE_BACKENDS[backend],
+        'LOCATION': env_str(f'CACHE_{name.upper()}_LOCATION', location),
+        'KEY_PREFIX': env_str('CACHE_KEY_PREFIX', 'skystore'),
+        'STATS_NAME': name,
+    }
+
+
+CACHES = {
+    'default': cache_settings('default', 'locmem', 'default'),
+    'sessions': cache_settings('sessions', 'file', str(BASE_DIR / 'cache' / 'sessions')),
+    'counters': cache_settings('counters', 'locmem', 'counters'),
+}
+
+# Роли пользователей в каталоге (catalog.permissions): кеш ROLE_CACHE хранит роль
+# между запросами ROLE_CACHE_TIMEOUT секунд, только если он общий для процессов
+# (file, redis). С locmem сброс роли при изменении прав не дошел бы до других
+# процессов, поэтому роль вычисляется заново в каждом запросе.
+ROLE_CACHE = env_choice('ROLE_CACHE', CACHES, 'default')
+ROLE_CACHE_TIMEOUT = env_int('ROLE_CACHE_TIMEOUT', 60)
+
+# Словарь модерации (catalog.moderation): каждый процесс не чаще раза
+# в FORBIDDEN_WORDS_CHECK_INTERVAL секунд сверяет версию словаря с базой,
+# так что правка в админке доходит до всех процессов за это время.
+FORBIDDEN_WORDS_CHECK_INTERVAL = env_float('FORBIDDEN_WORDS_CHECK_INTERVAL', 5)
+
+# Сессии: SESSION_ENGINE — db, cached_db (по умолчанию: чтение из кеша
+# sessions, запись в базу), cache (только кеш, сессии теряются при очистке
+# кеша) или signed_cookies (данные сессии в подписанной cookie, без базы;
+# содержимое видно клиенту). Анонимным посетителям на страницах только для
+# чтения сессия не создается (config.middleware.ReadOnlySessionMiddleware).
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_ENGINE = SESSION_ENGINES[env_choice('SESSION_ENGINE', SESSION_ENGINES, 'cached_db')]
+SESSION_CACHE_ALIAS = 'sessions'
+SESSION_READ_ONLY_VIEWS = (
+    'catalog:home',
+    'catalog:product_detail',
+    'catalog:contacts',
+    'catalog:search',
+    'blog:article_list',
+    'blog:article_detail',
+)
+
+# Счетчик просмотров статей: приросты копятся в кеше и сбрасываются в базу
+# не чаще, чем раз в VIEW_COUNTER_FLUSH_INTERVAL секунд.
+VIEW_COUNTER_CACHE = 'counters'
+VIEW_COUNTER_FLUSH_INTERVAL = 30
+
+# Условный GET страниц товаров и статей: сколько секунд общий прокси или CDN
+# может отдавать анонимным посетителям сохраненную копию без перепроверки.
+CONDITIONAL_GET_SHARED_MAX_AGE = env_int('CONDITIONAL_GET_SHARED_MAX_AGE', 60)
+
+# Асинхронные представления списков и карточек товаров и статей. Включаются
+# при запуске под ASGI-сервером (config.asgi), под WSGI быстрее синхронные.
+ASYNC_READ_VIEWS = env_bool('ASYNC_READ_VIEWS', False)
+
+# Email
+
+EMAIL_USE_TLS = env_bool('EMAIL_USE_TLS', False)
+
+EMAIL_HOST = env_str('EMAIL_HOST', 'localhost')
+EMAIL_PORT = env_int('EMAIL_PORT', 25)
+EMAIL_HOST_USER = env_str('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = env_str('EMAIL_HOST_PASSWORD', '')
+
+# Без EMAIL_HOST_USER остаются адреса Django по умолчанию.
+DEFAULT_FROM_EMAIL = EMAIL_HOST_USER or 'webmaster@localhost'
+SERVER_EMAIL = EMAIL_HOST_USER or 'root@localhost'
+EMAIL_ADMIN = EMAIL_HOST_USER
+
+# Подтверждение почты (users.verification): ссылка из письма действует
+# EMAIL_VERIFICATION_TTL секунд, после этого неподтвержденные учетные записи
+# удаляет команда cleanup_unverified.
+EMAIL_VERIFICATION_TTL = env_int('EMAIL_VERIFICATION_TTL', 60 * 60 * 24 * 3)
+
+# Очередь писем (users.outbox): письма отправляет команда send_outbox,
+# неотправленные повторяются с паузой от OUTBOX_RETRY_DELAY до
+# OUTBOX_RETRY_MAX_DELAY секунд, не более OUTBOX_MAX_ATTEMPTS раз.
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_DELAY = 60
+OUTBOX_RETRY_MAX_DELAY = 60 * 60
+# Письма пакета закрепляются за обработчиком на OUTBOX_CLAIM_TIMEOUT секунд:
+# если он упадет во время отправки, письма возьмет другой обработчик.
+OUTBOX_CLAIM_TIMEOUT = 5 * 60
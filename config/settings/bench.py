@@ -0,0 +1,24 @@
+"""
+Настройки для замеров производительности (``run_benchmarks``).
+
+Как в рабочем окружении: DEBUG выключен, шаблоны кешируются, статика
+собирается конвейером. Выборочное профилирование запросов отключено,
+чтобы не искажать замеры, а пароли создаваемых пользователей хешируются
+быстрым профилем (с ним разрешено запускать и ``provision_users``).
+Подключение к базе берется из ``.env``.
+"""
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+os.environ.setdefault('DEBUG', 'False')
+os.environ.setdefault('SECRET_KEY', 'django-insecure-benchmarks')
+os.environ.setdefault('ALLOWED_HOSTS', 'localhost,127.0.0.1,testserver')
+os.environ.setdefault('PASSWORD_HASHER_PROFILE', 'fast')
+os.environ.setdefault('PROFILER_SAMPLE_RATE', '0')
+
+from config.settings.base import *  # noqa: E402,F401,F403
+
+PASSWORD_HASHER_FAST_ALLOWED = True
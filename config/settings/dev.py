@@ -0,0 +1,19 @@
+"""
+Настройки для разработки.
+
+Переменные окружения дополняются из файла ``.env`` (уже заданные
+не перезаписываются), DEBUG по умолчанию включен, а секретный ключ
+можно не задавать.
+"""
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+os.environ.setdefault('DEBUG', 'True')
+os.environ.setdefault(
+    'SECRET_KEY', 'django-insecure-vq6g1!wd@_0&u*ng8+-(krou9qnzqyc1ro_#0@rr)g+w6itz4^'
+)
+
+from config.settings.base import *  # noqa: E402,F401,F403
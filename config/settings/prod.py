@@ -0,0 +1,12 @@
+"""
+Настройки рабочего окружения.
+
+Файл ``.env`` не читается: значения задаются только переменными окружения.
+DEBUG по умолчанию выключен, поэтому SQL-запросы не копятся в
+``connection.queries``. SECRET_KEY и ALLOWED_HOSTS обязательны — без них
+процесс не запустится.
+"""
+from config.env import env_list
+from config.settings.base import *  # noqa: F401,F403
+
+ALLOWED_HOSTS = env_list('ALLOWED_HOSTS')
@@ -0,0 +1,131 @@
+"""
+Конвейер статических файлов для ``collectstatic``.
+
+``PipelineStaticFilesStorage`` при сборке статики:
+
+- минифицирует CSS и убирает из CSS и JS ссылки на source map (карты
+  в статику не попадают, а ``ManifestStaticFilesStorage`` не собрал бы
+  статику со ссылками на отсутствующие файлы);
+- добавляет к именам файлов хеш содержимого и записывает манифест
+  ``staticfiles.json``;
+- создает рядом с каждым текстовым файлом сжатые копии ``.gz``
+  и ``.br`` (если установлен пакет ``brotli``).
+
+Готовые файлы отдает ``config.middleware.StaticFilesMiddleware``.
+"""
+import gzip
+import os
+import re
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # brotli необязателен: без него создаются только копии .gz
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (".css", ".js", ".svg", ".json", ".txt", ".xml", ".html", ".map")
+# Меньшие файлы почти не сжимаются, а заголовки ответа все равно занимают место.
+MIN_COMPRESS_SIZE = 256
+
+STRING = r""""(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'"""
+CSS_TOKEN_RE = re.compile(rf"({STRING})|(/\*.*?\*/)|(\s+)", re.S)
+CSS_PUNCTUATION_RE = re.compile(rf"({STRING})|\s*([{{}};,>])\s*")
+CSS_LAST_SEMICOLON_RE = re.compile(rf"({STRING})|;(?=}})")
+JS_SOURCE_MAP_RE = re.compile(r"(?m)^//# sourceMappingURL=.*$\n?")
+
+
+def minify_css(text):
+    """
+    Минифицирует CSS без изменения смысла.
+
+    Удаляются комментарии (кроме лицензионных ``/*! ... */``), пробелы
+    схлопываются и убираются вокруг ``{ } ; , >``, последняя ``;`` в блоке
+    удаляется. Строки в кавычках не изменяются.
+    """
+    def token(match):
+        string, comment, _ = match.groups()
+        if string:
+            return string
+        if comment:
+            return comment if comment.startswith("/*!") else ""
+        return " "
+
+    text = CSS_TOKEN_RE.sub(token, text)
+    text = CSS_PUNCTUATION_RE.sub(lambda match: match.group(1) or match.group(2), text)
+    text = CSS_LAST_SEMICOLON_RE.sub(lambda match: match.group(1) or "", text)
+    return text.strip()
+
+
+def strip_js_source_map(text):
+    """
+    Убирает из JS ссылку на source map.
+
+    Сам JS не переписывается: безопасная минификация требует полноценного
+    разбора, а поставляемые библиотеки уже собраны в ``*.min.js``.
+    """
+    return JS_SOURCE_MAP_RE.sub("", text)
+
+
+MINIFIERS = {".css": minify_css, ".js": strip_js_source_map}
+
+
+def compress(data):
+    """
+    Возвращает сжатые варианты содержимого файла.
+
+    :param data: Содержимое файла.
+    :return: Словарь {расширение: сжатые данные}; варианты, которые
+        не меньше исходника, не возвращаются.
+    """
+    variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(data, quality=11)
+    return {suffix: value for suffix, value in variants.items() if len(value) < len(data)}
+
+
+class PipelineStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    ``ManifestStaticFilesStorage`` с минификацией и предварительным сжатием.
+    """
+
+    def _save(self, name, content):
+        minify = MINIFIERS.get(os.path.splitext(name)[1])
+        if minify is not None:
+            # chunks() читает с начала файла, даже если его уже прочитали при хешировании.
+            data = b"".join(content.chunks())
+            content = ContentFile(minify(data.decode()).encode())
+        return super()._save(name, content)
+
+    def post_process(self, paths, dry_run=False, **options):
+        # Хеши считаются по уже собранным (минифицированным) копиям,
+        # а не по исходным файлам из STATICFILES_DIRS и приложений.
+        if not dry_run:
+            paths = {name: (self, name) for name in paths}
+        processed_names = set()
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if hashed_name and not isinstance(processed, Exception):
+                processed_names.update((name, hashed_name))
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for name in sorted(processed_names):
+            self.compress_file(name)
+
+    def compress_file(self, name):
+        """
+        Создает сжатые копии файла рядом с ним.
+
+        :param name: Путь файла в хранилище.
+        """
+        if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+            return
+        with self.open(name) as file:
+            data = file.read()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return
+        for suffix, compressed in compress(data).items():
+            if self.exists(name + suffix):
+                self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(compressed))
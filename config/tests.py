@@ -0,0 +1,342 @@
+import gzip
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from io import StringIO
+from unittest import mock
+
+from django.contrib.sessions.models import Session
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.urls import resolve
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from catalog.models import Product
+from config import middleware
+from config.cache import StatsLocMemCache, cache_stats, reset_cache_stats
+from config.db_pool.pool import ConnectionPool, PoolTimeout
+from config.env import env_bool, env_choice, env_int, env_list, env_str
+from config.middleware import (
+    ReadOnlySessionMiddleware,
+    RequestProfilerMiddleware,
+    StaticFile,
+    StaticFilesMiddleware,
+    normalize_sql,
+    parse_accept_encoding,
+)
+from config.staticfiles import minify_css
+from users.models import User
+
+
+@override_settings(PROFILER_SAMPLE_RATE=1.0, PROFILER_SLOW_REQUEST_MS=10_000)
+class RequestProfilerMiddlewareTest(TestCase):
+    """
+    Проверяет профилирование запросов и поиск повторяющегося SQL.
+    """
+
+    def setUp(self):
+        middleware.recent_slow_requests.clear()
+
+    def profile(self, view):
+        request = RequestFactory().get("/products/")
+        with self.assertLogs("config.profiler", level="INFO") as logs:
+            RequestProfilerMiddleware(view)(request)
+        return json.loads(logs.records[-1].getMessage()), logs.records[-1].levelname
+
+    def test_normalize_sql(self):
+        self.assertEqual(
+            normalize_sql('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s) AND "name" = \'x\' LIMIT 21'),
+            'SELECT * FROM "t" WHERE "id" IN (...) AND "name" = ? LIMIT ?',
+        )
+
+    def test_records_queries(self):
+        record, level = self.profile(lambda request: HttpResponse(Product.objects.count()))
+        self.assertEqual((record["queries"], record["duplicates"], level), (1, [], "INFO"))
+
+    def test_flags_repeated_queries(self):
+        products = [
+            Product.objects.create(name=f"Товар {number}", description="Описание")
+            for number in range(4)
+        ]
+
+        def view(request):
+            for product in products:
+                Product.objects.get(pk=product.pk)
+            return HttpResponse()
+
+        record, level = self.profile(view)
+        self.assertEqual(level, "WARNING")
+        self.assertEqual(record["duplicates"][0]["count"], 4)
+
+    def test_counts_cache_hits(self):
+        def view(request):
+            cache = StatsLocMemCache("profiler-test", {"STATS_NAME": "profiler-test"})
+            cache.set("a", 1)
+            cache.get_many(["a", "b"])
+            return HttpResponse()
+
+        record, _ = self.profile(view)
+        self.assertEqual((record["cache_hits"], record["cache_misses"]), (1, 1))
+
+    @override_settings(PROFILER_SLOW_REQUEST_MS=0)
+    def test_slow_requests_page_is_staff_only(self):
+        with self.assertLogs("config.profiler"):
+            response = self.client.get(reverse("profiler"))
+        self.assertEqual(response.status_code, 302)
+
+        staff = User.objects.create(email="staff@example.com", is_staff=True)
+        self.client.force_login(staff)
+        with self.assertLogs("config.profiler"):
+            response = self.client.get(reverse("profiler"))
+        paths = [item["path"] for item in response.json()["slow_requests"]]
+        self.assertIn("/_profiler/", paths)
+
+
+class ConnectionPoolTest(SimpleTestCase):
+    """
+    Проверяет выдачу, возврат и ожидание соединений пула.
+    """
+
+    def test_reuses_connections_and_waits(self):
+        pool = ConnectionPool(max_size=2, timeout=0.05)
+        connect = iter(range(10)).__next__
+        first, second = pool.acquire(connect), pool.acquire(connect)
+        with self.assertRaises(PoolTimeout):
+            pool.acquire(connect)
+
+        threading.Timer(0.01, pool.release, args=[first]).start()
+        pool.timeout = 1
+        self.assertEqual(pool.acquire(connect), first)
+
+        stats = pool.stats()
+        self.assertEqual((stats["created"], stats["checked_out"]), (2, 2))
+        self.assertEqual((stats["waits"], stats["timeouts"]), (2, 1))
+
+    def test_discards_broken_connections(self):
+        pool = ConnectionPool(max_size=1, max_idle=0)
+        closed = []
+        connect = iter(range(10)).__next__
+        pool.release(pool.acquire(connect))
+
+        connection = pool.acquire(connect, check=lambda connection: False, close=closed.append)
+        self.assertEqual((connection, closed), (1, [0]))
+
+        pool.release(connection, discard=True, close=closed.append)
+        self.assertEqual(pool.stats()["discarded"], 2)
+        self.assertEqual(pool.acquire(connect), 2)
+
+
+class CacheStatsTest(SimpleTestCase):
+    """
+    Проверяет статистику обращений к кешу и вытеснений.
+    """
+
+    def setUp(self):
+        reset_cache_stats()
+
+    def test_counts_lookups_and_evictions(self):
+        cache = StatsLocMemCache("stats-test", {
+            "STATS_NAME": "stats-test",
+            "OPTIONS": {"MAX_ENTRIES": 4, "CULL_FREQUENCY": 2},
+        })
+        cache.clear()
+        for number in range(5):
+            cache.set(number, number)
+        cache.get(4)
+        cache.get("missing")
+        cache.get_many([4, "missing"])
+
+        stats = cache_stats()["stats-test"]
+        self.assertEqual((stats["hits"], stats["misses"], stats["sets"]), (2, 2, 5))
+        self.assertEqual(stats["evictions"], 2)
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+
+@override_settings(SESSION_ENGINE="django.contrib.sessions.backends.db")
+class ReadOnlySessionMiddlewareTest(TestCase):
+    """
+    Проверяет, что анонимный просмотр каталога не создает сессий.
+    """
+
+    def request(self, method, path, user=None):
+        def view(request):
+            request.session["seen"] = True
+            return HttpResponse()
+
+        request = getattr(RequestFactory(), method)(path)
+        request.resolver_match = resolve(path)
+        middleware = ReadOnlySessionMiddleware(view)
+        middleware.process_request(request)
+        if user is not None:
+            request.session["_auth_user_id"] = str(user.pk)
+        return middleware.process_response(request, view(request))
+
+    def test_anonymous_read_only_get_creates_no_session(self):
+        response = self.request("get", reverse("catalog:home"))
+        self.assertNotIn("sessionid", response.cookies)
+        self.assertIn("Cookie", response["Vary"])
+        self.assertFalse(Session.objects.exists())
+
+    def test_other_requests_keep_sessions(self):
+        response = self.request("post", reverse("catalog:home"))
+        self.assertIn("sessionid", response.cookies)
+
+        user = User.objects.create(email="reader@example.com")
+        response = self.request("get", reverse("catalog:home"), user=user)
+        self.assertIn("sessionid", response.cookies)
+        self.assertEqual(Session.objects.count(), 2)
+
+
+class StaticPipelineTest(SimpleTestCase):
+    """
+    Проверяет сборку статики с хешами и сжатием и ее раздачу.
+    """
+
+    def test_minify_css(self):
+        css = (
+            '/*! MIT */\na  >  b , c { color: red ; content: "a  ;  b" ; }\n'
+            "/*# sourceMappingURL=a.map */"
+        )
+        self.assertEqual(minify_css(css), '/*! MIT */ a>b,c{color: red;content: "a  ;  b"}')
+
+    def test_collected_files_are_hashed_compressed_and_served(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        storages = {
+            "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+            "staticfiles": {"BACKEND": "config.staticfiles.PipelineStaticFilesStorage"},
+        }
+        with override_settings(STATIC_ROOT=root.name, STORAGES=storages):
+            call_command("collectstatic", interactive=False, verbosity=0, stdout=StringIO())
+            url = staticfiles_storage.url("css/bootstrap.min.css")
+            name = staticfiles_storage.stored_name("css/bootstrap.min.css")
+            with staticfiles_storage.open(name) as file:
+                content = file.read()
+            self.assertNotIn(b"sourceMappingURL", content)
+            self.assertTrue(staticfiles_storage.exists(name + ".gz"))
+
+            middleware = StaticFilesMiddleware(lambda request: HttpResponse("view"))
+            response = middleware(RequestFactory().get(url, HTTP_ACCEPT_ENCODING="gzip, deflate"))
+            self.assertEqual(response["Content-Encoding"], "gzip")
+            self.assertEqual(response["Content-Type"], "text/css")
+            self.assertIn("immutable", response["Cache-Control"])
+            self.assertIn("Accept-Encoding", response["Vary"])
+            self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), content)
+            last_modified = response["Last-Modified"]
+            response.close()
+
+            response = middleware(RequestFactory().get("/static/css/bootstrap.min.css"))
+            self.assertNotIn("Content-Encoding", response)
+            self.assertNotIn("immutable", response["Cache-Control"])
+            response.close()
+
+            response = middleware(
+                RequestFactory().get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+            )
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(middleware(RequestFactory().get("/products/")).content, b"view")
+
+
+    def make_static_root(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        path = os.path.join(root.name, "app.css")
+        for name, content in ((path, b"body{}"), (path + ".gz", gzip.compress(b"body{}"))):
+            with open(name, "wb") as file:
+                file.write(content)
+        with open(path + ".br", "wb") as file:
+            file.write(b"brotli")
+        return root.name, path
+
+    def test_accept_encoding_weights(self):
+        self.assertEqual(
+            parse_accept_encoding("br;q=0, GZIP ; q=0.5,identity;q=bad, *"),
+            {"br": 0.0, "gzip": 0.5, "identity": 0.0, "*": 1.0},
+        )
+        _, path = self.make_static_root()
+        static_file = StaticFile(path, immutable=False)
+        for header, encoding in (
+            ("gzip, br", "br"),
+            ("br;q=0, gzip", "gzip"),
+            ("br;q=0.5, gzip", "gzip"),
+            ("gzip;q=0.5, identity", None),
+            ("*;q=0.1", "br"),
+            ("br;q=0, gzip;q=0", None),
+            ("deflate", None),
+            ("", None),
+        ):
+            self.assertEqual(static_file.choose(header)[0], encoding, header)
+
+    async def test_async_serving_reads_file_without_streaming(self):
+        root, path = self.make_static_root()
+
+        async def get_response(request):
+            return HttpResponse("view")
+
+        with override_settings(STATIC_ROOT=root):
+            middleware = StaticFilesMiddleware(get_response)
+        request = RequestFactory().get("/static/app.css", HTTP_ACCEPT_ENCODING="gzip")
+        response = await middleware(request)
+        self.assertFalse(response.streaming)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), b"body{}")
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+
+
+class EnvSettingsTest(SimpleTestCase):
+    """
+    Проверяет чтение переменных окружения и профили настроек.
+    """
+
+    @mock.patch.dict(os.environ, {"FLAG": "yes", "COUNT": " 5 ", "HOSTS": "a.com, ,b.com"})
+    def test_typed_values(self):
+        self.assertIs(env_bool("FLAG"), True)
+        self.assertIs(env_bool("MISSING_FLAG", False), False)
+        self.assertEqual(env_int("COUNT"), 5)
+        self.assertEqual(env_list("HOSTS"), ["a.com", "b.com"])
+        self.assertIsNone(env_str("MISSING_VALUE", None))
+
+    @mock.patch.dict(os.environ, {"FLAG": "maybe", "COUNT": "five", "ENGINE": "mongo"})
+    def test_invalid_values_name_the_variable(self):
+        for read in (
+            lambda: env_bool("FLAG"),
+            lambda: env_int("COUNT"),
+            lambda: env_choice("ENGINE", ["db", "cache"]),
+            lambda: env_str("MISSING_VALUE"),
+        ):
+            with self.assertRaises(ImproperlyConfigured):
+                read()
+        with self.assertRaisesMessage(ImproperlyConfigured, "COUNT"):
+            env_int("COUNT")
+
+    def run_profile(self, module, code="from {module} import DEBUG; print(DEBUG)", **env):
+        environ = {
+            key: value for key, value in os.environ.items()
+            if key not in ("SECRET_KEY", "ALLOWED_HOSTS", "DEBUG", "DJANGO_SETTINGS_MODULE")
+        }
+        return subprocess.run(
+            [sys.executable, "-c", code.format(module=module)],
+            capture_output=True,
+            text=True,
+            env={**environ, **env},
+        )
+
+    def test_prod_profile_requires_secrets_and_disables_debug(self):
+        result = self.run_profile("config.settings.prod")
+        self.assertIn("SECRET_KEY", result.stderr)
+        result = self.run_profile("config.settings.prod", SECRET_KEY="x", ALLOWED_HOSTS="a.com")
+        self.assertEqual(result.stdout.strip(), "False")
+
+    def test_servers_default_to_prod_profile(self):
+        code = "import {module}; from django.conf import settings; print(settings.SETTINGS_MODULE)"
+        for module in ("config.wsgi", "config.asgi"):
+            result = self.run_profile(module, code)
+            self.assertIn("SECRET_KEY", result.stderr)
+            result = self.run_profile(module, code, SECRET_KEY="x", ALLOWED_HOSTS="a.com")
+            self.assertEqual(result.stdout.strip(), "config.settings.prod", result.stderr)
@@ -19,8 +19,11 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 
+from config.views import profiler
+
 urlpatterns = [
                   path('admin/', admin.site.urls),
+                  path('_profiler/', profiler, name='profiler'),
                   path('', include('catalog.urls', namespace='catalog')),
                   path('blog/', include('blog.urls', namespace='blog')),
                   path('users/', include('users.urls', namespace='users')),
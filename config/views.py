@@ -0,0 +1,21 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+
+from config import instrumentation
+from config.middleware import recent_slow_requests
+
+
+@staff_member_required
+def profiler(request):
+    """
+    Показывает последние медленные запросы этого процесса и показатели процесса.
+
+    Доступно только персоналу.
+    """
+    return JsonResponse(
+        {
+            "slow_requests": list(recent_slow_requests),
+            "gauges": instrumentation.gauges(),
+        },
+        json_dumps_params={"ensure_ascii": False, "indent": 2},
+    )
@@ -1,8 +1,25 @@
 from django.contrib import admin
 
-from users.models import User
+from users.models import EmailVerificationToken, OutboxEmail, User
 
 
 @admin.register(User)
 class UserAdmin(admin.ModelAdmin):
     list_display = ('id', 'email')
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('id', 'subject', 'status', 'attempts', 'send_after', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('subject',)
+    # Текст письма может содержать личные данные; письма со ссылками-секретами
+    # собираются при отправке и в очереди текста не имеют.
+    exclude = ('body',)
+
+
+@admin.register(EmailVerificationToken)
+class EmailVerificationTokenAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'created_at', 'expires_at')
+    search_fields = ('user__email',)
+    raw_id_fields = ('user',)
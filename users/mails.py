@@ -0,0 +1,68 @@
+"""
+Письма, текст которых собирается в момент отправки.
+
+Письмо с секретом (ссылка подтверждения почты или сброса пароля) хранит
+в очереди только имя шаблона и несекретные параметры: пользователя и адрес
+сайта. Токен создается при отправке, попадает только в само письмо и не
+остается ни в таблице очереди, ни в админке.
+"""
+from urllib.parse import urljoin
+
+from django.contrib.auth.tokens import default_token_generator
+from django.urls import reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from users.models import User
+from users.verification import issue_token
+
+
+def email_confirmation_body(context):
+    """
+    Собирает письмо со ссылкой подтверждения почты.
+
+    Токен создается при каждой попытке отправки: в базе остается только его
+    хеш, а срок действия отсчитывается от отправки письма.
+
+    :param context: Словарь с ``user_id`` и ``base_url``.
+    :return: Текст письма.
+    :raises User.DoesNotExist: Если пользователь удален.
+    """
+    user = User.objects.get(pk=context["user_id"])
+    url = urljoin(context["base_url"], reverse("users:email-confirm", args=[issue_token(user)]))
+    return f"Привет, перейди по ссылке, для подтверждения почты {url}"
+
+
+def password_reset_body(context):
+    """
+    Собирает письмо со ссылкой сброса пароля.
+
+    Ссылка одноразовая: токен ``default_token_generator`` зависит от хеша
+    пароля и перестает действовать после его смены.
+
+    :param context: Словарь с ``user_id`` и ``base_url``.
+    :return: Текст письма.
+    :raises User.DoesNotExist: Если пользователь удален.
+    """
+    user = User.objects.get(pk=context["user_id"])
+    uid = urlsafe_base64_encode(force_bytes(user.pk))
+    token = default_token_generator.make_token(user)
+    path = reverse("users:password_reset_confirm", args=[uid, token])
+    return f"Для сброса пароля перейдите по ссылке {urljoin(context['base_url'], path)}"
+
+
+MAIL_TEMPLATES = {
+    "email_confirmation": email_confirmation_body,
+    "password_reset": password_reset_body,
+}
+
+
+def render_body(email):
+    """
+    Возвращает текст письма из очереди: собранный по шаблону или сохраненный.
+
+    :param email: Объект ``OutboxEmail``.
+    """
+    if not email.template:
+        return email.body
+    return MAIL_TEMPLATES[email.template](email.context)
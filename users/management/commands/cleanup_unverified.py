@@ -0,0 +1,32 @@
+import time
+
+from django.core.management import BaseCommand
+
+from users.verification import cleanup
+
+
+class Command(BaseCommand):
+    """
+    Удаляет учетные записи, почту которых не подтвердили до истечения
+    срока ссылки, и просроченные токены подтверждения.
+
+    Записи удаляются пакетами, поэтому команду можно запускать по cron
+    на большой таблице пользователей без долгих блокировок.
+    """
+
+    help = "Удаляет неподтвержденные учетные записи и просроченные токены"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="Записей, удаляемых за один запрос"
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        users, tokens = cleanup(batch_size=options["batch_size"])
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Удалено пользователей: {users}, токенов: {tokens}, время: {elapsed:.2f} с"
+            )
+        )
@@ -5,11 +5,8 @@ from users.models import User
 
 class Command(BaseCommand):
     def handle(self, *args, **kwargs):
-        user = User.objects.create(email="admin@examlpe.com")
+        user = User(email="admin@examlpe.com", is_active=True, is_staff=True, is_superuser=True)
         user.set_password("123qwe")
-        user.is_active = True
-        user.is_staff = True
-        user.is_superuser = True
         user.save()
 
 
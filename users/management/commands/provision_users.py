@@ -0,0 +1,155 @@
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.core.management import BaseCommand, CommandError
+
+from catalog.exchange import FORMATS, detect_format, open_stream, parse_bool
+from users.models import User
+
+PROFILE_FIELDS = ("first_name", "last_name", "phone", "country")
+
+# Быстрые хеши без растяжения ключа: такие пароли подбираются по утекшей базе.
+FAST_HASHERS = {"md5", "unsalted_md5", "sha1", "unsalted_sha1"}
+
+
+def iter_users(file, file_format):
+    """
+    Потоково читает записи пользователей из CSV или JSON Lines.
+
+    :return: Генератор словарей записей.
+    :raises CommandError: Если строка JSON повреждена.
+    """
+    if file_format == "csv":
+        yield from csv.DictReader(file)
+        return
+    for line_number, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as error:
+            raise CommandError(f"строка {line_number}: {error}")
+
+
+class Command(BaseCommand):
+    """
+    Массово создает пользователей из CSV или JSON Lines.
+
+    Записи читаются потоково и обрабатываются пакетами. Для каждого пакета
+    одним запросом отбрасываются уже зарегистрированные адреса, пароли
+    остальных хешируются параллельно в пуле процессов (PBKDF2 занимает
+    процессор, поэтому потоки здесь не помогают), а пользователи вставляются
+    одним ``bulk_create``.
+
+    Колонки: ``email``, ``password``, ``first_name``, ``last_name``, ``phone``,
+    ``country``, ``is_active``. Пользователи без пароля получают
+    неиспользуемый пароль и входят только после сброса.
+
+    С быстрым профилем хеширования (``PASSWORD_HASHER_PROFILE=fast``) команда
+    работает, только если он разрешен настройкой PASSWORD_HASHER_FAST_ALLOWED
+    (профиль ``bench``, тесты): иначе пароли реальных пользователей остались бы
+    в базе в виде MD5.
+    """
+
+    help = "Массово создает пользователей из CSV или JSON Lines"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Файл с пользователями или - для стандартного ввода")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Формат файла (по умолчанию по расширению, иначе jsonl)",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="Количество записей в одном пакете"
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Количество процессов для хеширования (по умолчанию — число ядер)",
+        )
+
+    def build_users(self, batch):
+        """
+        Возвращает несохраненных пользователей пакета, которых еще нет в базе.
+
+        :param batch: Список записей файла.
+        :return: Кортеж (пользователи, открытые пароли в том же порядке).
+        """
+        rows = {}
+        for data in batch:
+            email = User.objects.normalize_email((data.get("email") or "").strip())
+            if email:
+                rows[email] = data
+        existing = set(User.objects.filter(email__in=rows).values_list("email", flat=True))
+        users, passwords = [], []
+        for email, data in rows.items():
+            if email in existing:
+                continue
+            users.append(
+                User(
+                    email=email,
+                    is_active=parse_bool(data.get("is_active", True)),
+                    **{field: data[field] for field in PROFILE_FIELDS if data.get(field)},
+                )
+            )
+            passwords.append(data.get("password") or None)
+        return users, passwords
+
+    def flush(self, batch, executor):
+        started = time.monotonic()
+        users, passwords = self.build_users(batch)
+        # make_password(None) возвращает неиспользуемый пароль без хеширования.
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        hashed = executor.map(make_password, passwords, chunksize=chunksize)
+        for user, password in zip(users, hashed):
+            user.password = password
+        User.objects.bulk_create(users)
+        elapsed = time.monotonic() - started
+        self.created += len(users)
+        self.skipped += len(batch) - len(users)
+        self.stdout.write(
+            f"Пакет: создано {len(users)}, пропущено {len(batch) - len(users)}, "
+            f"{len(batch) / elapsed if elapsed else 0:.0f} строк/с"
+        )
+
+    def handle(self, *args, **options):
+        algorithm = get_hasher().algorithm
+        if algorithm in FAST_HASHERS and not settings.PASSWORD_HASHER_FAST_ALLOWED:
+            raise CommandError(
+                f"Пароли хешируются быстрым алгоритмом {algorithm} (PASSWORD_HASHER_PROFILE=fast): "
+                f"он допустим только в профиле bench и тестах, настройки {settings.SETTINGS_MODULE}"
+            )
+        path = options["path"]
+        batch_size = options["batch_size"]
+        self.workers = max(1, options["workers"])
+        file_format = detect_format(path, options["format"])
+        self.created = self.skipped = 0
+        started = time.monotonic()
+
+        # django.setup нужен процессам, запущенным без fork (macOS, Windows).
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=django.setup) as executor:
+            with open_stream(path, "r") as file:
+                batch = []
+                for data in iter_users(file, file_format):
+                    batch.append(data)
+                    if len(batch) >= batch_size:
+                        self.flush(batch, executor)
+                        batch = []
+                if batch:
+                    self.flush(batch, executor)
+
+        total_time = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Создано {self.created}, пропущено {self.skipped} за {total_time:.2f} с "
+                f"({self.created / total_time if total_time else 0:.0f} пользователей/с)"
+            )
+        )
@@ -0,0 +1,51 @@
+import time
+
+from django.core.management import BaseCommand
+
+from users.outbox import OutboxSender
+
+
+class Command(BaseCommand):
+    """
+    Обработчик очереди писем ``OutboxEmail``.
+
+    Отправляет письма пакетами через одно SMTP-соединение. По умолчанию
+    обрабатывает очередь до конца и завершается (удобно для cron), с ``--loop``
+    работает постоянно, опрашивая очередь раз в ``--interval`` секунд.
+    """
+
+    help = "Отправляет письма из очереди"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100, help="Писем в одном пакете")
+        parser.add_argument("--loop", action="store_true", help="Работать постоянно")
+        parser.add_argument(
+            "--interval", type=float, default=5, help="Пауза между опросами очереди, с"
+        )
+        parser.add_argument(
+            "--max-attempts", type=int, default=None, help="Попыток отправки (по умолчанию OUTBOX_MAX_ATTEMPTS)"
+        )
+
+    def handle(self, *args, **options):
+        sender = OutboxSender(max_attempts=options["max_attempts"])
+        totals = [0, 0, 0]
+        try:
+            while True:
+                counts = sender.send_batch(options["batch_size"])
+                totals = [total + count for total, count in zip(totals, counts)]
+                if sum(counts):
+                    continue
+                if not options["loop"]:
+                    break
+                # Очередь пуста: соединение не держим открытым во время паузы.
+                sender.close()
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            sender.close()
+
+        sent, retried, failed = totals
+        self.stdout.write(
+            self.style.SUCCESS(f"Отправлено: {sent}, отложено: {retried}, не отправлено: {failed}")
+        )
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.2 on 2026-10-18 18:33
+
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.utils import timezone
+
+
+def move_tokens(apps, schema_editor):
+    """
+    Переносит токены неподтвержденных пользователей в новую таблицу.
+
+    Старые ссылки из уже отправленных писем продолжают работать
+    в течение EMAIL_VERIFICATION_TTL после миграции.
+    """
+    User = apps.get_model("users", "User")
+    EmailVerificationToken = apps.get_model("users", "EmailVerificationToken")
+    expires_at = timezone.now() + timedelta(seconds=settings.EMAIL_VERIFICATION_TTL)
+    users = (
+        User.objects.filter(is_active=False, token__isnull=False)
+        .exclude(token="")
+        .values_list("pk", "token")
+    )
+    EmailVerificationToken.objects.bulk_create(
+        (
+            EmailVerificationToken(
+                user_id=pk,
+                digest=hashlib.sha256(token.encode()).hexdigest(),
+                expires_at=expires_at,
+            )
+            for pk, token in users.iterator()
+        ),
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_outboxemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailVerificationToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(max_length=64, unique=True, verbose_name='SHA-256 токена')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Создан')),
+                ('expires_at', models.DateTimeField(db_index=True, verbose_name='Действует до')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='verification_tokens', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'Токен подтверждения почты',
+                'verbose_name_plural': 'Токены подтверждения почты',
+            },
+        ),
+        migrations.RunPython(move_tokens, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='user',
+            name='token',
+        ),
+    ]
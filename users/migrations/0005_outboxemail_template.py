@@ -0,0 +1,35 @@
+# Generated by Django 4.2.2 on 2026-10-18 18:52
+
+from django.db import migrations, models
+
+
+def redact_sent(apps, schema_editor):
+    # Отправленные письма больше не нужны целиком, а могут содержать пароли и ссылки.
+    OutboxEmail = apps.get_model('users', 'OutboxEmail')
+    OutboxEmail.objects.exclude(status='pending').update(body='')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_email_verification_token'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxemail',
+            name='context',
+            field=models.JSONField(blank=True, default=dict, verbose_name='Параметры шаблона'),
+        ),
+        migrations.AddField(
+            model_name='outboxemail',
+            name='template',
+            field=models.CharField(blank=True, max_length=50, verbose_name='Шаблон'),
+        ),
+        migrations.AlterField(
+            model_name='outboxemail',
+            name='body',
+            field=models.TextField(blank=True, verbose_name='Текст'),
+        ),
+        migrations.RunPython(redact_sent, migrations.RunPython.noop),
+    ]
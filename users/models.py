@@ -1,6 +1,8 @@
-from django.contrib.auth.hashers import make_password
+from django.contrib.auth.hashers import identify_hasher
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import Q
+from django.utils import timezone
 
 NULLABLE = {"blank": True, "null": True}
 
@@ -26,16 +28,56 @@ class User(AbstractUser):
         verbose_name="Аватар",
         help_text="Загрузите аватар",
     )
-    token = models.CharField(max_length=100, verbose_name="Token", **NULLABLE)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
 
+    # Значение поля пароля, которое точно не открытый текст: сохраненное
+    # в базе или созданное set_unusable_password.
+    _known_password = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._known_password = instance.__dict__.get("password")
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._known_password = self.__dict__.get("password")
+
+    def set_unusable_password(self):
+        super().set_unusable_password()
+        self._known_password = self.password
+
     def save(self, *args, **kwargs):
-        if 'pbkdf2_sha256' not in self.password:
-            password = make_password(self.password)
-            self.password = password
+        """
+        Хеширует пароль, если он задан открытым текстом.
+
+        Хеши любого алгоритма из PASSWORD_HASHERS и пустой пароль не изменяются,
+        поэтому повторные сохранения не пересчитывают дорогой хеш. Неиспользуемый
+        пароль остается как есть, только если он создан ``set_unusable_password``
+        или прочитан из базы: открытый пароль, который начинается с ``!``,
+        тоже хешируется.
+        """
+        if (
+            self.password
+            and self.password != self._known_password
+            and not self.has_hashed_password()
+        ):
+            self.set_password(self.password)
         super().save(*args, **kwargs)
+        self._known_password = self.password
+
+    def has_hashed_password(self):
+        """
+        Проверяет, что поле пароля содержит хеш известного алгоритма.
+        """
+        try:
+            identify_hasher(self.password).decode(self.password)
+        except (ValueError, TypeError, IndexError):
+            return False
+        return True
 
     class Meta:
         verbose_name = "Пользователь"
@@ -43,3 +85,85 @@ class User(AbstractUser):
 
     def __str__(self):
         return self.email
+
+
+class OutboxEmail(models.Model):
+    """
+    Письмо в очереди на отправку.
+
+    Представления только сохраняют письмо в той же транзакции, что и свои
+    изменения, а отправляет его команда ``send_outbox`` (см. ``users.outbox``).
+
+    Письма со ссылками-секретами хранят только имя шаблона ``template``
+    и несекретные параметры ``context``: текст со ссылкой собирается
+    при отправке (см. ``users.mails``). После отправки текст стирается.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = (
+        (STATUS_PENDING, "Ожидает отправки"),
+        (STATUS_SENT, "Отправлено"),
+        (STATUS_FAILED, "Не отправлено"),
+    )
+
+    subject = models.CharField(max_length=255, verbose_name="Тема")
+    body = models.TextField(blank=True, verbose_name="Текст")
+    template = models.CharField(max_length=50, blank=True, verbose_name="Шаблон")
+    context = models.JSONField(default=dict, blank=True, verbose_name="Параметры шаблона")
+    from_email = models.CharField(max_length=254, verbose_name="Отправитель", **NULLABLE)
+    recipients = models.JSONField(verbose_name="Получатели")
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING, verbose_name="Статус"
+    )
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="Попыток отправки")
+    last_error = models.TextField(blank=True, verbose_name="Последняя ошибка")
+    send_after = models.DateTimeField(default=timezone.now, verbose_name="Отправить после")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Создано")
+    sent_at = models.DateTimeField(verbose_name="Отправлено", **NULLABLE)
+
+    class Meta:
+        verbose_name = "Письмо в очереди"
+        verbose_name_plural = "Очередь писем"
+        indexes = [
+            models.Index(
+                fields=["send_after", "id"],
+                condition=Q(status="pending"),
+                name="users_outbox_pending_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} → {', '.join(self.recipients)}"
+
+
+class EmailVerificationToken(models.Model):
+    """
+    Токен подтверждения почты.
+
+    Хранится только SHA-256 от токена из письма: по уникальному индексу
+    ``digest`` подтверждение находит токен за O(log n), а по строкам этой
+    таблицы ссылку подтверждения не восстановить. Сам токен создается при
+    отправке письма и есть только в нем: в очереди ``OutboxEmail`` ссылка
+    не хранится (см. ``users.mails``). Просроченные токены и так и не
+    подтвержденные учетные записи удаляет команда ``cleanup_unverified``
+    (см. ``users.verification``).
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="verification_tokens",
+        verbose_name="Пользователь",
+    )
+    digest = models.CharField(max_length=64, unique=True, verbose_name="SHA-256 токена")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Создан")
+    expires_at = models.DateTimeField(db_index=True, verbose_name="Действует до")
+
+    class Meta:
+        verbose_name = "Токен подтверждения почты"
+        verbose_name_plural = "Токены подтверждения почты"
+
+    def __str__(self):
+        return f"{self.user} до {self.expires_at:%Y-%m-%d %H:%M}"
@@ -0,0 +1,168 @@
+import smtplib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from users.mails import render_body
+from users.models import OutboxEmail
+
+# Ошибки, после которых соединение с SMTP-сервером нужно открыть заново.
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+def enqueue_mail(subject, message, recipient_list, from_email=None, template="", context=None):
+    """
+    Ставит письмо в очередь на отправку.
+
+    Письмо сохраняется в текущей транзакции: если она откатится,
+    письмо не уйдет. Секреты в ``message`` не передаются: такие письма
+    ставятся с шаблоном из ``users.mails.MAIL_TEMPLATES``, и текст
+    собирается при отправке.
+
+    :param subject: Тема письма.
+    :param message: Текст письма (пустой для письма по шаблону).
+    :param recipient_list: Адреса получателей.
+    :param from_email: Отправитель, по умолчанию DEFAULT_FROM_EMAIL.
+    :param template: Имя шаблона письма.
+    :param context: Несекретные параметры шаблона, сериализуемые в JSON.
+    :return: Созданный объект ``OutboxEmail``.
+    """
+    return OutboxEmail.objects.create(
+        subject=subject,
+        body=message,
+        from_email=from_email,
+        recipients=list(recipient_list),
+        template=template,
+        context=context or {},
+    )
+
+
+def retry_delay(attempts):
+    """
+    Возвращает паузу перед следующей попыткой: экспоненциальный рост
+    от OUTBOX_RETRY_DELAY до OUTBOX_RETRY_MAX_DELAY секунд.
+
+    :param attempts: Количество уже сделанных попыток.
+    """
+    delay = settings.OUTBOX_RETRY_DELAY * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=min(delay, settings.OUTBOX_RETRY_MAX_DELAY))
+
+
+class OutboxSender:
+    """
+    Отправляет письма из очереди пакетами через одно SMTP-соединение.
+
+    Соединение открывается при первой отправке и переиспользуется между
+    пакетами; после обрыва оно открывается заново. Неотправленное письмо
+    откладывается с растущей паузой, после OUTBOX_MAX_ATTEMPTS попыток
+    помечается как неотправленное. Текст отправленного письма стирается.
+    """
+
+    def __init__(self, connection=None, max_attempts=None):
+        self.connection = connection or get_connection()
+        self.max_attempts = max_attempts or settings.OUTBOX_MAX_ATTEMPTS
+        self.is_open = False
+
+    def open(self):
+        if not self.is_open:
+            self.connection.open()
+            self.is_open = True
+
+    def close(self):
+        if self.is_open:
+            try:
+                self.connection.close()
+            finally:
+                self.is_open = False
+
+    def send(self, email):
+        """
+        Отправляет одно письмо через открытое соединение.
+
+        :return: None при успехе или текст ошибки.
+        """
+        try:
+            body = render_body(email)
+        except ObjectDoesNotExist as error:
+            return f"{type(error).__name__}: {error}"
+        message = EmailMessage(
+            subject=email.subject,
+            body=body,
+            from_email=email.from_email,
+            to=email.recipients,
+            connection=self.connection,
+        )
+        try:
+            self.open()
+            message.send()
+        except CONNECTION_ERRORS as error:
+            self.close()
+            return f"{type(error).__name__}: {error}"
+        except (smtplib.SMTPException, OSError) as error:
+            return f"{type(error).__name__}: {error}"
+        return None
+
+    def claim(self, batch_size):
+        """
+        Закрепляет за обработчиком пакет писем, срок отправки которых наступил.
+
+        Письма блокируются (``SELECT ... FOR UPDATE SKIP LOCKED``) только на
+        время короткой транзакции: в ней срок отправки переносится
+        на OUTBOX_CLAIM_TIMEOUT секунд вперед и засчитывается попытка.
+        После фиксации другие обработчики эти письма не видят, а если
+        обработчик упадет, письма снова станут доступны по истечении срока.
+
+        :param batch_size: Максимальный размер пакета.
+        :return: Список закрепленных писем.
+        """
+        with transaction.atomic():
+            emails = list(
+                OutboxEmail.objects.select_for_update(skip_locked=True)
+                .filter(status=OutboxEmail.STATUS_PENDING, send_after__lte=timezone.now())
+                .order_by("send_after", "id")[:batch_size]
+            )
+            claimed_until = timezone.now() + timedelta(seconds=settings.OUTBOX_CLAIM_TIMEOUT)
+            OutboxEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+                send_after=claimed_until, attempts=F("attempts") + 1
+            )
+        for email in emails:
+            email.send_after = claimed_until
+            email.attempts += 1
+        return emails
+
+    def send_batch(self, batch_size=100):
+        """
+        Отправляет очередной пакет писем, срок отправки которых наступил.
+
+        Письма сначала закрепляются за обработчиком (см. ``claim``), затем
+        отправляются вне транзакции: блокировки строк не держатся во время
+        обмена с SMTP-сервером. Результат каждого письма записывается сразу
+        после его отправки.
+
+        :param batch_size: Максимальный размер пакета.
+        :return: Кортеж (отправлено, отложено, не отправлено).
+        """
+        sent = retried = failed = 0
+        for email in self.claim(batch_size):
+            error = self.send(email)
+            if error is None:
+                email.status = OutboxEmail.STATUS_SENT
+                email.sent_at = timezone.now()
+                email.last_error = ""
+                email.body = ""
+                sent += 1
+            elif email.attempts >= self.max_attempts:
+                email.status = OutboxEmail.STATUS_FAILED
+                email.last_error = error
+                failed += 1
+            else:
+                email.send_after = timezone.now() + retry_delay(email.attempts)
+                email.last_error = error
+                retried += 1
+            email.save(update_fields=["status", "last_error", "send_after", "sent_at", "body"])
+        return sent, retried, failed
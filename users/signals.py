@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from catalog.thumbnails import make_thumbnails
+from users.models import User
+
+
+@receiver(post_save, sender=User)
+def user_avatar_thumbnails(sender, instance, **kwargs):
+    """
+    Создает уменьшенные копии аватара пользователя после загрузки.
+    """
+    if instance.avatar:
+        make_thumbnails(instance.avatar.name)
@@ -1,3 +1,294 @@
-from django.test import TestCase
+import os
+import socketserver
+import tempfile
+import threading
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth.hashers import make_password
+from django.core import mail
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from users.models import EmailVerificationToken, OutboxEmail, User
+from users.outbox import OutboxSender, enqueue_mail
+from users.verification import cleanup, issue_token
+
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    """
+    Минимальный локальный SMTP-сервер для тестов: считает соединения
+    и принятые письма, адреса из ``reject`` отклоняет.
+    """
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, reject=()):
+        super().__init__(("127.0.0.1", 0), SMTPHandler)
+        self.reject = set(reject)
+        self.connections = 0
+        self.messages = []
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply("220 localhost")
+        data = None
+        for raw in self.rfile:
+            line = raw.decode().rstrip("\r\n")
+            if data is not None:
+                if line == ".":
+                    self.server.messages.append("\n".join(data))
+                    data = None
+                    self.reply("250 OK")
+                else:
+                    data.append(line)
+                continue
+            command = line[:4].upper()
+            if command == "EHLO":
+                self.reply("250 localhost")
+            elif command == "RCPT" and any(address in line for address in self.server.reject):
+                self.reply("550 No such user")
+            elif command == "DATA":
+                data = []
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+class OutboxTest(TestCase):
+    """
+    Проверяет постановку писем в очередь и их отправку обработчиком.
+    """
+
+    def test_registration_enqueues_email(self):
+        response = self.client.post(
+            reverse("users:register"),
+            {"email": "new@example.com", "password1": "Sl0wSmtp!", "password2": "Sl0wSmtp!"},
+        )
+        self.assertRedirects(response, reverse("users:login"))
+        self.assertEqual(len(mail.outbox), 0)
+
+        user = User.objects.get(email="new@example.com")
+        email = OutboxEmail.objects.get()
+        self.assertFalse(user.is_active)
+        # Ссылка с токеном не хранится в очереди: токен создается при отправке.
+        self.assertEqual((email.body, email.template), ("", "email_confirmation"))
+        self.assertFalse(EmailVerificationToken.objects.exists())
+
+        call_command("send_outbox", stdout=StringIO())
+        self.assertEqual(mail.outbox[0].to, ["new@example.com"])
+        url = mail.outbox[0].body.split()[-1]
+        self.assertTrue(url.startswith("http://testserver/users/email-confirm/"))
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (OutboxEmail.STATUS_SENT, 1))
+        self.assertEqual(email.body, "")
+
+        self.client.get(url)
+        user.refresh_from_db()
+        self.assertTrue(user.is_active)
+        self.assertFalse(EmailVerificationToken.objects.exists())
+
+    def test_password_reset_sends_one_time_link(self):
+        user = User.objects.create(email="forgot@example.com")
+        user.set_password("0ld!Passw0rd")
+        user.save()
+        response = self.client.post(reverse("users:reset_password"), {"email": user.email})
+        self.assertRedirects(response, reverse("users:login"))
+        user.refresh_from_db()
+        self.assertTrue(user.check_password("0ld!Passw0rd"))
+
+        email = OutboxEmail.objects.get()
+        self.assertEqual((email.body, email.template), ("", "password_reset"))
+        call_command("send_outbox", stdout=StringIO())
+        url = mail.outbox[0].body.split()[-1]
+        self.assertTrue(url.startswith("http://testserver/users/reset/"))
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.body), (OutboxEmail.STATUS_SENT, ""))
+
+        response = self.client.get(url, follow=True)
+        form_url = response.redirect_chain[-1][0]
+        new_password = {"new_password1": "N3w!Passw0rd", "new_password2": "N3w!Passw0rd"}
+        response = self.client.post(form_url, new_password)
+        self.assertRedirects(response, reverse("users:login"))
+        user.refresh_from_db()
+        self.assertTrue(user.check_password("N3w!Passw0rd"))
+
+        # Ссылка одноразовая: после смены пароля она недействительна.
+        self.client.logout()
+        response = self.client.get(url, follow=True)
+        self.assertFalse(response.context["validlink"])
+
+    def test_claimed_emails_wait_for_crashed_worker(self):
+        enqueue_mail("Тема", "Текст", ["user@example.com"])
+
+        class CrashingSender(OutboxSender):
+            def send(self, email):
+                raise RuntimeError("обработчик упал")
+
+        with self.assertRaises(RuntimeError):
+            CrashingSender().send_batch()
+        email = OutboxEmail.objects.get()
+        self.assertEqual((email.status, email.attempts), (OutboxEmail.STATUS_PENDING, 1))
+        self.assertGreater(email.send_after, timezone.now())
+
+        # Пока письмо закреплено за упавшим обработчиком, другие его не берут.
+        self.assertEqual(OutboxSender().send_batch(), (0, 0, 0))
+        OutboxEmail.objects.update(send_after=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(OutboxSender().send_batch(), (1, 0, 0))
+        self.assertEqual(mail.outbox[0].body, "Текст")
+
+    def test_batch_reuses_smtp_connection_and_retries(self):
+        for number in range(3):
+            enqueue_mail("Тема", "Текст", [f"user{number}@example.com"])
+        enqueue_mail("Тема", "Текст", ["missing@example.com"])
+
+        with SMTPStandIn(reject=["missing@example.com"]) as server, override_settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST="127.0.0.1",
+            EMAIL_PORT=server.server_address[1],
+            EMAIL_USE_TLS=False,
+            EMAIL_USE_SSL=False,
+            EMAIL_HOST_USER="",
+            EMAIL_HOST_PASSWORD="",
+        ):
+            sender = OutboxSender(max_attempts=2)
+            self.assertEqual(sender.send_batch(), (3, 1, 0))
+            sender.close()
+            self.assertEqual(server.connections, 1)
+            self.assertEqual(len(server.messages), 3)
+
+            failed = OutboxEmail.objects.get(status=OutboxEmail.STATUS_PENDING)
+            self.assertIn("SMTPRecipientsRefused", failed.last_error)
+            self.assertGreater(failed.send_after, timezone.now())
+
+            # Пока пауза не истекла, письмо не отправляется повторно.
+            self.assertEqual(sender.send_batch(), (0, 0, 0))
+            OutboxEmail.objects.filter(pk=failed.pk).update(
+                send_after=timezone.now() - timedelta(seconds=1)
+            )
+            self.assertEqual(sender.send_batch(), (0, 0, 1))
+            sender.close()
+
+
+class EmailVerificationTest(TestCase):
+    """
+    Проверяет срок действия токенов подтверждения и очистку.
+    """
+
+    def test_token_is_stored_hashed_and_expires(self):
+        user = User.objects.create(email="late@example.com", is_active=False)
+        token = issue_token(user)
+        self.assertFalse(EmailVerificationToken.objects.filter(digest=token).exists())
+
+        EmailVerificationToken.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        response = self.client.get(reverse("users:email-confirm", args=[token]))
+        self.assertEqual(response.status_code, 404)
+        user.refresh_from_db()
+        self.assertFalse(user.is_active)
+
+    @override_settings(EMAIL_VERIFICATION_TTL=-1)
+    def test_cleanup_removes_stale_accounts_only(self):
+        stale = User.objects.create(email="stale@example.com", is_active=False)
+        issue_token(stale)
+        disabled = User.objects.create(email="disabled@example.com", is_active=False)
+        active = User.objects.create(email="active@example.com")
+        issue_token(active)
+
+        self.assertEqual(cleanup(batch_size=1), (1, 1))
+        self.assertEqual(
+            set(User.objects.values_list("pk", flat=True)), {disabled.pk, active.pk}
+        )
+        self.assertFalse(EmailVerificationToken.objects.exists())
+        self.assertIn("пользователей: 0", self.call_cleanup())
+
+    def call_cleanup(self):
+        out = StringIO()
+        call_command("cleanup_unverified", stdout=out)
+        return out.getvalue()
+
+
+class PasswordHashingTest(TestCase):
+    """
+    Проверяет хеширование пароля при сохранении и массовое создание пользователей.
+    """
+
+    def test_save_hashes_only_plain_passwords(self):
+        user = User(email="plain@example.com", password="S3cret!pass")
+        user.save()
+        self.assertTrue(user.check_password("S3cret!pass"))
+
+        for password in (make_password("S3cret!pass", hasher="scrypt"), ""):
+            user.password = password
+            user.save()
+            user.refresh_from_db()
+            self.assertEqual(user.password, password)
+
+        user.set_unusable_password()
+        user.save()
+        user = User.objects.get(pk=user.pk)
+        user.first_name = "Имя"
+        user.save()
+        self.assertFalse(user.has_usable_password())
+
+        # Открытый пароль, похожий на неиспользуемый, не сохраняется как есть.
+        for password in ("!S3cret!pass", make_password(None)):
+            user.password = password
+            user.save()
+            user.refresh_from_db()
+            self.assertNotEqual(user.password, password)
+            self.assertTrue(user.check_password(password))
+
+    def test_provision_users(self):
+        User.objects.create(email="exists@example.com")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "users.csv")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(
+                    "email,password,first_name,is_active\n"
+                    "one@example.com,Pa55word!,Анна,1\n"
+                    "two@example.com,,Борис,0\n"
+                    "exists@example.com,Pa55word!,,1\n"
+                )
+            out = StringIO()
+            call_command("provision_users", path, workers=2, batch_size=2, stdout=out)
+
+        self.assertIn("Создано 2, пропущено 1", out.getvalue())
+        one = User.objects.get(email="one@example.com")
+        self.assertTrue(one.check_password("Pa55word!"))
+        self.assertEqual((one.first_name, one.is_active), ("Анна", True))
+        two = User.objects.get(email="two@example.com")
+        self.assertFalse(two.has_usable_password())
+        self.assertFalse(two.is_active)
+
+    @override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+    def test_provision_users_refuses_fast_hasher(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "users.csv")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("email,password\none@example.com,Pa55word!\n")
+            with self.assertRaisesMessage(CommandError, "md5"):
+                call_command("provision_users", path, workers=1, stdout=StringIO())
+            self.assertFalse(User.objects.exists())
+
+            with override_settings(PASSWORD_HASHER_FAST_ALLOWED=True):
+                call_command("provision_users", path, workers=1, stdout=StringIO())
+        self.assertTrue(User.objects.get(email="one@example.com").password.startswith("md5$"))
@@ -1,5 +1,5 @@
-from django.contrib.auth.views import LoginView, LogoutView
-from django.urls import path
+from django.contrib.auth.views import LoginView, LogoutView, PasswordResetConfirmView
+from django.urls import path, reverse_lazy
 
 from users.apps import UsersConfig
 from users.views import UserCreateView, email_verification, reset_password, ProfileView
@@ -12,5 +12,13 @@ urlpatterns = [
     path('register/', UserCreateView.as_view(), name='register'),
     path('email-confirm/<str:token>/', email_verification, name='email-confirm'),
     path('reset_password/', reset_password, name='reset_password'),
+    path(
+        'reset/<uidb64>/<token>/',
+        PasswordResetConfirmView.as_view(
+            template_name='users/password_reset_confirm.html',
+            success_url=reverse_lazy('users:login'),
+        ),
+        name='password_reset_confirm',
+    ),
     path('profile/', ProfileView.as_view(), name='profile'),
 ]
@@ -0,0 +1,103 @@
+import hashlib
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from users.models import EmailVerificationToken, User
+
+
+def hash_token(token):
+    """
+    Возвращает SHA-256 токена, под которым он хранится в базе.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def issue_token(user):
+    """
+    Создает токен подтверждения почты для пользователя.
+
+    :param user: Сохраненный пользователь.
+    :return: Токен для ссылки в письме; в базе остается только его хеш.
+    """
+    token = secrets.token_urlsafe(32)
+    EmailVerificationToken.objects.create(
+        user=user,
+        digest=hash_token(token),
+        expires_at=timezone.now() + timedelta(seconds=settings.EMAIL_VERIFICATION_TTL),
+    )
+    return token
+
+
+def confirm_email(token):
+    """
+    Подтверждает почту по токену из письма.
+
+    Пользователь активируется, все его токены подтверждения удаляются.
+
+    :param token: Токен из ссылки.
+    :return: Пользователь или None, если токен неизвестен или просрочен.
+    """
+    verification = (
+        EmailVerificationToken.objects.select_related("user")
+        .filter(digest=hash_token(token), expires_at__gt=timezone.now())
+        .first()
+    )
+    if verification is None:
+        return None
+    user = verification.user
+    with transaction.atomic():
+        User.objects.filter(pk=user.pk).update(is_active=True)
+        user.verification_tokens.all().delete()
+    user.is_active = True
+    return user
+
+
+def stale_users():
+    """
+    Возвращает учетные записи, почту которых так и не подтвердили.
+
+    Это неактивные пользователи, которые ни разу не входили, у которых
+    есть токены подтверждения и все они просрочены. Отключенные вручную
+    пользователи без токенов сюда не попадают.
+    """
+    now = timezone.now()
+    return User.objects.filter(
+        is_active=False,
+        last_login__isnull=True,
+        verification_tokens__expires_at__lte=now,
+    ).exclude(verification_tokens__expires_at__gt=now)
+
+
+def delete_in_batches(queryset, batch_size):
+    """
+    Удаляет записи пакетами по первичному ключу, чтобы не держать
+    долгих блокировок и не загружать в память всю выборку.
+
+    :return: Количество удаленных записей.
+    """
+    deleted = 0
+    while True:
+        pks = list(queryset.order_by("pk").values_list("pk", flat=True).distinct()[:batch_size])
+        if not pks:
+            return deleted
+        with transaction.atomic():
+            queryset.model.objects.filter(pk__in=pks).delete()
+        deleted += len(pks)
+
+
+def cleanup(batch_size=1000):
+    """
+    Удаляет неподтвержденные учетные записи и просроченные токены.
+
+    :param batch_size: Количество записей, удаляемых за один запрос.
+    :return: Кортеж (удалено пользователей, удалено токенов).
+    """
+    users = delete_in_batches(stale_users(), batch_size)
+    tokens = delete_in_batches(
+        EmailVerificationToken.objects.filter(expires_at__lte=timezone.now()), batch_size
+    )
+    return users, tokens
@@ -1,15 +1,14 @@
-import random
-import secrets
-import string
-
-from django.core.mail import send_mail
+from django.conf import settings
+from django.db import transaction
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy, reverse
 from django.views.generic import CreateView, UpdateView
 
-from config.settings import EMAIL_HOST_USER
 from users.forms import UserRegisterForm, UserProfileForm
 from users.models import User
+from users.outbox import enqueue_mail
+from users.verification import confirm_email
 
 
 class UserCreateView(CreateView):
@@ -20,31 +19,35 @@ class UserCreateView(CreateView):
 
     model = User
     form_class = UserRegisterForm
-    template_name = "user/register.html"
-    success_url = reverse_lazy("user:login")
+    template_name = "users/register.html"
+    success_url = reverse_lazy("users:login")
 
     def form_valid(self, form):
         """
-        Обработка валидной формы. Создает пользователя, генерирует токен
-        для подтверждения почты и отправляет email с инструкциями.
+        Обработка валидной формы. Создает пользователя и ставит в очередь
+        email со ссылкой для подтверждения почты.
+
+        Пользователь и письмо сохраняются в одной транзакции, само письмо
+        отправляет команда ``send_outbox``. Токен для ссылки создается
+        при отправке (см. ``users.mails``) и в очереди не хранится.
 
         :param form: Объект формы.
         :return: Редирект на страницу успеха после сохранения формы.
         """
-        user = form.save()
+        user = form.save(commit=False)
         user.is_active = False
-        token = secrets.token_hex(16)
-        user.token = token
-        user.save()
-        host = self.request.get_host()
-        url = f"http:/{host}/users/email-confirm/{token}"
-        send_mail(
-            subject="Подтверждение почты",
-            message=f"Привет, перейди по ссылке, для подтверждения почты{url}",
-            from_email=EMAIL_HOST_USER,
-            recipient_list=[user.email],
-        )
-        return super().form_valid(form)
+        with transaction.atomic():
+            user.save()
+            enqueue_mail(
+                subject="Подтверждение почты",
+                message="",
+                from_email=settings.EMAIL_HOST_USER,
+                recipient_list=[user.email],
+                template="email_confirmation",
+                context={"user_id": user.pk, "base_url": self.request.build_absolute_uri("/")},
+            )
+        self.object = user
+        return redirect(self.get_success_url())
 
 
 def email_verification(request, token):
@@ -54,17 +57,20 @@ def email_verification(request, token):
     :param request: Объект запроса.
     :param token: Токен для подтверждения email.
     :return: Редирект на страницу логина после подтверждения.
+    :raises Http404: Если токен неизвестен или просрочен.
     """
-    user = get_object_or_404(token=token)
-    user.is_active = True
-    user.save()
+    if confirm_email(token) is None:
+        raise Http404("Ссылка подтверждения недействительна или устарела")
     return redirect(reverse("users:login"))
 
 
 def reset_password(request):
     """
-    Сброс пароля пользователя. Генерирует новый пароль и отправляет его
-    на указанный email.
+    Сброс пароля пользователя. Ставит в очередь письмо с одноразовой
+    ссылкой для установки нового пароля на указанный email.
+
+    Ссылка создается при отправке письма (см. ``users.mails``), в очереди
+    хранятся только пользователь и адрес сайта.
 
     :param request: Объект запроса.
     :return: Рендерит страницу сброса пароля или редирект на страницу логина.
@@ -72,15 +78,13 @@ def reset_password(request):
     if request.method == "POST":
         email = request.POST.get("email")
         user = get_object_or_404(User, email=email)
-        characters = string.ascii_letters + string.digits + string.punctuation
-        password = "".join(random.choice(characters) for _ in range(10))
-        user.set_password(password)
-        user.save()
-        send_mail(
+        enqueue_mail(
             subject="Сброс пароля",
-            message=f" Ваш новый пароль {password}",
-            from_email=EMAIL_HOST_USER,
+            message="",
+            from_email=settings.EMAIL_HOST_USER,
             recipient_list=[user.email],
+            template="password_reset",
+            context={"user_id": user.pk, "base_url": request.build_absolute_uri("/")},
         )
         return redirect(reverse("users:login"))
     return render(request, "users/reset_password.html")